@@ -1,25 +1,46 @@
 import os
 
-import pandas as pd
 import streamlit as st
 
+# imported first, so that its clock starts with the app process.
+from src.utils.timings import get_timings, mark_cold_start, record_timing
 from src.components.dashboard import show_dashboard_charts
-from src.components.sidebars import show_dashboard_sidebar
+from src.components.sensitivity_analysis import prewarm_sensitivity_job
+from src.components.sidebars import (
+    show_dashboard_sidebar,
+    show_export_sidebar,
+    show_memory_profile_sidebar,
+    show_scenario_versions_sidebar,
+    show_timings_sidebar,
+)
+from src.utils.constants import DEFAULT_CARBON_BUDGET_MTCO2E
+from src.utils.export_results import dashboard_tables
 from src.utils.load_data import (
     load_emission_factors_data,
+    load_escalation_data,
     load_plant_data,
     load_scenario_data,
     load_sensitivity_data,
+    read_data_file,
+)
+from src.utils.memory_profiling import (
+    get_memory_profile,
+    memory_profiling_enabled,
+    profile_memory,
+    record_rerun,
 )
 
 path = os.getcwd()
-plant_data = pd.read_csv(path + "/data/plant_parameters.csv")
-scenario_data = pd.read_csv(path + "/data/scenarios.csv")
-emission_data = pd.read_csv(path + "/data/emission_factors.csv")
-sensitivity_data = pd.read_csv(path + "/data/sensitivity_parameters.csv")
+plant_data_file = path + "/data/plant_parameters.csv"
+scenario_data_file = path + "/data/scenarios.csv"
+emission_data_file = path + "/data/emission_factors.csv"
+sensitivity_data_file = path + "/data/sensitivity_parameters.csv"
+escalation_data_file = path + "/data/escalation_profiles.csv"
 
 for k, v in st.session_state.items():
-    st.session_state[k] = v
+    # form submit buttons are read-only and cannot be carried over.
+    if not k.startswith("FormSubmitter:"):
+        st.session_state[k] = v
 
 
 # Streamlit app
@@ -37,21 +58,32 @@ def main():
 
     # Initialize plant data from csv file into session state.
     if "plants" not in st.session_state:
-        st.session_state.plants = load_plant_data(plant_data).copy()
+        st.session_state.plants = read_data_file(plant_data_file, load_plant_data)
 
     # Initialize scenario data from csv file into session state.
     if "scenarios" not in st.session_state:
-        st.session_state.scenarios = load_scenario_data(scenario_data).copy()
+        st.session_state.scenarios = read_data_file(
+            scenario_data_file, load_scenario_data
+        )
 
     # Initialize emission factors data from csv file into session state.
     if "emission_factors" not in st.session_state:
-        st.session_state.emission_factors = load_emission_factors_data(
-            emission_data
-        ).copy()
+        st.session_state.emission_factors = read_data_file(
+            emission_data_file, load_emission_factors_data
+        )
 
     # Initialize sensitivity data from csv file into session state.
     if "sensitivities" not in st.session_state:
-        st.session_state.sensitivities = load_sensitivity_data(sensitivity_data).copy()
+        st.session_state.sensitivities = read_data_file(
+            sensitivity_data_file, load_sensitivity_data
+        )
+
+    # Initialize optional cost escalation profiles (e.g. LNG price escalation,
+    # carbon price trajectory, FO&M inflation) from csv file into session state.
+    if "escalations" not in st.session_state and os.path.exists(escalation_data_file):
+        st.session_state.escalations = read_data_file(
+            escalation_data_file, load_escalation_data
+        )
 
     # # Initialize selected scenarios for sensitivity analysis.
     # if "selected_scenarios" not in st.session_state:
@@ -70,16 +102,56 @@ def main():
     if "key_Peaking" not in st.session_state:
         st.session_state.key_Peaking = True
 
+    # Initialize the carbon budget and embodied emissions of the emission
+    # pathways.
+    if "carbon_budget_mtco2e" not in st.session_state:
+        st.session_state.carbon_budget_mtco2e = DEFAULT_CARBON_BUDGET_MTCO2E
+        st.session_state.construction_mtco2e_per_mw = 0.0
+        st.session_state.decommissioning_mtco2e_per_mw = 0.0
+
     # st.write(st.session_state)
 
     # show the dashboard sidebar
     show_dashboard_sidebar(
-        load_scenario_data(scenario_data), load_plant_data(plant_data)
+        read_data_file(scenario_data_file, load_scenario_data),
+        read_data_file(plant_data_file, load_plant_data),
+    )
+
+    # save and compare versions of the plants and scenarios
+    show_scenario_versions_sidebar(
+        read_data_file(scenario_data_file, load_scenario_data),
+        read_data_file(plant_data_file, load_plant_data),
     )
 
     # show the dashboard ployly charts
-    show_dashboard_charts()
+    with record_timing("Dashboard charts"):
+        show_dashboard_charts()
+
+    # stream the dashboard tables to a CSV, Parquet or Excel download
+    show_export_sidebar(
+        dashboard_tables(
+            st.session_state.plants,
+            st.session_state.scenarios,
+            st.session_state.emission_factors,
+            st.session_state.get("escalations"),
+        ),
+        "dashboard",
+    )
+
+    # compute the sensitivities of the current inputs in the background, so
+    # that the sensitivity page opens with its results.
+    prewarm_sensitivity_job()
 
 
 if __name__ == "__main__":
-    main()
+    with record_timing("Dashboard rerun"), profile_memory("Dashboard rerun"):
+        main()
+    mark_cold_start()
+    record_rerun("Dashboard", st.session_state)
+
+    # append ?timings to the app url to see the cold start and rerun timings.
+    if "timings" in st.query_params:
+        show_timings_sidebar(get_timings())
+
+    if memory_profiling_enabled():
+        show_memory_profile_sidebar(get_memory_profile())
@@ -1,28 +1,32 @@
 import streamlit as st
 
 from src.components.sensitivity_analysis import (
+    sensitivity_export_tables,
+    show_lcoe_elasticity_ranking,
     show_sensitivity_analysis_chart,
 )
 from src.components.sidebars import (
+    show_export_sidebar,
+    show_memory_profile_sidebar,
     show_sensitivity_analysis_sidebar,
 )
+from src.models.sensitivity_model import sensitivity_labels
+from src.utils.memory_profiling import (
+    get_memory_profile,
+    memory_profiling_enabled,
+    profile_memory,
+    record_rerun,
+)
 
 for k, v in st.session_state.items():
-    st.session_state[k] = v
+    # form submit buttons are read-only and cannot be carried over.
+    if not k.startswith("FormSubmitter:"):
+        st.session_state[k] = v
 
 scenario_options = ["Peaking", "Mid-merit", "Baseload"]
 
 # parameter section
-parameter_options = [
-    "Select All",
-    "Discount rate",
-    "Load factor",
-    "Lifetime",
-    "Fuel costs",
-    "Carbon costs",
-    "Efficiency rate",
-    "Exchange rate",
-]
+parameter_options = ["Select All"] + sensitivity_labels(st.session_state.sensitivities)
 
 # Initialize selected scenarios for sensitivity analysis.
 if "selected_scenarios" not in st.session_state:
@@ -34,5 +38,16 @@ show_sensitivity_analysis_sidebar(scenario_options, parameter_options)
 
 # st.write(st.session_state)
 
-# show the sensitivity analysis plotly charts
-show_sensitivity_analysis_chart(parameter_options)
+with profile_memory("Sensitivities rerun"):
+    # show the sensitivity analysis plotly charts
+    show_sensitivity_analysis_chart(parameter_options)
+
+    # rank the parameters by the elasticity of LCOE
+    show_lcoe_elasticity_ranking()
+
+# stream the sensitivity tables to a CSV, Parquet or Excel download
+show_export_sidebar(sensitivity_export_tables(), "sensitivities")
+record_rerun("Sensitivities", st.session_state)
+
+if memory_profiling_enabled():
+    show_memory_profile_sidebar(get_memory_profile())
@@ -3,7 +3,9 @@ import streamlit as st
 from src.components.app_logo import show_app_logo
 
 for k, v in st.session_state.items():
-    st.session_state[k] = v
+    # form submit buttons are read-only and cannot be carried over.
+    if not k.startswith("FormSubmitter:"):
+        st.session_state[k] = v
 
 show_app_logo()
 
@@ -1,26 +1,40 @@
 import streamlit as st
 
-from src.components.plotly_charts import (
-    create_bar_chart,
-    create_donut_pie_chart,
-    create_group_bar_and_dot_chart,
-    create_horizontal_group_stack_bar_chart,
-)
-from src.models.results_visualization import (
-    compute_demand_scenario_emissions,
-    compute_demand_scenario_projections,
-    compute_discount_cash_flows,
-    compute_scenario_lcoe,
-)
-
 
 # dashboard graphs
 def show_dashboard_charts():
+    # plotly and pandas are only imported once the charts are drawn.
+    from src.components.plotly_charts import (
+        create_bar_chart,
+        create_donut_pie_chart,
+        create_emission_pathway_chart,
+        create_fleet_demand_chart,
+        create_group_bar_and_dot_chart,
+        create_horizontal_group_stack_bar_chart,
+        create_lcoe_curve_chart,
+    )
+    from src.models.load_factor_table import get_load_factor_table
+    from src.models.results_visualization import (
+        compute_demand_scenario_emissions,
+        compute_demand_scenario_projections,
+        compute_discount_cash_flows,
+        compute_emission_pathways,
+        compute_fleet_demand_timeseries,
+        compute_lcoe_load_factor_curves,
+        compute_scenario_lcoe,
+    )
+
+    # the sliders only move load factors: look the results up in a table
+    # built once per set of plants and escalations
+    table = get_load_factor_table(
+        st.session_state.plants, st.session_state.get("escalations")
+    )
+
     with st.container(height=470):
         demand, emissions = st.columns(2)
         with demand:
             demand_scenarios = compute_demand_scenario_projections(
-                st.session_state.plants, st.session_state.scenarios
+                st.session_state.plants, st.session_state.scenarios, table=table
             )
             create_group_bar_and_dot_chart(demand_scenarios)
 
@@ -38,7 +52,11 @@ def show_dashboard_charts():
             )
             with peaking_tab:
                 discounted_plant_costs = compute_discount_cash_flows(
-                    st.session_state.plants, st.session_state.scenarios, "Peaking"
+                    st.session_state.plants,
+                    st.session_state.scenarios,
+                    "Peaking",
+                    st.session_state.get("escalations"),
+                    table=table,
                 )
                 create_donut_pie_chart(
                     discounted_plant_costs,
@@ -46,7 +64,11 @@ def show_dashboard_charts():
                 )
             with midmerit_tab:
                 discounted_plant_costs = compute_discount_cash_flows(
-                    st.session_state.plants, st.session_state.scenarios, "Mid-merit"
+                    st.session_state.plants,
+                    st.session_state.scenarios,
+                    "Mid-merit",
+                    st.session_state.get("escalations"),
+                    table=table,
                 )
                 create_donut_pie_chart(
                     discounted_plant_costs,
@@ -54,7 +76,11 @@ def show_dashboard_charts():
                 )
             with baseload_tab:
                 discounted_plant_costs = compute_discount_cash_flows(
-                    st.session_state.plants, st.session_state.scenarios, "Baseload"
+                    st.session_state.plants,
+                    st.session_state.scenarios,
+                    "Baseload",
+                    st.session_state.get("escalations"),
+                    table=table,
                 )
                 create_donut_pie_chart(
                     discounted_plant_costs,
@@ -62,6 +88,69 @@ def show_dashboard_charts():
                 )
         with lcoe:
             plant_scenario_lcoe = compute_scenario_lcoe(
-                st.session_state.plants, st.session_state.scenarios
+                st.session_state.plants,
+                st.session_state.scenarios,
+                st.session_state.get("escalations"),
+                table=table,
             )
             create_bar_chart(discounted_plant_costs, plant_scenario_lcoe)
+
+    with st.container(height=470):
+        fleet_demand = compute_fleet_demand_timeseries(
+            st.session_state.plants, st.session_state.scenarios
+        )
+        create_fleet_demand_chart(fleet_demand)
+
+    with st.container(height=520):
+        budget, construction, decommissioning = st.columns(3)
+        carbon_budget_mtco2e = budget.number_input(
+            "Carbon budget (MtCO2e)",
+            min_value=0.0,
+            step=100.0,
+            key="carbon_budget_mtco2e",
+        )
+        construction_mtco2e_per_mw = construction.number_input(
+            "Construction emissions (MtCO2e/MW)",
+            min_value=0.0,
+            step=0.0001,
+            format="%.4f",
+            key="construction_mtco2e_per_mw",
+        )
+        decommissioning_mtco2e_per_mw = decommissioning.number_input(
+            "Decommissioning emissions (MtCO2e/MW)",
+            min_value=0.0,
+            step=0.0001,
+            format="%.4f",
+            key="decommissioning_mtco2e_per_mw",
+        )
+        emission_pathways = compute_emission_pathways(
+            st.session_state.plants,
+            st.session_state.scenarios,
+            st.session_state.emission_factors,
+            carbon_budget_mtco2e,
+            construction_mtco2e_per_mw,
+            decommissioning_mtco2e_per_mw,
+        )
+        create_emission_pathway_chart(emission_pathways, carbon_budget_mtco2e)
+
+    with st.container(height=470):
+        lcoe_curves = compute_lcoe_load_factor_curves(
+            st.session_state.plants, st.session_state.get("escalations")
+        )
+        create_lcoe_curve_chart(lcoe_curves, st.session_state.scenarios)
+
+    version_a, version_b = st.session_state.get("compared_versions", (None, None))
+    if version_a is not None and version_b is not None:
+        with st.container(border=True):
+            st.subheader(f"{version_a.label} vs {version_b.label}")
+            comparison = st.session_state.scenario_store.compare(
+                version_a.name,
+                version_b.name,
+                version_a.version,
+                version_b.version,
+                st.session_state.get("escalations"),
+            )
+            if comparison.empty:
+                st.write("The versions have the same inputs.")
+            else:
+                st.dataframe(comparison, hide_index=True)
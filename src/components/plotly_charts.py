@@ -1,11 +1,23 @@
 import math
+import threading
 
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from plotly.subplots import make_subplots
 
-from src.utils.constants import BILLION
+from src.utils.constants import (
+    BILLION,
+    MAX_SENSITIVITY_FIGURE_POINTS,
+    MIN_POINTS_PER_SERIES,
+)
+from src.utils.decimation import lttb_downsample
+
+# Figure skeletons (layout, annotations and traces) keyed by chart name and
+# subplot shape, shared by all sessions and never modified. Reruns fill the
+# trace data arrays of a copy instead of paying for make_subplots again.
+_figure_skeletons = {}
+_figure_skeletons_lock = threading.Lock()
 
 
 ## creating plots to visualize results
@@ -112,96 +124,219 @@ def create_horizontal_group_stack_bar_chart(df):
     st.plotly_chart(fig)
 
 
-def create_donut_pie_chart(discounted_plant_costs, title):
-    num_plants = 3  # len(discounted_plant_costs)
+def create_fleet_demand_chart(df):
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    colors = px.colors.qualitative.Plotly
+    for index, (scenario, scenario_df) in enumerate(df.groupby("Scenario", sort=False)):
+        fig.add_trace(
+            go.Scatter(
+                name=scenario,
+                x=scenario_df["Year"],
+                y=scenario_df["MTPA"],
+                mode="lines",
+                line=dict(shape="hv", color=colors[index % len(colors)]),
+                legendgroup=scenario,
+                hovertemplate="%{y:.2f} MTPA",
+            ),
+            secondary_y=False,
+        )
+        fig.add_trace(
+            go.Scatter(
+                name=scenario,
+                x=scenario_df["Year"],
+                y=scenario_df["PJ"],
+                mode="lines",
+                line=dict(shape="hv", dash="dot", color=colors[index % len(colors)]),
+                legendgroup=scenario,
+                showlegend=False,
+                hovertemplate="%{y:.2f} PJ",
+            ),
+            secondary_y=True,
+        )
+
+    fig.update_layout(
+        title=dict(
+            text="Fleet LNG demand and electricity production by year and scenario.",
+            y=1.0,  # -0.98
+            x=0,
+            xanchor="left",
+            yanchor="top",
+            font=dict(family="Helvetica Neue", size=18),
+        ),
+        hovermode="x unified",
+        legend=dict(orientation="h"),
+        margin=dict(t=50, b=30, l=10, r=10),
+        height=430,
+    )
+    fig.update_xaxes(title_text="Year")
+    fig.update_yaxes(
+        title_text="LNG Volume (MTPA)", rangemode="tozero", secondary_y=False
+    )
+    fig.update_yaxes(
+        title_text="Electricity Production (PJ/Year)",
+        rangemode="tozero",
+        secondary_y=True,
+    )
+    st.plotly_chart(fig)
+
+
+def create_emission_pathway_chart(df, carbon_budget_mtco2e):
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    dashes = ["solid", "dot", "dash", "dashdot", "longdash"]
+    fuel_types = list(dict.fromkeys(df["Fuel Type"]))
+    for index, (scenario, scenario_df) in enumerate(df.groupby("Scenario", sort=False)):
+        for fuel_type, fuel_df in scenario_df.groupby("Fuel Type", sort=False):
+            fig.add_trace(
+                go.Scatter(
+                    name=f"{scenario}, {fuel_type}",
+                    x=fuel_df["Year"],
+                    y=fuel_df["Cumulative MtCO2e"],
+                    mode="lines",
+                    line=dict(
+                        color=colors[index % len(colors)],
+                        dash=dashes[fuel_types.index(fuel_type) % len(dashes)],
+                    ),
+                    legendgroup=scenario,
+                    hovertemplate="%{y:.1f} MtCO2e",
+                )
+            )
+    fig.add_hline(
+        y=carbon_budget_mtco2e,
+        line=dict(dash="dot", width=1, color="grey"),
+        annotation_text="Carbon budget",
+        annotation_position="top left",
+    )
+
+    fig.update_layout(
+        title=dict(
+            text="Cumulative fleet emissions by year, scenario and fuel type.",
+            y=1.0,
+            x=0,
+            xanchor="left",
+            yanchor="top",
+            font=dict(family="Helvetica Neue", size=18),
+        ),
+        hovermode="x unified",
+        legend=dict(orientation="h"),
+        margin=dict(t=50, b=30, l=10, r=10),
+        height=400,
+    )
+    fig.update_xaxes(title_text="Year")
+    fig.update_yaxes(title_text="Cumulative emissions (MtCO2e)", rangemode="tozero")
+    st.plotly_chart(fig)
+
+
+def create_lcoe_curve_chart(df, scenarios):
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    for index, (plant, plant_df) in enumerate(df.groupby("Power Plant", sort=False)):
+        fig.add_trace(
+            go.Scatter(
+                name=plant,
+                x=plant_df["Load factor"],
+                y=plant_df["LCOE"],
+                mode="lines",
+                line=dict(color=colors[index % len(colors)]),
+                hovertemplate="%{y:.2f} R/kWh",
+            )
+        )
+    # the load factors of the scenarios
+    for scenario, load_factor in scenarios.items():
+        fig.add_vline(
+            x=load_factor,
+            line=dict(dash="dot", width=1, color="grey"),
+            annotation_text=scenario,
+            annotation_position="top right",
+        )
+
+    fig.update_layout(
+        title=dict(
+            text="LCOE by load factor.",
+            y=1.0,
+            x=0,
+            xanchor="left",
+            yanchor="top",
+            font=dict(family="Helvetica Neue", size=18),
+        ),
+        hovermode="x unified",
+        legend=dict(orientation="h"),
+        margin=dict(t=50, b=30, l=10, r=10),
+        height=430,
+    )
+    fig.update_xaxes(title_text="Load factor (%)")
+    fig.update_yaxes(title_text="LCOE (R/kWh)")
+    st.plotly_chart(fig)
+
+
+def get_figure_skeleton(key, build_skeleton):
+    """
+    Return a copy of the cached figure skeleton for a chart shape, building
+    the skeleton only once.
+
+    Args:
+        key (tuple): Chart name followed by the numbers that fix its subplot
+        shape (e.g. number of plants, scenarios and parameters).
+        build_skeleton (callable): Builds the figure with its layout,
+        annotations and placeholder traces.
+
+    Returns:
+        go.Figure: Copy of the skeleton, for the caller to fill and draw.
+    """
+    with _figure_skeletons_lock:
+        skeleton = _figure_skeletons.get(key)
+        if skeleton is None:
+            skeleton = build_skeleton()
+            _figure_skeletons[key] = skeleton
+    return go.Figure(skeleton)
+
+
+def build_donut_pie_skeleton(num_plants):
+    num_cols = 3
+    num_rows = max(2, math.ceil(num_plants / num_cols))
 
     # Create subplots: use 'domain' type for Pie subplot
     fig = make_subplots(
-        rows=2,
-        cols=num_plants,
-        subplot_titles=tuple([t for t in discounted_plant_costs.keys()]),
+        rows=num_rows,
+        cols=num_cols,
+        subplot_titles=tuple([" " for i in range(0, num_plants)]),
         specs=[
-            [{"type": "pie"} for i in range(0, num_plants)],
-            [{"type": "pie"} for i in range(0, num_plants)],
+            [{"type": "pie"} for i in range(0, num_cols)] for j in range(0, num_rows)
         ],
         vertical_spacing=0.11,
     )
-    col_index = 0
-    row_index = 1
-    plant_total_cost = []
-    for plant, costs in discounted_plant_costs.items():
-        total = sum(discounted_plant_costs[plant].values())
-        labels = list(discounted_plant_costs[plant].keys())
-        values = [v / total * 100 for v in discounted_plant_costs[plant].values()]
-        plant_total_cost.append(round(total / BILLION, 2))
-        col_index = col_index + 1
-        if col_index > 3:
-            row_index = 2
-            col_index = 1
 
+    annotations = [a.to_plotly_json() for a in fig["layout"]["annotations"]]
+    for index in range(0, num_plants):
+        row_index = index // num_cols + 1
+        col_index = index % num_cols + 1
         fig.add_trace(
-            go.Pie(
-                labels=labels,
-                values=values,
-                name=plant,
-                hole=0.6,
-                hoverinfo="label+percent+name",
-            ),
+            go.Pie(hole=0.6, hoverinfo="label+percent+name"),
             row_index,
             col_index,
         )
 
-    annotations = [a.to_plotly_json() for a in fig["layout"]["annotations"]]
-    annotations.extend(
-        [
+        # total cost in the hole of the donut
+        subplot = fig.get_subplot(row_index, col_index)
+        if num_rows == 2:
+            y = 0.82 if row_index == 1 else 0.2
+        else:
+            y = sum(subplot.y) / 2
+        annotations.append(
             dict(
-                text="R" + str(plant_total_cost[0]) + "B",
-                x=sum(fig.get_subplot(1, 1).x) / 2,
-                y=0.82,
+                text=" ",
+                x=sum(subplot.x) / 2,
+                y=y,
                 font_size=16,
                 showarrow=False,
                 xanchor="center",
-            ),
-            dict(
-                text="R" + str(plant_total_cost[1]) + "B",
-                x=sum(fig.get_subplot(1, 2).x) / 2,
-                y=0.82,
-                font_size=16,
-                showarrow=False,
-                xanchor="center",
-            ),
-            dict(
-                text="R" + str(plant_total_cost[2]) + "B",
-                x=sum(fig.get_subplot(1, 3).x) / 2,
-                y=0.82,
-                font_size=16,
-                showarrow=False,
-                xanchor="center",
-            ),
-            dict(
-                text="R" + str(plant_total_cost[3]) + "B",
-                x=sum(fig.get_subplot(2, 1).x) / 2,
-                y=0.2,
-                font_size=16,
-                showarrow=False,
-                xanchor="center",
-            ),
-            dict(
-                text="R" + str(plant_total_cost[4]) + "B",
-                x=sum(fig.get_subplot(2, 2).x) / 2,
-                y=0.2,
-                font_size=16,
-                showarrow=False,
-                xanchor="center",
-            ),
-        ]
-    )
+            )
+        )
 
     fig["layout"]["annotations"] = annotations
 
     fig.update_layout(
         title=dict(
-            text=title,
             y=1.0,  # -0.98
             x=0.0,
             xanchor="left",
@@ -212,42 +347,59 @@ def create_donut_pie_chart(discounted_plant_costs, title):
         margin=dict(t=50, b=30, l=10, r=10),
         height=410,
     )  # paper_bgcolor='rgb(233,233,233)', set the background colour
-    # fig.print_grid()
+
+    return fig
+
+
+def create_donut_pie_chart(discounted_plant_costs, title):
+    num_plants = len(discounted_plant_costs)
+
+    subplot_titles = []
+    plant_total_cost = []
+    for plant, costs in discounted_plant_costs.items():
+        subplot_titles.append(plant)
+        plant_total_cost.append(
+            "R" + str(round(sum(costs.values()) / BILLION, 2)) + "B"
+        )
+
+    fig = get_figure_skeleton(
+        ("donut_pie", num_plants),
+        lambda: build_donut_pie_skeleton(num_plants),
+    )
+    with fig.batch_update():
+        fig.layout.title.text = title
+        for trace, (plant, costs) in zip(fig.data, discounted_plant_costs.items()):
+            total = sum(costs.values())
+            trace.name = plant
+            trace.labels = list(costs.keys())
+            trace.values = [v / total * 100 for v in costs.values()]
+        for annotation, text in zip(
+            fig.layout.annotations, subplot_titles + plant_total_cost
+        ):
+            annotation.text = text
     st.plotly_chart(fig)
 
 
-def create_bar_chart(discounted_plant_costs, plant_scenario_lcoe):
-    num_plants = math.ceil(len(plant_scenario_lcoe["Power Plant"].unique()) / 2)
+def build_bar_skeleton(num_plants):
+    num_cols = math.ceil(num_plants / 2)
 
     # Create subplots: use 'domain' type for Pie subplot
     fig = make_subplots(
         rows=2,
-        cols=num_plants,
+        cols=num_cols,
         # subplot_titles=tuple([t for t in discounted_plant_costs.keys()]),
         specs=[
-            [{"type": "bar"} for i in range(0, num_plants)],
-            [{"type": "bar"} for i in range(0, num_plants)],
+            [{"type": "bar"} for i in range(0, num_cols)],
+            [{"type": "bar"} for i in range(0, num_cols)],
         ],
         horizontal_spacing=0.13,
     )
 
-    row_index = 1
-    col_index = 0
-    for plant, costs in discounted_plant_costs.items():
-        col_index = col_index + 1
-        if col_index > 3:
-            row_index = 2
-            col_index = 1
-        scenario_df = plant_scenario_lcoe[plant_scenario_lcoe["Power Plant"] == plant]
+    for index in range(0, num_plants):
         fig.add_trace(
-            go.Bar(
-                x=scenario_df["Scenario"],
-                y=scenario_df["LCOE"],
-                hovertemplate="R%{y:.2f}/kWh",
-                name=plant,
-            ),
-            row_index,
-            col_index,
+            go.Bar(hovertemplate="R%{y:.2f}/kWh"),
+            index // num_cols + 1,
+            index % num_cols + 1,
         )
     fig.update_layout(
         title=dict(
@@ -265,12 +417,122 @@ def create_bar_chart(discounted_plant_costs, plant_scenario_lcoe):
         height=430,
     )  # paper_bgcolor='rgb(233,233,233)', set the background colour
     fig.update_yaxes(title_text="LCOE (R/kWh)")
-    # st.write(fig.layout)
+
+    return fig
+
+
+def create_bar_chart(discounted_plant_costs, plant_scenario_lcoe):
+    num_plants = len(discounted_plant_costs)
+    plant_groups = plant_scenario_lcoe.groupby("Power Plant", sort=False)
+
+    fig = get_figure_skeleton(
+        ("bar", num_plants), lambda: build_bar_skeleton(num_plants)
+    )
+    with fig.batch_update():
+        for trace, plant in zip(fig.data, discounted_plant_costs.keys()):
+            scenario_df = plant_groups.get_group(plant)
+            trace.name = plant
+            trace.x = scenario_df["Scenario"].to_list()
+            trace.y = scenario_df["LCOE"].to_numpy()
     st.plotly_chart(fig)
 
 
 # sensitivity section
-def create_sensitivity_subplots_chart(marked_parameters, sensitivities):
+def sensitivity_subplot_layout(num_subplots):
+    """
+    Vertical spacing and figure height depending on the number of subplots
+    selected.
+    """
+    if num_subplots <= 3:
+        return 0.10, 500
+    elif 3 < num_subplots <= 6:
+        return 0.10, 800
+    elif 6 < num_subplots <= 9:
+        return 0.08, 1100
+    elif 9 < num_subplots <= 12:
+        return 0.06, 1400
+    elif 12 < num_subplots <= 15:
+        return 0.04, 1700
+    elif 15 < num_subplots <= 18:
+        return 0.04, 2000
+
+    return 0.04, 2300
+
+
+def build_sensitivity_subplots_skeleton(num_subplots, num_plants, render_mode="svg"):
+    current_vertical_spacing, current_subplot_height = sensitivity_subplot_layout(
+        num_subplots
+    )
+    num_cols = num_subplots if num_subplots < 3 else 3
+    num_rows = math.ceil(num_subplots / 3)
+
+    fig = make_subplots(
+        rows=num_rows,
+        cols=num_cols,
+        subplot_titles=[" " for i in range(0, num_subplots)],
+        shared_yaxes=False,
+        specs=[
+            [{"type": "scatter"} for num_col in range(0, num_cols)]
+            for num_row in range(0, num_rows)
+        ],
+        vertical_spacing=current_vertical_spacing,
+    )
+
+    # WebGL traces are drawn on a canvas instead of one SVG path per series.
+    scatter = go.Scattergl if render_mode == "webgl" else go.Scatter
+    colors = px.colors.qualitative.Plotly
+    for index in range(0, num_subplots):
+        for plant_index in range(0, num_plants):
+            fig.add_trace(
+                scatter(
+                    mode="lines+markers",
+                    line_color=colors[plant_index % len(colors)],
+                    hovertemplate="R%{y:.2f}/kWh",
+                    showlegend=index == 0,
+                ),
+                index // 3 + 1,
+                index % 3 + 1,
+            )
+
+    fig.update_layout(
+        title=dict(
+            text="Sensitivity analysis of localized cost of electricity (LCOE) "
+            "with respect to its parameters (drivers) by scenario.",
+            y=1.0,  # -0.98
+            x=0,
+            xanchor="left",
+            yanchor="top",
+            # font=dict(family="Helvetica Neue", size=18),
+        ),
+        hovermode="x unified",
+        # margin=dict(t=0, b=0, l=0, r=0),
+        height=current_subplot_height,
+        width=500,
+    )
+    fig.update_yaxes(title_text="LCOE (R/kWh)")
+
+    return fig
+
+
+def create_sensitivity_subplots_chart(
+    marked_parameters,
+    sensitivities,
+    render_mode="svg",
+    max_figure_points=MAX_SENSITIVITY_FIGURE_POINTS,
+):
+    """
+    Plot LCOE sensitivities in a grid of subplots, one per selected parameter
+    and scenario, with a line per power plant.
+
+    Args:
+        marked_parameters (list): Selected sensitivity parameters.
+        sensitivities (pd.DataFrame): Sensitivity results with Power Plant,
+        Scenario, Parameter, Value and LCOE columns.
+        render_mode (str): "svg" draws every point with SVG traces; "webgl"
+        uses WebGL traces and decimates each series so that the whole figure
+        holds at most max_figure_points points, whatever the sweep density.
+        max_figure_points (int): Point budget of the figure in "webgl" mode.
+    """
     marked_scenarios = sensitivities["Scenario"].unique().tolist()
     marked_plants = sensitivities["Power Plant"].unique().tolist()
     num_scenarios = len(marked_scenarios)
@@ -278,8 +540,10 @@ def create_sensitivity_subplots_chart(marked_parameters, sensitivities):
     num_plants = len(marked_plants)
 
     if (num_scenarios * num_parameters) > 0:
-        # create a list of selected subplots titles
+        # create a list of selected subplots titles and their (parameter,
+        # scenario) series in the order they are drawn.
         subtitles = []
+        subplot_series = []
         for marked_scenario in marked_scenarios:
             for marked_parameter in marked_parameters:
                 if (
@@ -287,6 +551,7 @@ def create_sensitivity_subplots_chart(marked_parameters, sensitivities):
                     and "Load factor" == marked_parameter
                 ):
                     subtitles.append("Range of load factors")
+                    subplot_series.append((marked_parameter, marked_scenario))
                 elif (
                     "All Scenarios" != marked_scenario
                     and "Load factor" != marked_parameter
@@ -294,149 +559,52 @@ def create_sensitivity_subplots_chart(marked_parameters, sensitivities):
                     subtitles.append(
                         str(marked_parameter) + " - " + str(marked_scenario)
                     )
-
-        # st.write(subtitles)
+                    subplot_series.append((marked_parameter, marked_scenario))
 
         # number of subplots to be generated.
         num_subplots = len(subtitles)
+        if num_subplots == 0:
+            return
 
-        # adjust the vertical spacing and subplot height
-        # depending on the number of subplots selected.
-        current_vertical_spacing = 0.10
-        current_subplot_height = 500
-        if num_subplots <= 3:
-            current_vertical_spacing = 0.10
-            current_subplot_height = 500
-        elif 3 < num_subplots <= 6:
-            current_vertical_spacing = 0.10
-            current_subplot_height = 800
-        elif 6 < num_subplots <= 9:
-            current_vertical_spacing = 0.08
-            current_subplot_height = 1100
-        elif 9 < num_subplots <= 12:
-            current_vertical_spacing = 0.06
-            current_subplot_height = 1400
-        elif 12 < num_subplots <= 15:
-            current_vertical_spacing = 0.04
-            current_subplot_height = 1700
-        elif 15 < num_subplots <= 18:
-            current_vertical_spacing = 0.04
-            current_subplot_height = 2000
-        elif num_subplots > 18:
-            current_vertical_spacing = 0.04
-            current_subplot_height = 2300
-
-        # print(subtitles)
-        # st.write((num_scenarios, num_parameters, num_subplots, ceil(num_subplots / 3)))
-        fig = make_subplots(
-            rows=1 if num_subplots <= 3 else math.ceil(num_subplots / 3),
-            cols=num_subplots if num_subplots < 3 else 3,
-            subplot_titles=subtitles,
-            shared_yaxes=False,
-            specs=[
-                [
-                    {"type": "scatter"}
-                    for num_cols in range(0, (num_subplots if num_subplots < 3 else 3))
-                ]
-                for num_rows in range(0, math.ceil(num_subplots / 3))
-            ],
-            vertical_spacing=current_vertical_spacing,
-            # 1 / (ceil(num_subplots / 3) - 1) if (ceil(num_subplots / 3) - 1) > 0 else 0.020
+        series_groups = sensitivities.groupby(
+            ["Parameter", "Scenario", "Power Plant"], sort=False
         )
 
-        isLegend = True
-        isLoadFactorProcessed = False
-
-        colors = px.colors.qualitative.Plotly[:num_plants]
-
-        # print(colors)
-        # fig.print_grid()
-
-        col_index = 0
-        row_index = 1  # 1 if num_subplots <= 3 else ceil(num_subplots / 3)
-
-        for marked_scenario in marked_scenarios:
-            for marked_parameter in marked_parameters:
-                if (
-                    "All Scenarios" == marked_scenario
-                    and "Load factor" == marked_parameter
-                ):
-                    col_index = col_index + 1
-                    if col_index > 3:
-                        row_index = row_index + 1
-                        col_index = 1
-                    # print(f"ROW = {row_index} COL = {col_index}")
-
-                    for plant, color in zip(marked_plants, colors):
-                        param_df = sensitivities[
-                            sensitivities.Parameter == marked_parameter
-                        ]
-                        scenario_df = param_df[param_df.Scenario == marked_scenario]
-                        plant_df = scenario_df[
-                            scenario_df["Power Plant"] == plant
-                        ].reindex()
-                        fig.add_trace(
-                            go.Scatter(
-                                x=plant_df["Value"],
-                                y=plant_df["LCOE"],
-                                mode="lines+markers",
-                                line_color=color,
-                                hovertemplate="R%{y:.2f}/kWh",
-                                name=plant,
-                                showlegend=isLegend,
-                            ),
-                            row_index,
-                            col_index,
-                        )
-                    isLegend = False
+        # share the point budget of the figure between its series.
+        points_per_series = None
+        if render_mode == "webgl":
+            points_per_series = max(
+                MIN_POINTS_PER_SERIES, max_figure_points // (num_subplots * num_plants)
+            )
 
-                elif (
-                    "All Scenarios" != marked_scenario
-                    and "Load factor" != marked_parameter
-                ):
-                    col_index = col_index + 1
-                    if col_index > 3:
-                        row_index = row_index + 1
-                        col_index = 1
-                    # print(f"ROW = {row_index} COL = {col_index}")
-
-                    for plant, color in zip(marked_plants, colors):
-                        param_df = sensitivities[
-                            sensitivities.Parameter == marked_parameter
-                        ]
-                        scenario_df = param_df[param_df.Scenario == marked_scenario]
-                        plant_df = scenario_df[
-                            scenario_df["Power Plant"] == plant
-                        ].reindex()
-                        fig.add_trace(
-                            go.Scatter(
-                                x=plant_df["Value"],
-                                y=plant_df["LCOE"],
-                                mode="lines+markers",
-                                line_color=color,
-                                hovertemplate="R%{y:.2f}/kWh",
-                                name=plant,
-                                showlegend=isLegend,
-                            ),
-                            row_index,
-                            col_index,
-                        )
-                    isLegend = False
-
-        fig.update_layout(
-            title=dict(
-                text="Sensitivity analysis of localized cost of electricity (LCOE) "
-                "with respect to its parameters (drivers) by scenario.",
-                y=1.0,  # -0.98
-                x=0,
-                xanchor="left",
-                yanchor="top",
-                # font=dict(family="Helvetica Neue", size=18),
+        fig = get_figure_skeleton(
+            ("sensitivity_subplots", num_subplots, num_plants, render_mode),
+            lambda: build_sensitivity_subplots_skeleton(
+                num_subplots, num_plants, render_mode
             ),
-            hovermode="x unified",
-            # margin=dict(t=0, b=0, l=0, r=0),
-            height=current_subplot_height,
-            width=500,
         )
-        fig.update_yaxes(title_text="LCOE (R/kWh)")
+        with fig.batch_update():
+            for annotation, subtitle in zip(fig.layout.annotations, subtitles):
+                annotation.text = subtitle
+
+            traces = iter(fig.data)
+            for marked_parameter, marked_scenario in subplot_series:
+                for plant in marked_plants:
+                    trace = next(traces)
+                    trace.name = plant
+                    if (marked_parameter, marked_scenario, plant) in (
+                        series_groups.groups
+                    ):
+                        plant_df = series_groups.get_group(
+                            (marked_parameter, marked_scenario, plant)
+                        )
+                        x = plant_df["Value"].to_numpy()
+                        y = plant_df["LCOE"].to_numpy()
+                        if points_per_series is not None:
+                            x, y = lttb_downsample(x, y, points_per_series)
+                        trace.x = x
+                        trace.y = y
+                    else:
+                        trace.x = []
+                        trace.y = []
         st.plotly_chart(fig)
@@ -1,21 +1,172 @@
-import pandas as pd
+import json
+
 import streamlit as st
 
-from src.components.plotly_charts import (
-    create_sensitivity_subplots_chart,
-)
-from src.models.results_visualization import (
-    compute_lcoe_sensitivities,
-)
+from src.utils.background_jobs import COMPLETED, get_job_manager
+
+# how long a rerun waits for a sweep before showing its progress, and how often
+# the progress is polled while the sweep runs in the background.
+SENSITIVITY_JOB_WAIT_SECONDS = 0.3
+SENSITIVITY_JOB_POLL_SECONDS = 0.5
+
+# labels of the parameters in the elasticity ranking
+ELASTICITY_PARAMETER_LABELS = {
+    "installed_capacity_mw": "Installed capacity",
+    "construction_duration_years": "Construction duration",
+    "overnight_capex_per_kw": "Overnight capex",
+    "operational_lifetime_years": "Lifetime",
+    "foam_cost_factor": "FO&M cost factor",
+    "voam_cost_per_mwh": "VO&M costs",
+    "fuel_cost_per_tLNG": "Fuel costs",
+    "carbon_cost_per_tCO2e": "Carbon costs",
+    "decommissioning_duration_years": "Decommissioning duration",
+    "capex_contingency_factor": "Capex contingency",
+    "decommissioning_cost_factor": "Decommissioning cost factor",
+    "efficiency_rate": "Efficiency rate",
+    "emission_factor_mtco2e_per_pj": "Emission factor",
+    "discount_rate": "Discount rate",
+    "exchange_rate": "Exchange rate",
+    "capacity_factor": "Load factor",
+}
 
 # st.write(st.session_state)
 
 
-def show_sensitivity_analysis_chart(parameter_options):
-    sensitivity_df = compute_lcoe_sensitivities(
+def sensitivity_job_key(plants, scenarios, sensitivities, escalations=None):
+    """Identifies the inputs of a sensitivity sweep."""
+    from src.models.escalation import escalations_key
+
+    return json.dumps(
+        [plants, scenarios, sensitivities, escalations_key(escalations)],
+        sort_keys=True,
+    )
+
+
+def get_sensitivity_job(restart=False, selected_scenarios=None):
+    """
+    The background job computing the LCOE sensitivities of the current inputs.
+    A new job is submitted, and the previous one cancelled, when the inputs
+    change or a restart is requested. A completed job of the same inputs, e.g.
+    of another session, is reused instead.
+
+    Args:
+        restart (bool): Submit a new job even if the inputs are unchanged.
+        selected_scenarios (dict, optional): Scenarios of the sweep, the
+        scenarios selected in the sidebar by default.
+    """
+    from src.models.results_visualization import lcoe_sensitivity_tasks
+
+    if selected_scenarios is None:
+        selected_scenarios = st.session_state.selected_scenarios
+
+    job_manager = get_job_manager()
+    key = sensitivity_job_key(
+        st.session_state.plants,
+        selected_scenarios,
+        st.session_state.sensitivities,
+        st.session_state.get("escalations"),
+    )
+
+    job = job_manager.get(st.session_state.get("sensitivity_job_id"))
+    if job is not None and job.key == key and not restart:
+        return job
+    if job is not None and not job.done():
+        job.cancel()
+
+    cached_job = job_manager.find(key)
+    if cached_job is not None and cached_job.status == COMPLETED and not restart:
+        job = cached_job
+    else:
+        job = job_manager.submit(
+            lcoe_sensitivity_tasks(
+                st.session_state.plants,
+                selected_scenarios,
+                st.session_state.sensitivities,
+                st.session_state.get("escalations"),
+            ),
+            key=key,
+        )
+    st.session_state.sensitivity_job_id = job.id
+
+    return job
+
+
+def prewarm_sensitivity_job():
+    """
+    Start the sensitivity sweep of the scenarios selected on the sensitivity
+    page in the background, e.g. once the dashboard has rendered, so that the
+    page shows the results as soon as it is opened. The sweep of earlier
+    inputs is cancelled.
+    """
+    selected_scenarios = {
+        scenario: value
+        for scenario, value in st.session_state.scenarios.items()
+        if st.session_state.get(f"key_{scenario}")
+    }
+
+    return get_sensitivity_job(selected_scenarios=selected_scenarios)
+
+
+def sensitivity_export_tables():
+    """
+    Sensitivity tables to export: the results of the current sweep once it
+    has completed, otherwise the sweep is recomputed while it is exported.
+    """
+    from src.utils.export_results import sensitivity_tables
+
+    job = get_sensitivity_job()
+
+    return sensitivity_tables(
         st.session_state.plants,
         st.session_state.selected_scenarios,
         st.session_state.sensitivities,
+        job.results() if job.status == COMPLETED else None,
+        st.session_state.get("escalations"),
+    )
+
+
+def show_sensitivity_analysis_chart(parameter_options):
+    job = get_sensitivity_job()
+    job.wait(SENSITIVITY_JOB_WAIT_SECONDS)
+
+    # poll the job until it is finished, without rerunning the whole page.
+    @st.fragment(run_every=None if job.done() else SENSITIVITY_JOB_POLL_SECONDS)
+    def show_sensitivity_job():
+        was_done = job.done()
+        if not was_done:
+            progress_col, cancel_col = st.columns([4, 1])
+            progress_col.progress(
+                job.progress,
+                text=f"Computing sensitivities: {job.completed} of {job.total} "
+                "power plants done.",
+            )
+            if cancel_col.button("Cancel"):
+                job.cancel()
+                st.rerun()
+        elif job.status == COMPLETED:
+            pass
+        elif job.error is not None:
+            st.error(f"Sensitivity analysis failed: {job.error}")
+        else:
+            if st.button("Sensitivity analysis cancelled. Run again"):
+                get_sensitivity_job(restart=True)
+                st.rerun()
+
+        show_sensitivity_results(job.results(), parameter_options)
+
+        # stop polling once the job has finished.
+        if not was_done and job.done():
+            st.rerun()
+
+    show_sensitivity_job()
+
+
+def show_sensitivity_results(partial_results, parameter_options):
+    # plotly and pandas are only imported once the charts are drawn.
+    import pandas as pd
+
+    from src.components.plotly_charts import (
+        create_sensitivity_subplots_chart,
     )
 
     selected_params = (
@@ -24,16 +175,55 @@ def show_sensitivity_analysis_chart(parameter_options):
         else st.session_state["selected_parameters"]
     )
 
-    params = []
     selected_sensitivities = pd.DataFrame(
         {"Power Plant": [], "Scenario": [], "Parameter": [], "Value": [], "LCOE": []}
     )
-    for param in selected_params:
-        params.append(sensitivity_df[sensitivity_df.Parameter == param])
-    if len(params) != 0:
-        selected_sensitivities = pd.concat(params).reindex()
+    if len(partial_results) != 0:
+        sensitivity_df = pd.concat(partial_results)
+        params = []
+        for param in selected_params:
+            params.append(sensitivity_df[sensitivity_df.Parameter == param])
+        if len(params) != 0:
+            selected_sensitivities = pd.concat(params).reindex()
 
     # st.write(st.session_state)
     # st.write(selected_params)
     # st.write(selected_sensitivities)
-    create_sensitivity_subplots_chart(selected_params, selected_sensitivities)
+    create_sensitivity_subplots_chart(
+        selected_params,
+        selected_sensitivities,
+        render_mode="webgl" if st.session_state.get("webgl_rendering") else "svg",
+    )
+
+
+def show_lcoe_elasticity_ranking():
+    """
+    Rank the parameters by the elasticity of LCOE, from the exact derivatives
+    at the current inputs: no sweep is needed.
+    """
+    from src.models.results_visualization import compute_lcoe_elasticities
+
+    st.subheader("What matters most")
+    if len(st.session_state.selected_scenarios) == 0:
+        st.info("Select scenarios to rank the parameters.")
+        return
+
+    elasticities = compute_lcoe_elasticities(
+        st.session_state.plants,
+        st.session_state.selected_scenarios,
+        st.session_state.get("escalations"),
+    )
+    # mean elasticity over the selected scenarios, one column per plant
+    ranking = elasticities.pivot_table(
+        index="Parameter", columns="Power Plant", values="Elasticity", sort=False
+    )
+    ranking = ranking.loc[ranking.abs().max(axis=1).sort_values(ascending=False).index]
+    ranking.index = [ELASTICITY_PARAMETER_LABELS[p] for p in ranking.index]
+
+    st.caption(
+        "Elasticity of LCOE: the % change of LCOE for a 1% change of the "
+        "parameter, averaged over the selected scenarios. Durations and the "
+        "lifetime are treated as continuous, keeping the average escalation "
+        "of each cost item over its period."
+    )
+    st.dataframe(ranking.style.format("{:+.3f}"))
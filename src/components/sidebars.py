@@ -119,38 +119,147 @@ def show_dashboard_sidebar(scenario_data, plant_data):
             )
             st.rerun()
 
-        def update_callback(
-            key,
-        ):
-            for plant_cb, characteristics_cb in st.session_state.plants.items():
-                if selected_plant == plant_cb:
-                    for parameter_cb in characteristics_cb:
-                        if (
-                            key
-                            == f"{plant_cb}_{parameter_cb}_{st.session_state.refresh_plants_key}"
-                        ):
-                            st.session_state.plants[plant_cb][parameter_cb] = (
-                                st.session_state[key]
-                            )
-
-        for plant, characteristics in st.session_state.plants.items():
-            if selected_plant == plant:
-                for parameter in characteristics:
-                    value_type = type(characteristics[parameter])
-                    st.session_state.plants[selected_plant][parameter] = (
-                        st.number_input(
-                            f"{parameter_labels()[parameter]}:",
-                            value=st.session_state.plants[selected_plant][parameter],
-                            min_value=0 if value_type == int else 0.0,
-                            # max_value=1.0 if (parameter in percentage_parameters and value_type == float) else 1.0,
-                            step=parameter_step_values()[parameter],
-                            on_change=update_callback,
-                            args=(
-                                f"{plant}_{parameter}_{st.session_state.refresh_plants_key}",
-                            ),
-                            key=f"{plant}_{parameter}_{st.session_state.refresh_plants_key}",
-                        )
+        # widget key -> (plant, parameter), rebuilt only when the widget keys
+        # are refreshed or plants are added or removed.
+        widget_keys = get_plant_widget_keys(
+            st.session_state.plants, st.session_state.refresh_plants_key
+        )
+
+        def apply_callback(keys):
+            from src.models.plant_parameters import PlantRecord
+
+            # apply the whole batch of edited values with a single rerun,
+            # unless they leave a plant outside of its valid ranges.
+            edited_plants = {}
+            for key in keys:
+                plant_cb, parameter_cb = widget_keys[key]
+                edited_plants.setdefault(
+                    plant_cb, dict(st.session_state.plants[plant_cb])
+                )[parameter_cb] = st.session_state[key]
+            try:
+                for plant_cb, parameters in edited_plants.items():
+                    PlantRecord.from_dict(plant_cb, parameters)
+            except ValueError as error:
+                st.session_state.plant_edit_error = str(error)
+                return
+            st.session_state.plant_edit_error = None
+
+            for key in keys:
+                plant_cb, parameter_cb = widget_keys[key]
+                if st.session_state.plants[plant_cb][parameter_cb] != (
+                    st.session_state[key]
+                ):
+                    st.session_state.plants[plant_cb][parameter_cb] = st.session_state[
+                        key
+                    ]
+
+        if selected_plant is not None:
+            # the number inputs live in a form, so editing them does not
+            # rerun the model until the edits are applied.
+            with st.form(
+                key=f"plant_form_key_{st.session_state.refresh_plants_key}",
+                border=False,
+            ):
+                form_keys = []
+                for parameter, value in st.session_state.plants[selected_plant].items():
+                    key = plant_widget_key(
+                        selected_plant,
+                        parameter,
+                        st.session_state.refresh_plants_key,
+                    )
+                    value_type = type(value)
+                    st.number_input(
+                        f"{parameter_labels()[parameter]}:",
+                        value=value,
+                        min_value=0 if value_type == int else 0.0,
+                        # max_value=1.0 if (parameter in percentage_parameters and value_type == float) else 1.0,
+                        step=parameter_step_values()[parameter],
+                        key=key,
                     )
+                    form_keys.append(key)
+
+                st.form_submit_button(
+                    "Apply", on_click=apply_callback, args=(form_keys,)
+                )
+            if st.session_state.get("plant_edit_error"):
+                st.error(st.session_state.plant_edit_error)
+
+
+def show_scenario_versions_sidebar(scenario_data, plant_data):
+    from src.models.scenario_store import BASE_VERSION_NAME, ScenarioStore
+
+    # the csv data is the base every stored version records its deltas from.
+    if "scenario_store" not in st.session_state:
+        st.session_state.scenario_store = ScenarioStore(plant_data, scenario_data)
+    store = st.session_state.scenario_store
+
+    with st.sidebar.expander(":blue[Scenario versions]"):
+        name_col, save_col = st.columns([2, 1])
+        name = name_col.text_input(
+            "Version name",
+            placeholder="Version name",
+            label_visibility="collapsed",
+            key="scenario_version_name",
+        )
+        if save_col.button("Save", disabled=not name or name == BASE_VERSION_NAME):
+            version = store.save(
+                name, st.session_state.plants, st.session_state.scenarios
+            )
+            # compare the saved version with the base, unless another
+            # comparison is selected.
+            if st.session_state.get("compare_version_a") is None:
+                st.session_state.compare_version_a = store.get(BASE_VERSION_NAME).label
+            st.session_state.compare_version_b = version.label
+            st.toast(f"Saved {version.label} ({version.num_deltas()} changes).")
+
+        versions = {
+            stored.label: stored
+            for version_name in store.names()
+            for stored in store.versions(version_name)
+        }
+        for key, label in (
+            ("compare_version_a", "Compare"),
+            ("compare_version_b", "with"),
+        ):
+            st.selectbox(
+                label,
+                versions.keys(),
+                index=None,
+                placeholder="Select a version...",
+                key=key,
+            )
+        st.session_state.compared_versions = (
+            versions.get(st.session_state.compare_version_a),
+            versions.get(st.session_state.compare_version_b),
+        )
+
+
+def plant_widget_key(plant, parameter, refresh_key):
+    return f"{plant}_{parameter}_{refresh_key}"
+
+
+def get_plant_widget_keys(plants, refresh_key):
+    """
+    Index of the plant parameter widget keys.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        refresh_key (str): Current suffix of the plant widget keys.
+
+    Returns:
+        dict: (plant, parameter) tuples keyed by widget key, cached in session
+        state until the refresh key or the set of plants changes.
+    """
+    index_key = (refresh_key, tuple(plants.keys()))
+    if st.session_state.get("plant_widget_keys_index") != index_key:
+        st.session_state.plant_widget_keys = {
+            plant_widget_key(plant, parameter, refresh_key): (plant, parameter)
+            for plant, characteristics in plants.items()
+            for parameter in characteristics
+        }
+        st.session_state.plant_widget_keys_index = index_key
+
+    return st.session_state.plant_widget_keys
 
 
 def show_sensitivity_analysis_sidebar(scenario_options, parameter_options):
@@ -187,3 +296,101 @@ def show_sensitivity_analysis_sidebar(scenario_options, parameter_options):
         on_change=on_update_selected_options,
         format_func=lambda x: "All Parameters" if x == "Select All" else f"{x}",
     )
+
+    st.sidebar.divider()
+
+    # WebGL traces with decimated series keep the chart payload bounded for
+    # dense sweeps and large fleets.
+    st.sidebar.toggle(
+        label="WebGL rendering",
+        key="webgl_rendering",
+        help="Draw the sensitivity charts with WebGL and reduce each line to a "
+        "bounded number of points.",
+    )
+
+
+def show_timings_sidebar(timings):
+    with st.sidebar.expander(":blue[Performance timings]", expanded=True):
+        if timings["cold_start_seconds"] is not None:
+            st.write(f"Cold start: {timings['cold_start_seconds']:.3f} s")
+        for label, timing in timings["timings"].items():
+            st.write(
+                f"{label}: {timing['last_seconds']:.3f} s last, "
+                f"{timing['mean_seconds']:.3f} s mean over {timing['calls']} runs"
+            )
+
+
+def show_memory_profile_sidebar(profile):
+    import json
+
+    import pandas as pd
+
+    from src.utils.memory_profiling import dump_memory_profile
+
+    with st.sidebar.expander(":blue[Memory profile]", expanded=True):
+        call_sites = pd.DataFrame.from_dict(profile["call_sites"], orient="index")
+        if call_sites.empty:
+            st.write("No allocations recorded yet.")
+        else:
+            mib = 2**20
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "Calls": call_sites["calls"],
+                        "Peak (MiB)": call_sites["last_peak_bytes"] / mib,
+                        "Max peak (MiB)": call_sites["max_peak_bytes"] / mib,
+                        "Retained (MiB)": call_sites["last_retained_bytes"] / mib,
+                    }
+                ).sort_values("Max peak (MiB)", ascending=False),
+                height=250,
+            )
+        if profile["reruns"]:
+            rerun = profile["reruns"][-1]
+            st.write(
+                f"{rerun['rerun']} rerun: "
+                f"{rerun['traced_bytes'] / 2**20:.1f} MiB traced."
+            )
+            st.write("Largest allocation changes since the previous rerun:")
+            for line in rerun["top_retained"][:5]:
+                st.caption(f"{line['bytes'] / 1024:+,.0f} KiB {line['line']}")
+
+        download_col, dump_col = st.columns(2)
+        download_col.download_button(
+            "Download",
+            data=json.dumps(profile, indent=2),
+            file_name="memory_profile.json",
+            mime="application/json",
+        )
+        if dump_col.button("Dump to file"):
+            file_path = os.path.join(os.getcwd(), "output", "memory_profile.json")
+            dump_memory_profile(file_path)
+            st.toast(f"Memory profile written to {file_path}.")
+
+
+def show_export_sidebar(tables, name):
+    from functools import partial
+
+    from src.utils.export_results import (
+        EXPORT_FORMATS,
+        available_export_formats,
+        export_file_name,
+        export_mime,
+        export_to_temporary_file,
+    )
+
+    with st.sidebar.expander(":blue[Export results]"):
+        export_format = st.selectbox(
+            "Format",
+            available_export_formats(),
+            format_func=lambda x: EXPORT_FORMATS[x]["label"],
+            key=f"{name}_export_format",
+        )
+        # the export is only written once the button is clicked, streaming the
+        # tables to a temporary file.
+        st.download_button(
+            "Download",
+            data=partial(export_to_temporary_file, tables, export_format),
+            file_name=export_file_name(tables, export_format, f"lng2p_{name}"),
+            mime=export_mime(tables, export_format),
+            on_click="ignore",
+        )
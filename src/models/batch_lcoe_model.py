@@ -0,0 +1,406 @@
+"""
+Memory-bounded batch evaluation of the LCOE and demand models.
+
+A batch is a set of rows, each one a full set of plant parameters plus a
+capacity factor, e.g. plants x Monte Carlo draws flattened into one axis.
+Discounting the cash flows of every row year by year needs rows x years
+arrays; the rows are processed in chunks sized so that those arrays stay
+within a memory budget, and the arrays can be float32 to halve it.
+
+Error bounds of float32 against the float64 reference (calculate_lcoe): the
+rounding error of a float32 discount factor grows with its period, about
+6e-8 per year, so discounted cost items and LCOE carry a relative error below
+FLOAT32_RELATIVE_ERROR_BOUND = 1e-5 for horizons (construction, operation
+and decommissioning) up to FLOAT32_MAX_BOUNDED_YEARS = 150 years, and about
+twice that at 300 years. Rounded to 2 decimals (as by calculate_lcoe), LCOE
+values can thus differ by 0.01 when they lie that close to a rounding
+boundary. float64 chunks agree with calculate_lcoe to about 1e-15 relative.
+"""
+
+import numpy as np
+
+from src.models.lcoe_model import (
+    end_of_construction_period,
+    end_of_decommissioning_period,
+    end_of_operation_period,
+    start_of_decommissioning_period,
+    start_of_operation_period,
+)
+from src.models.plant_parameters import plant_columns
+from src.utils.constants import (
+    HOURS_IN_YEAR,
+    MILLION,
+    MWH_TO_PJ,
+    PJ_TO_MTPA,
+    PRESENT_YEAR,
+    THOUSAND,
+)
+
+BATCH_PARAMETERS = [
+    "installed_capacity_mw",
+    "construction_duration_years",
+    "overnight_capex_per_kw",
+    "operational_lifetime_years",
+    "foam_cost_factor",
+    "voam_cost_per_mwh",
+    "fuel_cost_per_tLNG",
+    "carbon_cost_per_tCO2e",
+    "decommissioning_duration_years",
+    "capex_contingency_factor",
+    "decommissioning_cost_factor",
+    "efficiency_rate",
+    "emission_factor_mtco2e_per_pj",
+    "discount_rate",
+    "exchange_rate",
+    "capacity_factor",
+]
+INTEGER_PARAMETERS = [
+    "construction_duration_years",
+    "operational_lifetime_years",
+    "decommissioning_duration_years",
+]
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+FLOAT32_RELATIVE_ERROR_BOUND = 1e-5
+FLOAT32_MAX_BOUNDED_YEARS = 150
+
+# rows x years arrays alive at once while a chunk is discounted
+ROW_YEAR_ARRAYS = 4
+
+
+def batch_parameters(plants, scenarios):
+    """
+    Batch rows of every plant in every scenario, scenario-major.
+
+    Args:
+        plants (dict or PlantBatch): Plant parameters keyed by plant name.
+        scenarios (dict): Capacity factor keyed by scenario name.
+
+    Returns:
+        dict: Arrays of (scenarios x plants) rows keyed by BATCH_PARAMETERS.
+    """
+    num_scenarios = len(scenarios)
+    params = {
+        parameter: np.tile(values, num_scenarios)
+        for parameter, values in plant_columns(
+            plants, [p for p in BATCH_PARAMETERS if p != "capacity_factor"]
+        ).items()
+    }
+    params["capacity_factor"] = np.repeat(
+        np.asarray(list(scenarios.values()), dtype=float), len(plants)
+    )
+
+    return params
+
+
+def _broadcast_parameters(params):
+    missing = [parameter for parameter in BATCH_PARAMETERS if parameter not in params]
+    if missing:
+        raise ValueError(f"Batch is missing parameters {missing}.")
+    arrays = np.broadcast_arrays(
+        *[np.asarray(params[parameter]) for parameter in BATCH_PARAMETERS]
+    )
+    if arrays[0].ndim != 1:
+        raise ValueError("Batch parameters need to be scalars or 1-d arrays.")
+
+    return {
+        parameter: array.astype(
+            int if parameter in INTEGER_PARAMETERS else float, copy=False
+        )
+        for parameter, array in zip(BATCH_PARAMETERS, arrays)
+    }
+
+
+def chunk_size(num_years, dtype=np.float64, memory_budget_mb=None):
+    """
+    Number of rows per chunk keeping the rows x years arrays of a chunk
+    within the memory budget.
+
+    Args:
+        num_years (int): Length of the discounting horizon.
+        dtype: np.float64 or np.float32.
+        memory_budget_mb (float, optional): Memory budget in MB,
+        DEFAULT_MEMORY_BUDGET_MB by default.
+
+    Returns:
+        int: Rows per chunk, at least 1.
+    """
+    if memory_budget_mb is None:
+        memory_budget_mb = DEFAULT_MEMORY_BUDGET_MB
+    if memory_budget_mb <= 0:
+        raise ValueError("Memory budget needs to be positive.")
+    row_bytes = num_years * np.dtype(dtype).itemsize * ROW_YEAR_ARRAYS
+
+    return max(1, int(memory_budget_mb * 2**20 // row_bytes))
+
+
+def _chunk_annuities(p, last_year, dtype, escalations):
+    """
+    Sums of the discount factors of every row over its construction, operation
+    and decommissioning periods, per cost item when escalated.
+    """
+    periods = np.arange(last_year - PRESENT_YEAR + 1, dtype=dtype)
+    years = periods.astype(int) + PRESENT_YEAR
+    discount = (1 + p["discount_rate"].astype(dtype))[:, None] ** -periods
+
+    construction_duration = p["construction_duration_years"][:, None]
+    operational_lifetime = p["operational_lifetime_years"][:, None]
+    windows = {
+        "construction": (
+            PRESENT_YEAR,
+            end_of_construction_period(construction_duration),
+        ),
+        "operation": (
+            start_of_operation_period(construction_duration),
+            end_of_operation_period(construction_duration, operational_lifetime),
+        ),
+        "decommissioning": (
+            start_of_decommissioning_period(
+                construction_duration, operational_lifetime
+            ),
+            end_of_decommissioning_period(
+                construction_duration,
+                operational_lifetime,
+                p["decommissioning_duration_years"][:, None],
+            ),
+        ),
+    }
+    item_windows = {
+        "CAPEX": "construction",
+        "FO&M": "operation",
+        "VO&M": "operation",
+        "Fuel": "operation",
+        "Carbon": "operation",
+        "Decommissioning": "decommissioning",
+        "Revenue": "operation",
+    }
+
+    annuities = {}
+    window_discount = {}
+    for window, (start, end) in windows.items():
+        window_discount[window] = np.where(
+            (years >= start) & (years <= end), discount, dtype(0)
+        )
+        annuities[window] = window_discount[window].sum(axis=1, dtype=dtype)
+
+    item_annuities = {}
+    for item, window in item_windows.items():
+        escalation = (escalations or {}).get(item)
+        if escalation is None:
+            item_annuities[item] = annuities[window]
+        else:
+            multipliers = escalation.multipliers(years).astype(dtype)
+            item_annuities[item] = (window_discount[window] * multipliers).sum(
+                axis=1, dtype=dtype
+            )
+
+    return item_annuities
+
+
+def _chunk_cost_items(p, last_year, dtype, escalations):
+    annuities = _chunk_annuities(p, last_year, dtype, escalations)
+    exchange_rate = p["exchange_rate"]
+
+    overnight_capex = (
+        p["overnight_capex_per_kw"]
+        * p["installed_capacity_mw"]
+        * THOUSAND
+        * (1 + p["capex_contingency_factor"])
+        * exchange_rate
+    )  # R
+    capex_per_year = overnight_capex / p["construction_duration_years"]
+    output_mwh = HOURS_IN_YEAR * p["installed_capacity_mw"] * p["capacity_factor"]
+    annual_costs = {
+        "CAPEX": capex_per_year,
+        "FO&M": capex_per_year * p["foam_cost_factor"],
+        "VO&M": p["voam_cost_per_mwh"] * output_mwh * exchange_rate,
+        "Fuel": p["fuel_cost_per_tLNG"]
+        * output_mwh
+        / p["efficiency_rate"]
+        * MWH_TO_PJ
+        * PJ_TO_MTPA
+        * MILLION
+        * exchange_rate,
+        "Carbon": p["carbon_cost_per_tCO2e"]
+        * output_mwh
+        * MWH_TO_PJ
+        * p["emission_factor_mtco2e_per_pj"]
+        * MILLION
+        * exchange_rate,
+        "Decommissioning": p["decommissioning_cost_factor"]
+        * overnight_capex
+        / p["decommissioning_duration_years"],
+        "Revenue": output_mwh,
+    }
+
+    return {
+        item: annual_cost * annuities[item].astype(float)
+        for item, annual_cost in annual_costs.items()
+    }
+
+
+def _iter_chunks(params, dtype, memory_budget_mb):
+    p = _broadcast_parameters(params)
+    num_rows = len(p["discount_rate"])
+    if num_rows == 0:
+        return
+    last_year = int(
+        np.max(
+            end_of_decommissioning_period(
+                p["construction_duration_years"],
+                p["operational_lifetime_years"],
+                p["decommissioning_duration_years"],
+            )
+        )
+    )
+    rows = chunk_size(last_year - PRESENT_YEAR + 1, dtype, memory_budget_mb)
+    for start in range(0, num_rows, rows):
+        chunk = {
+            parameter: array[start : start + rows] for parameter, array in p.items()
+        }
+        yield slice(start, start + rows), chunk, last_year
+
+
+def evaluate_cost_items_batch(
+    params, dtype=np.float64, memory_budget_mb=None, escalations=None
+):
+    """
+    Discounted cost items (R) and discounted electricity output (MWh) of
+    every row, as discount_cash_flows on roll_cost_items would return them.
+
+    Args:
+        params (dict): Scalars or 1-d arrays keyed by BATCH_PARAMETERS.
+        dtype: np.float64, or np.float32 for the rows x years intermediates.
+        memory_budget_mb (float, optional): Bound on the rows x years
+        intermediates of a chunk.
+        escalations (dict, optional): Escalation keyed by cost item name,
+        as in roll_cost_items.
+
+    Returns:
+        dict: float64 arrays of the cost items and "Revenue", one value per row.
+    """
+    dtype = np.dtype(dtype).type
+    num_rows = len(_broadcast_parameters(params)["discount_rate"])
+    results = {}
+    for rows, chunk, last_year in _iter_chunks(params, dtype, memory_budget_mb):
+        for item, values in _chunk_cost_items(
+            chunk, last_year, dtype, escalations
+        ).items():
+            results.setdefault(item, np.empty(num_rows))[rows] = values
+
+    return results
+
+
+def evaluate_lcoe_batch(
+    params, dtype=np.float64, memory_budget_mb=None, escalations=None, decimals=2
+):
+    """
+    LCOE (R/kWh) of every row, as calculate_lcoe would return it.
+
+    Args:
+        See evaluate_cost_items_batch.
+        decimals (int, optional): Rounding of the result, None to keep the
+        unrounded value.
+
+    Returns:
+        np.ndarray: float64 LCOE per row.
+    """
+    dtype = np.dtype(dtype).type
+    p = _broadcast_parameters(params)
+    lcoe = np.empty(len(p["discount_rate"]))
+    for rows, chunk, last_year in _iter_chunks(p, dtype, memory_budget_mb):
+        items = _chunk_cost_items(chunk, last_year, dtype, escalations)
+        revenue = items.pop("Revenue")
+        lcoe[rows] = sum(items.values()) / revenue * chunk["exchange_rate"] / THOUSAND
+
+    return lcoe if decimals is None else np.round(lcoe, decimals)
+
+
+def evaluate_demand_batch(
+    params,
+    first_year,
+    last_year,
+    groups=None,
+    num_groups=None,
+    dtype=np.float64,
+    memory_budget_mb=None,
+):
+    """
+    Annual electricity output (PJ), LNG demand (MTPA) and emissions (MtCO2e)
+    over a horizon, summed over the rows of every group (e.g. every Monte
+    Carlo draw of a fleet).
+
+    Per-row demands are computed chunk by chunk in dtype; the group totals are
+    accumulated in float64.
+
+    Args:
+        params (dict): Scalars or 1-d arrays keyed by BATCH_PARAMETERS, with
+        capacity_factor as passed to electricity_demand_pj.
+        first_year (int): First year of the horizon.
+        last_year (int): Last year of the horizon.
+        groups (array-like, optional): Group index (0 to num_groups - 1) per
+        row; all rows form a single group by default.
+        num_groups (int, optional): Number of groups, by default one more
+        than the largest group index.
+        dtype: np.float64 or np.float32.
+        memory_budget_mb (float, optional): Bound on the per-chunk arrays.
+
+    Returns:
+        dict: (groups x years) float64 arrays keyed "PJ", "MTPA" and "MtCO2e".
+    """
+    dtype = np.dtype(dtype).type
+    p = _broadcast_parameters(params)
+    num_rows = len(p["discount_rate"])
+    groups = (
+        np.zeros(num_rows, dtype=int)
+        if groups is None
+        else np.broadcast_to(np.asarray(groups, dtype=int), (num_rows,))
+    )
+    if num_groups is None:
+        num_groups = int(groups.max()) + 1 if num_rows else 1
+    num_years = last_year - first_year + 1
+
+    # a difference array per group: demand is added in the first operating
+    # year and removed the year after the last one.
+    changes = {
+        quantity: np.zeros((num_groups, num_years + 1))
+        for quantity in ("PJ", "MTPA", "MtCO2e")
+    }
+    rows_per_chunk = chunk_size(num_years, dtype, memory_budget_mb)
+    for start in range(0, num_rows, rows_per_chunk):
+        rows = slice(start, start + rows_per_chunk)
+        construction_duration = p["construction_duration_years"][rows]
+        start_index = np.clip(
+            start_of_operation_period(construction_duration) - first_year,
+            0,
+            num_years,
+        )
+        end_index = np.clip(
+            end_of_operation_period(
+                construction_duration, p["operational_lifetime_years"][rows]
+            )
+            - first_year
+            + 1,
+            0,
+            num_years,
+        )
+        pj = (
+            HOURS_IN_YEAR
+            * p["installed_capacity_mw"][rows].astype(dtype)
+            * p["capacity_factor"][rows].astype(dtype)
+            * dtype(MWH_TO_PJ)
+        )
+        demands = {
+            "PJ": pj,
+            "MTPA": pj / p["efficiency_rate"][rows].astype(dtype) * dtype(PJ_TO_MTPA),
+            "MtCO2e": pj * p["emission_factor_mtco2e_per_pj"][rows].astype(dtype),
+        }
+        for quantity, demand in demands.items():
+            demand = demand.astype(float)
+            np.add.at(changes[quantity], (groups[rows], start_index), demand)
+            np.add.at(changes[quantity], (groups[rows], end_index), -demand)
+
+    return {
+        quantity: np.cumsum(change, axis=1)[:, :num_years]
+        for quantity, change in changes.items()
+    }
@@ -0,0 +1,358 @@
+import numpy as np
+
+from src.models.lcoe_model import (
+    end_of_construction_period,
+    end_of_decommissioning_period,
+    end_of_operation_period,
+    start_of_construction_period,
+    start_of_decommissioning_period,
+    start_of_operation_period,
+)
+from src.models.plant_parameters import PLANT_PARAMETERS, plant_columns
+from src.utils.constants import (
+    HOURS_IN_YEAR,
+    MILLION,
+    MWH_TO_PJ,
+    PJ_TO_MTPA,
+    PRESENT_YEAR,
+    THOUSAND,
+)
+
+
+def annuity_factor(start_year, end_year, discount_rate, present_year=PRESENT_YEAR):
+    """
+    Sum of the discount factors of the years from start_year to end_year, i.e.
+    the net present value of one unit per year over that window.
+
+    Args:
+        start_year (array-like): First year of the window.
+        end_year (array-like): Last year of the window.
+        discount_rate (array-like): Discount rate.
+        present_year (int): The year against which the window is discounted.
+
+    Returns:
+        np.ndarray: Annuity factor, element-wise over the inputs.
+    """
+    start_year = np.asarray(start_year, dtype=float)
+    num_years = np.asarray(end_year, dtype=float) - start_year + 1
+    discount_rate = np.asarray(discount_rate, dtype=float)
+
+    # geometric series, with the limit num_years at a zero discount rate.
+    growth = 1 + discount_rate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (
+            growth ** (present_year - start_year)
+            * (1 - growth**-num_years)
+            / (1 - 1 / growth)
+        )
+
+    return np.where(discount_rate == 0, num_years, factor)
+
+
+def escalated_annuity_factor(
+    start_year, end_year, discount_rate, escalation=None, present_year=PRESENT_YEAR
+):
+    """
+    Sum of the escalation multipliers times the discount factors of the years
+    from start_year to end_year, i.e. the net present value of one unit per
+    year escalated as in roll_cost_items. Without an escalation this is
+    annuity_factor.
+
+    Args:
+        See annuity_factor.
+        escalation (optional): ConstantEscalation, StepEscalation or
+        VectorEscalation.
+
+    Returns:
+        np.ndarray: Escalated annuity factor, element-wise over the inputs.
+    """
+    if escalation is None:
+        return annuity_factor(start_year, end_year, discount_rate, present_year)
+
+    start_year, end_year, discount_rate = np.broadcast_arrays(
+        np.asarray(start_year, dtype=int),
+        np.asarray(end_year, dtype=int),
+        np.asarray(discount_rate, dtype=float),
+    )
+    if start_year.size == 0:
+        return np.zeros(start_year.shape)
+
+    years = np.arange(start_year.min(), end_year.max() + 1)
+    in_window = (years >= start_year[..., None]) & (years <= end_year[..., None])
+    discount = (1 + discount_rate[..., None]) ** (present_year - years)
+
+    return np.where(in_window, escalation.multipliers(years) * discount, 0.0).sum(
+        axis=-1
+    )
+
+
+class CompiledPlants:
+    """
+    Linear-coefficient form of the LCOE model for a set of plants.
+
+    With the timelines, discount rate and cost escalations of a plant fixed,
+    every discounted cost item of roll_cost_items is a product of one linear
+    input and a precomputed coefficient:
+
+        CAPEX, FO&M, Decommissioning = overnight_capex_per_kw * exchange_rate * k
+        VO&M = voam_cost_per_mwh * capacity_factor * exchange_rate * k
+        Fuel = fuel_cost_per_tlng * capacity_factor * exchange_rate * k
+        Carbon = carbon_cost_per_tco2e * capacity_factor * exchange_rate * k
+        revenue = capacity_factor * k
+
+    so that any query changing only those inputs reduces to a few multiply-adds
+    per plant. Inputs broadcast against the plants axis, which is the last one:
+    pass e.g. fuel_cost_per_tlng[:, None] to evaluate a grid of fuel costs for
+    every plant at once.
+    """
+
+    def __init__(self, plant_names, linear_inputs, coefficients):
+        self.plant_names = plant_names
+        self.linear_inputs = linear_inputs
+        self.coefficients = coefficients
+
+    def discounted_cost_items(
+        self,
+        capacity_factor,
+        fuel_cost_per_tlng=None,
+        carbon_cost_per_tco2e=None,
+        voam_cost_per_mwh=None,
+        overnight_capex_per_kw=None,
+        exchange_rate=None,
+    ):
+        """
+        Discounted cost items, as discount_cash_flows would return them.
+
+        Args:
+            capacity_factor (array-like): Capacity factor, as passed to
+            roll_cost_items.
+            fuel_cost_per_tlng, carbon_cost_per_tco2e, voam_cost_per_mwh,
+            overnight_capex_per_kw, exchange_rate (array-like, optional):
+            Linear inputs; the compiled plant values are used when omitted.
+
+        Returns:
+            dict: Arrays of discounted costs (R) keyed by cost item name.
+        """
+        inputs = self._inputs(
+            fuel_cost_per_tlng,
+            carbon_cost_per_tco2e,
+            voam_cost_per_mwh,
+            overnight_capex_per_kw,
+            exchange_rate,
+        )
+        k = self.coefficients
+        capex_kw = inputs["overnight_capex_per_kw"] * inputs["exchange_rate"]
+        variable = np.asarray(capacity_factor) * inputs["exchange_rate"]
+
+        return {
+            "CAPEX": capex_kw * k["CAPEX"],
+            "FO&M": capex_kw * k["FO&M"],
+            "VO&M": variable * inputs["voam_cost_per_mwh"] * k["VO&M"],
+            "Fuel": variable * inputs["fuel_cost_per_tlng"] * k["Fuel"],
+            "Carbon": variable * inputs["carbon_cost_per_tco2e"] * k["Carbon"],
+            "Decommissioning": capex_kw * k["Decommissioning"],
+        }
+
+    def discounted_revenue(self, capacity_factor):
+        """Discounted electricity output (MWh) at the given capacity factor."""
+        return np.asarray(capacity_factor) * self.coefficients["revenue"]
+
+    def lcoe(
+        self,
+        capacity_factor,
+        fuel_cost_per_tlng=None,
+        carbon_cost_per_tco2e=None,
+        voam_cost_per_mwh=None,
+        overnight_capex_per_kw=None,
+        exchange_rate=None,
+        decimals=2,
+    ):
+        """
+        LCOE (R/kWh), as calculate_lcoe would return it.
+
+        Args:
+            See discounted_cost_items.
+            decimals (int, optional): Rounding of the result, None to keep the
+            unrounded value.
+
+        Returns:
+            np.ndarray: LCOE broadcast over the inputs and plants.
+        """
+        inputs = self._inputs(
+            fuel_cost_per_tlng,
+            carbon_cost_per_tco2e,
+            voam_cost_per_mwh,
+            overnight_capex_per_kw,
+            exchange_rate,
+        )
+        k = self.coefficients
+        capacity_factor = np.asarray(capacity_factor)
+        exchange_rate = inputs["exchange_rate"]
+
+        fixed = inputs["overnight_capex_per_kw"] * k["fixed"]
+        variable = capacity_factor * (
+            inputs["voam_cost_per_mwh"] * k["VO&M"]
+            + inputs["fuel_cost_per_tlng"] * k["Fuel"]
+            + inputs["carbon_cost_per_tco2e"] * k["Carbon"]
+        )
+        lcoe = (
+            exchange_rate
+            * (fixed + variable)
+            / (capacity_factor * k["revenue"])
+            * exchange_rate
+            / THOUSAND
+        )
+
+        return lcoe if decimals is None else np.round(lcoe, decimals)
+
+    def lcoe_curve_terms(self):
+        """
+        Terms of LCOE as a function of the capacity factor alone. Output and
+        the VO&M, fuel and carbon costs are linear in the capacity factor and
+        CAPEX, FO&M and decommissioning do not depend on it, so that
+
+            LCOE(capacity_factor) = fixed / capacity_factor + variable
+
+        Returns:
+            tuple: (fixed, variable) unrounded LCOE terms per plant.
+        """
+        k = self.coefficients
+        inputs = self.linear_inputs
+        scale = inputs["exchange_rate"] ** 2 / k["revenue"] / THOUSAND
+        fixed = inputs["overnight_capex_per_kw"] * k["fixed"] * scale
+        variable = (
+            inputs["voam_cost_per_mwh"] * k["VO&M"]
+            + inputs["fuel_cost_per_tlng"] * k["Fuel"]
+            + inputs["carbon_cost_per_tco2e"] * k["Carbon"]
+        ) * scale
+
+        return fixed, variable
+
+    def lcoe_curves(self, capacity_factors):
+        """
+        Unrounded LCOE of every plant over a grid of capacity factors, from
+        the closed form of lcoe_curve_terms.
+
+        Args:
+            capacity_factors (array-like): 1-d grid of capacity factors, as
+            passed to roll_cost_items.
+
+        Returns:
+            np.ndarray: (capacity factors x plants) LCOE (R/kWh).
+        """
+        fixed, variable = self.lcoe_curve_terms()
+        capacity_factors = np.asarray(capacity_factors, dtype=float)[:, None]
+
+        return fixed / capacity_factors + variable
+
+    def _inputs(
+        self,
+        fuel_cost_per_tlng,
+        carbon_cost_per_tco2e,
+        voam_cost_per_mwh,
+        overnight_capex_per_kw,
+        exchange_rate,
+    ):
+        overrides = {
+            "fuel_cost_per_tlng": fuel_cost_per_tlng,
+            "carbon_cost_per_tco2e": carbon_cost_per_tco2e,
+            "voam_cost_per_mwh": voam_cost_per_mwh,
+            "overnight_capex_per_kw": overnight_capex_per_kw,
+            "exchange_rate": exchange_rate,
+        }
+        return {
+            name: self.linear_inputs[name] if value is None else np.asarray(value)
+            for name, value in overrides.items()
+        }
+
+
+def compile_plants(plants, escalations=None):
+    """
+    Precompute the discounted coefficients of every plant.
+
+    Args:
+        plants (dict or PlantBatch): Plant parameters keyed by plant name.
+        escalations (dict, optional): Escalation keyed by cost item name (see
+        roll_cost_items), folded into the coefficients of the cost items.
+
+    Returns:
+        CompiledPlants: Compiled form of the plants, in the order of plants.
+    """
+    plant_names = list(plants)
+    columns = plant_columns(plants, PLANT_PARAMETERS)
+
+    def column(parameter):
+        return columns[parameter]
+
+    installed_capacity_mw = column("installed_capacity_mw")
+    construction_duration = column("construction_duration_years")
+    operational_lifetime = column("operational_lifetime_years")
+    decommissioning_duration = column("decommissioning_duration_years")
+    capex_contingency = column("capex_contingency_factor")
+    discount_rate = column("discount_rate")
+    escalations = escalations or {}
+
+    construction_window = (
+        start_of_construction_period(),
+        end_of_construction_period(construction_duration),
+    )
+    operation_window = (
+        start_of_operation_period(construction_duration),
+        end_of_operation_period(construction_duration, operational_lifetime),
+    )
+    decommissioning_window = (
+        start_of_decommissioning_period(construction_duration, operational_lifetime),
+        end_of_decommissioning_period(
+            construction_duration, operational_lifetime, decommissioning_duration
+        ),
+    )
+
+    def annuity(window, item=None):
+        return escalated_annuity_factor(*window, discount_rate, escalations.get(item))
+
+    operation_annuity = annuity(operation_window)
+
+    # overnight capital cost with contingency per $/kW of overnight cost
+    capex_per_kw = installed_capacity_mw * THOUSAND * (1 + capex_contingency)
+    # electricity output per unit of capacity factor (MWh/year)
+    output_mwh = HOURS_IN_YEAR * installed_capacity_mw
+
+    coefficients = {
+        "CAPEX": capex_per_kw
+        / construction_duration
+        * annuity(construction_window, "CAPEX"),
+        "FO&M": capex_per_kw
+        / construction_duration
+        * column("foam_cost_factor")
+        * annuity(operation_window, "FO&M"),
+        "VO&M": output_mwh * annuity(operation_window, "VO&M"),
+        "Fuel": output_mwh
+        / column("efficiency_rate")
+        * MWH_TO_PJ
+        * PJ_TO_MTPA
+        * MILLION
+        * annuity(operation_window, "Fuel"),
+        "Carbon": output_mwh
+        * MWH_TO_PJ
+        * column("emission_factor_mtco2e_per_pj")
+        * MILLION
+        * annuity(operation_window, "Carbon"),
+        "Decommissioning": column("decommissioning_cost_factor")
+        * capex_per_kw
+        / decommissioning_duration
+        * annuity(decommissioning_window, "Decommissioning"),
+        "revenue": output_mwh * operation_annuity,
+    }
+    coefficients["fixed"] = (
+        coefficients["CAPEX"] + coefficients["FO&M"] + coefficients["Decommissioning"]
+    )
+
+    linear_inputs = {
+        "fuel_cost_per_tlng": column("fuel_cost_per_tLNG"),
+        "carbon_cost_per_tco2e": column("carbon_cost_per_tCO2e"),
+        "voam_cost_per_mwh": column("voam_cost_per_mwh"),
+        "overnight_capex_per_kw": column("overnight_capex_per_kw"),
+        "exchange_rate": column("exchange_rate"),
+    }
+
+    return CompiledPlants(plant_names, linear_inputs, coefficients)
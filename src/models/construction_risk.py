@@ -0,0 +1,199 @@
+"""
+Monte Carlo simulation of construction delays and capital cost overruns.
+
+The deterministic model builds every plant in exactly
+construction_duration_years with capex_contingency_factor as a fixed markup.
+Here every draw samples, per plant:
+
+- a delay of whole years, Poisson distributed with mean mean_delay_years,
+  which lengthens the construction period and so shifts the operation and
+  decommissioning windows (and the first power year) by the delay;
+- a capex overrun, (1 + capex_contingency_factor) times a lognormal factor
+  of mean 1 and spread overrun_sigma, plus delay_overrun_per_year of the
+  overnight capex per year of delay, which replaces the fixed markup.
+
+The capex is spread over the longer construction period as in
+overnight_capex. FO&M is a fraction of the annual capex in the model, so
+its factor is scaled by the construction period to keep the annual FO&M of
+a delayed plant unchanged.
+
+All draws of all plants and scenarios are evaluated at once as rows of the
+batch evaluator.
+"""
+
+import numpy as np
+
+from src.models.batch_lcoe_model import BATCH_PARAMETERS, evaluate_cost_items_batch
+from src.models.lcoe_model import start_of_operation_period
+from src.utils.constants import THOUSAND
+
+DEFAULT_NUM_DRAWS = 1000
+DEFAULT_MEAN_DELAY_YEARS = 1.0
+DEFAULT_OVERRUN_SIGMA = 0.3
+DEFAULT_DELAY_OVERRUN_PER_YEAR = 0.05
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+def sample_construction_risk(
+    rng,
+    plants,
+    num_draws=DEFAULT_NUM_DRAWS,
+    mean_delay_years=DEFAULT_MEAN_DELAY_YEARS,
+    overrun_sigma=DEFAULT_OVERRUN_SIGMA,
+    delay_overrun_per_year=DEFAULT_DELAY_OVERRUN_PER_YEAR,
+):
+    """
+    Sample construction delays and capex overruns.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        plants (dict): Plant parameters keyed by plant name.
+        num_draws (int): Number of draws.
+        mean_delay_years (float or array): Mean delay (years), per plant if
+        an array.
+        overrun_sigma (float or array): Spread of the lognormal overrun.
+        delay_overrun_per_year (float or array): Capex overrun per year of
+        delay, as a fraction of the overnight capex.
+
+    Returns:
+        dict: (draws x plants) arrays "delay_years" (int) and
+        "capex_contingency_factor", the sampled markup on the overnight capex.
+    """
+    if num_draws < 1:
+        raise ValueError("Number of draws needs to be positive.")
+    shape = (num_draws, len(plants))
+    mean_delay_years = np.broadcast_to(mean_delay_years, shape)
+    overrun_sigma = np.broadcast_to(overrun_sigma, shape)
+    if np.any(mean_delay_years < 0) or np.any(overrun_sigma < 0):
+        raise ValueError("Mean delay and overrun spread need to be non-negative.")
+
+    contingency = np.array(
+        [plants[plant]["capex_contingency_factor"] for plant in plants]
+    )
+    delay_years = rng.poisson(mean_delay_years)
+    # lognormal of mean 1: the markup equals the fixed contingency on average
+    overrun = rng.lognormal(-(overrun_sigma**2) / 2, overrun_sigma)
+
+    return {
+        "delay_years": delay_years,
+        "capex_contingency_factor": (1 + contingency) * overrun
+        - 1
+        + delay_overrun_per_year * delay_years,
+    }
+
+
+def simulate_construction_risk(
+    plants,
+    scenarios,
+    num_draws=DEFAULT_NUM_DRAWS,
+    seed=None,
+    escalations=None,
+    **risk,
+):
+    """
+    Discounted costs, LCOE and first power year of every plant under sampled
+    construction delays and capex overruns.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        scenarios (dict): Capacity factor keyed by scenario name.
+        num_draws (int): Number of draws.
+        seed (int, optional): Seed of the random generator.
+        escalations (dict, optional): Escalation keyed by cost item name.
+        **risk: mean_delay_years, overrun_sigma and delay_overrun_per_year,
+        see sample_construction_risk.
+
+    Returns:
+        dict: "LCOE" (R/kWh, unrounded) and "Discounted cost" (R) as
+        (draws x scenarios x plants) arrays, "first_power_year" and
+        "delay_years" as (draws x plants) arrays, with the plant and scenario
+        names.
+    """
+    rng = np.random.default_rng(seed)
+    plant_names = list(plants)
+    scenario_names = list(scenarios)
+    samples = sample_construction_risk(rng, plants, num_draws, **risk)
+
+    shape = (num_draws, len(scenario_names), len(plant_names))
+    params = {
+        parameter: np.broadcast_to(
+            [plants[plant][parameter] for plant in plant_names], shape
+        )
+        for parameter in BATCH_PARAMETERS
+        if parameter != "capacity_factor"
+    }
+    construction_duration = params["construction_duration_years"]
+    delayed_construction_duration = (
+        construction_duration + samples["delay_years"][:, None, :]
+    )
+    params["construction_duration_years"] = delayed_construction_duration
+    params["foam_cost_factor"] = (
+        params["foam_cost_factor"]
+        * delayed_construction_duration
+        / construction_duration
+    )
+    params["capex_contingency_factor"] = np.broadcast_to(
+        samples["capex_contingency_factor"][:, None, :], shape
+    )
+    params["capacity_factor"] = np.broadcast_to(
+        np.asarray(list(scenarios.values()), dtype=float)[:, None], shape
+    )
+
+    cost_items = evaluate_cost_items_batch(
+        {parameter: np.ravel(values) for parameter, values in params.items()},
+        escalations=escalations,
+    )
+    revenue = cost_items.pop("Revenue")
+    discounted_cost = sum(cost_items.values())
+    lcoe = discounted_cost / revenue * np.ravel(params["exchange_rate"]) / THOUSAND
+
+    return {
+        "plant_names": plant_names,
+        "scenario_names": scenario_names,
+        "LCOE": lcoe.reshape(shape),
+        "Discounted cost": discounted_cost.reshape(shape),
+        "first_power_year": start_of_operation_period(
+            delayed_construction_duration[:, 0, :]
+        ),
+        "delay_years": samples["delay_years"],
+    }
+
+
+def summarize_construction_risk(results, percentiles=DEFAULT_PERCENTILES):
+    """
+    Mean and percentiles of the simulated LCOE and first power year.
+
+    Args:
+        results (dict): As returned by simulate_construction_risk.
+        percentiles (sequence): Percentiles to report.
+
+    Returns:
+        pd.DataFrame: One row per scenario, plant and metric ("LCOE" or
+        "First power year"), with a "Mean" and a "P<percentile>" column per
+        percentile.
+    """
+    import pandas as pd
+
+    first_power_year = np.broadcast_to(
+        results["first_power_year"][:, None, :], results["LCOE"].shape
+    )
+    rows = []
+    for metric, values in (
+        ("LCOE", results["LCOE"]),
+        ("First power year", first_power_year),
+    ):
+        mean = values.mean(axis=0)
+        quantiles = np.percentile(values, percentiles, axis=0)
+        for s, scenario in enumerate(results["scenario_names"]):
+            for p, plant in enumerate(results["plant_names"]):
+                row = {
+                    "Scenario": scenario,
+                    "Power Plant": plant,
+                    "Metric": metric,
+                    "Mean": mean[s, p],
+                }
+                for percentile, quantile in zip(percentiles, quantiles):
+                    row[f"P{percentile:g}"] = quantile[s, p]
+                rows.append(row)
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,256 @@
+import numpy as np
+
+from src.models.lcoe_model import (
+    calculate_lcoe,
+    create_cash_flow,
+    create_cost_items,
+    end_of_operation_period,
+    roll_cost_items,
+    start_of_operation_period,
+)
+from src.utils.constants import (
+    HOURS_IN_YEAR,
+    MILLION,
+    MWH_TO_PJ,
+    PJ_TO_MTPA,
+    PRESENT_YEAR,
+)
+
+
+def simulate_hourly_dispatch(
+    installed_capacity_mw,
+    efficiency_factor,
+    emission_factor_mtco2e_per_pj,
+    dispatch_profile,
+    part_load_efficiency_loss=0.0,
+    startup_fuel_mwh_per_mw=0.0,
+):
+    """
+    Simulate a year of hourly dispatch for a fleet of power plants.
+
+    All quantities are computed as (hours x plants) arrays in one pass, without
+    a loop over the hours.
+
+    Args:
+        installed_capacity_mw (array-like): Installed capacity per plant (MW).
+        efficiency_factor (array-like): Rated (full load) efficiency per plant.
+        emission_factor_mtco2e_per_pj (array-like): Emission factor per plant,
+        in MtCO2e per PJ of electricity generated at rated efficiency.
+        dispatch_profile (array-like): Load as a fraction of installed capacity
+        for every hour of the year, either (8760,) shared by all plants or
+        (8760, plants).
+        part_load_efficiency_loss (float or array-like): Relative efficiency
+        loss towards zero load; the efficiency at load l is
+        rated * (1 - loss * (1 - l) ** 2).
+        startup_fuel_mwh_per_mw (float or array-like): Fuel burnt per start-up,
+        in MWh (thermal) per MW of installed capacity. A plant starts in every
+        hour it runs after an hour standing still, the year wrapping around.
+
+    Returns:
+        dict: (hours x plants) arrays of electricity output (MWh), fuel input
+        (MWh thermal), LNG (tonnes) and emissions (tCO2e), and the start-ups.
+    """
+    installed_capacity_mw = np.asarray(installed_capacity_mw, dtype=float)
+    efficiency_factor = np.asarray(efficiency_factor, dtype=float)
+    emission_factor_mtco2e_per_pj = np.asarray(
+        emission_factor_mtco2e_per_pj, dtype=float
+    )
+    load = np.asarray(dispatch_profile, dtype=float)
+    if load.ndim == 1:
+        load = load[:, None]
+    if load.shape[0] != HOURS_IN_YEAR:
+        raise ValueError(
+            f"Dispatch profile needs {HOURS_IN_YEAR} hours, got {load.shape[0]}."
+        )
+    if np.any(load < 0.0) or np.any(load > 1.0):
+        raise ValueError("Dispatch profile loads need to be between 0 and 1.")
+    load = np.broadcast_to(load, (HOURS_IN_YEAR, len(installed_capacity_mw)))
+
+    output_mwh = load * installed_capacity_mw  # MWh per hour
+
+    # part load efficiency
+    efficiency = efficiency_factor * (
+        1.0 - np.asarray(part_load_efficiency_loss) * (1.0 - load) ** 2
+    )
+    running = load > 0.0
+    fuel_input_mwh = np.divide(
+        output_mwh, efficiency, out=np.zeros_like(output_mwh), where=running
+    )
+
+    # start-up fuel
+    starts = running & ~np.roll(running, 1, axis=0)
+    fuel_input_mwh = fuel_input_mwh + starts * (
+        np.asarray(startup_fuel_mwh_per_mw) * installed_capacity_mw
+    )
+
+    fuel_input_pj = fuel_input_mwh * MWH_TO_PJ
+    lng_tonnes = fuel_input_pj * PJ_TO_MTPA * MILLION
+    # emission factors are per PJ of electricity at rated efficiency, so per PJ
+    # of fuel they are scaled by the rated efficiency.
+    emissions_tco2e = (
+        fuel_input_pj * efficiency_factor * emission_factor_mtco2e_per_pj * MILLION
+    )
+
+    return {
+        "output_mwh": output_mwh,
+        "fuel_input_mwh": fuel_input_mwh,
+        "lng_tonnes": lng_tonnes,
+        "emissions_tco2e": emissions_tco2e,
+        "starts": starts,
+    }
+
+
+def annual_dispatch_totals(dispatch):
+    """
+    Annual totals per plant of an hourly dispatch simulation.
+
+    Args:
+        dispatch (dict): Result of simulate_hourly_dispatch.
+
+    Returns:
+        dict: Arrays per plant of output (MWh/year), fuel input (MWh/year),
+        LNG demand (MTPA), emissions (MtCO2e/year) and number of start-ups.
+    """
+    return {
+        "output_mwh": dispatch["output_mwh"].sum(axis=0),
+        "fuel_input_mwh": dispatch["fuel_input_mwh"].sum(axis=0),
+        "mtpa": dispatch["lng_tonnes"].sum(axis=0) / MILLION,
+        "mtco2e": dispatch["emissions_tco2e"].sum(axis=0) / MILLION,
+        "starts": dispatch["starts"].sum(axis=0),
+    }
+
+
+def dispatch_equivalent_parameters(installed_capacity_mw, totals):
+    """
+    Capacity factor, efficiency and emission factor that reproduce the annual
+    dispatch totals in the capacity-factor model of lng_demand_model.
+
+    Args:
+        installed_capacity_mw (array-like): Installed capacity per plant (MW).
+        totals (dict): Result of annual_dispatch_totals.
+
+    Returns:
+        dict: Arrays per plant of capacity_factor (fraction), efficiency_factor
+        and emission_factor_mtco2e_per_pj. The efficiency and emission factor
+        of a plant that never runs are NaN.
+    """
+    output_mwh = totals["output_mwh"]
+    runs = output_mwh > 0.0
+
+    def per_output(values, output):
+        return np.divide(
+            values, output, out=np.full(len(output_mwh), np.nan), where=runs
+        )
+
+    return {
+        "capacity_factor": output_mwh
+        / (HOURS_IN_YEAR * np.asarray(installed_capacity_mw, dtype=float)),
+        "efficiency_factor": per_output(output_mwh, totals["fuel_input_mwh"]),
+        "emission_factor_mtco2e_per_pj": per_output(
+            totals["mtco2e"], output_mwh * MWH_TO_PJ
+        ),
+    }
+
+
+def compute_dispatch_lcoe(
+    plants,
+    dispatch_profiles,
+    part_load_efficiency_loss=0.0,
+    startup_fuel_mwh_per_mw=0.0,
+):
+    """
+    LCOE of every plant from an hourly dispatch simulation.
+
+    The annual totals of the simulation are turned into an equivalent capacity
+    factor, efficiency and emission factor, which feed the existing cost items
+    and LCOE calculation.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        dispatch_profiles (dict): Hourly load profile (8760 fractions of
+        installed capacity) keyed by plant name.
+        part_load_efficiency_loss (float): See simulate_hourly_dispatch.
+        startup_fuel_mwh_per_mw (float): See simulate_hourly_dispatch.
+
+    Returns:
+        dict: Annual totals, equivalent parameters and LCOE (R/kWh) per plant,
+        keyed by plant name. A plant whose profile is all zeros generates
+        nothing, so its LCOE (and efficiency and emission factor) is NaN.
+    """
+    plant_names = list(plants.keys())
+    installed_capacity_mw = [
+        float(plants[plant]["installed_capacity_mw"]) for plant in plant_names
+    ]
+    dispatch = simulate_hourly_dispatch(
+        installed_capacity_mw,
+        [float(plants[plant]["efficiency_rate"]) for plant in plant_names],
+        [
+            float(plants[plant]["emission_factor_mtco2e_per_pj"])
+            for plant in plant_names
+        ],
+        np.column_stack([dispatch_profiles[plant] for plant in plant_names]),
+        part_load_efficiency_loss,
+        startup_fuel_mwh_per_mw,
+    )
+    totals = annual_dispatch_totals(dispatch)
+    equivalents = dispatch_equivalent_parameters(installed_capacity_mw, totals)
+
+    plant_dispatch_lcoe = {}
+    for index, plant in enumerate(plant_names):
+        plant_dispatch_lcoe[plant] = {
+            "output_mwh": float(totals["output_mwh"][index]),
+            "mtpa": float(totals["mtpa"][index]),
+            "mtco2e": float(totals["mtco2e"][index]),
+            "starts": int(totals["starts"][index]),
+            "capacity_factor": float(equivalents["capacity_factor"][index]),
+            "efficiency_factor": float(equivalents["efficiency_factor"][index]),
+            "emission_factor_mtco2e_per_pj": float(
+                equivalents["emission_factor_mtco2e_per_pj"][index]
+            ),
+            "lcoe": np.nan,
+        }
+        if totals["output_mwh"][index] <= 0.0:
+            continue
+
+        construction_duration_years = int(plants[plant]["construction_duration_years"])
+        operational_lifetime_years = int(plants[plant]["operational_lifetime_years"])
+        exchange_rate = float(plants[plant]["exchange_rate"])
+
+        plant_revenue_item = (
+            start_of_operation_period(construction_duration_years),
+            end_of_operation_period(
+                construction_duration_years, operational_lifetime_years
+            ),
+            float(totals["output_mwh"][index]),
+        )
+
+        plant_cost_items = roll_cost_items(
+            installed_capacity_mw[index],
+            construction_duration_years,
+            operational_lifetime_years,
+            int(plants[plant]["decommissioning_duration_years"]),
+            float(plants[plant]["overnight_capex_per_kw"]),
+            float(plants[plant]["capex_contingency_factor"]),
+            float(plants[plant]["foam_cost_factor"]),
+            float(plants[plant]["voam_cost_per_mwh"]),
+            float(plants[plant]["fuel_cost_per_tLNG"]),
+            float(plants[plant]["carbon_cost_per_tCO2e"]),
+            float(plants[plant]["decommissioning_cost_factor"]),
+            float(equivalents["capacity_factor"][index]),
+            float(equivalents["emission_factor_mtco2e_per_pj"][index]),
+            float(equivalents["efficiency_factor"][index]),
+            exchange_rate,
+        )
+
+        revenue_item = create_cash_flow(plant_revenue_item)
+        cost_items = create_cost_items(plant_cost_items)
+
+        plant_dispatch_lcoe[plant]["lcoe"] = calculate_lcoe(
+            revenue_item,
+            cost_items,
+            float(plants[plant]["discount_rate"]),
+            exchange_rate,
+            PRESENT_YEAR,
+        )
+
+    return plant_dispatch_lcoe
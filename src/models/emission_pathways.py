@@ -0,0 +1,169 @@
+"""
+Annual emissions pathways of a fleet and carbon budget checks.
+
+compute_demand_scenario_emissions gives the steady-state emissions of every
+plant for every energy carrier (fuel type). Here the emissions are laid out
+over the timeline of every plant as a (scenarios x plants x years x carriers)
+tensor: the steady-state emissions in the operating years and, optionally,
+embodied emissions per MW spread evenly over the construction and
+decommissioning years. The tensor is an outer product of per-plant values,
+year masks and emission factors, so it costs one array operation whatever
+the size of the fleet and the length of the horizon.
+"""
+
+import numpy as np
+
+from src.models.lcoe_model import (
+    end_of_construction_period,
+    end_of_decommissioning_period,
+    end_of_operation_period,
+    start_of_construction_period,
+    start_of_decommissioning_period,
+    start_of_operation_period,
+)
+from src.models.lng_demand_model import electricity_demand_pj
+from src.utils.constants import PRESENT_YEAR
+
+
+def emission_pathways(
+    plants,
+    scenarios,
+    emission_factors,
+    construction_mtco2e_per_mw=0.0,
+    decommissioning_mtco2e_per_mw=0.0,
+):
+    """
+    Annual emissions of every plant and energy carrier over the full
+    construction, operation and decommissioning timeline.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        scenarios (dict): Capacity factor (%) keyed by scenario name.
+        emission_factors (dict): MtCO2e per PJ keyed by energy carrier.
+        construction_mtco2e_per_mw (float): Embodied emissions of building a
+        MW, spread over the construction years.
+        decommissioning_mtco2e_per_mw (float): Emissions of decommissioning a
+        MW, spread over the decommissioning years.
+
+    Returns:
+        dict: "years", "scenario_names", "plant_names", "carriers" and
+        "MtCO2e", the (scenarios x plants x years x carriers) tensor.
+    """
+    plant_names = list(plants)
+    carriers = list(emission_factors)
+
+    def parameter(name):
+        return np.array([plants[plant][name] for plant in plant_names])
+
+    capacity = parameter("installed_capacity_mw").astype(float)
+    construction_duration = parameter("construction_duration_years").astype(int)
+    operational_lifetime = parameter("operational_lifetime_years").astype(int)
+    decommissioning_duration = parameter("decommissioning_duration_years").astype(int)
+    years = np.arange(
+        PRESENT_YEAR,
+        int(
+            np.max(
+                end_of_decommissioning_period(
+                    construction_duration,
+                    operational_lifetime,
+                    decommissioning_duration,
+                ),
+                initial=PRESENT_YEAR,
+            )
+        )
+        + 1,
+    )
+
+    def window(start, end):
+        return (years >= np.asarray(start)[:, None]) & (
+            years <= np.asarray(end)[:, None]
+        )
+
+    # (plants x years) masks of the phases
+    constructing = window(
+        np.full(len(plant_names), start_of_construction_period()),
+        end_of_construction_period(construction_duration),
+    )
+    operating = window(
+        start_of_operation_period(construction_duration),
+        end_of_operation_period(construction_duration, operational_lifetime),
+    )
+    decommissioning = window(
+        start_of_decommissioning_period(construction_duration, operational_lifetime),
+        end_of_decommissioning_period(
+            construction_duration, operational_lifetime, decommissioning_duration
+        ),
+    )
+
+    # (scenarios x plants) steady-state electricity output
+    capacity_factors = np.asarray(list(scenarios.values()), dtype=float) / 100.0
+    pj = electricity_demand_pj(capacity, capacity_factors[:, None])
+    factors = np.asarray(list(emission_factors.values()), dtype=float)
+
+    mtco2e = (
+        pj[:, :, None, None] * operating[None, :, :, None] * factors
+    )  # PJ/year * MtCO2e/PJ = MtCO2e/year
+    phase_mtco2e = (
+        constructing
+        * (construction_mtco2e_per_mw * capacity / construction_duration)[:, None]
+        + decommissioning
+        * (decommissioning_mtco2e_per_mw * capacity / decommissioning_duration)[:, None]
+    )
+    mtco2e += phase_mtco2e[None, :, :, None]
+
+    return {
+        "years": years,
+        "scenario_names": list(scenarios),
+        "plant_names": plant_names,
+        "carriers": carriers,
+        "MtCO2e": mtco2e,
+    }
+
+
+def check_carbon_budget(pathways, carbon_budget_mtco2e, last_year=None):
+    """
+    Cumulative fleet emissions against a carbon budget.
+
+    Args:
+        pathways (dict): As returned by emission_pathways.
+        carbon_budget_mtco2e (float or dict): Budget over the years up to
+        last_year, or per scenario name.
+        last_year (int, optional): Last year counted against the budget, the
+        end of the pathways by default.
+
+    Returns:
+        dict: (scenarios x years x carriers) "Cumulative MtCO2e" of the
+        fleet, and (scenarios x carriers) "Total MtCO2e" up to last_year,
+        "Budget MtCO2e", "Remaining MtCO2e", "Within budget" and "Exceeded in",
+        the first year the cumulative emissions exceed the budget (0 if they
+        never do).
+    """
+    years = pathways["years"]
+    if last_year is not None:
+        if last_year < years[0]:
+            raise ValueError(f"Last year needs to be at least {years[0]}.")
+        years = years[years <= last_year]
+    if isinstance(carbon_budget_mtco2e, dict):
+        budget = np.array(
+            [carbon_budget_mtco2e[name] for name in pathways["scenario_names"]],
+            dtype=float,
+        )
+    else:
+        budget = np.full(len(pathways["scenario_names"]), float(carbon_budget_mtco2e))
+
+    fleet_mtco2e = pathways["MtCO2e"][:, :, : len(years)].sum(axis=1)
+    cumulative = np.cumsum(fleet_mtco2e, axis=1)
+    total = cumulative[:, -1]
+    exceeded = cumulative > budget[:, None, None]
+
+    return {
+        "years": years,
+        "Cumulative MtCO2e": cumulative,
+        "Total MtCO2e": total,
+        "Budget MtCO2e": np.broadcast_to(budget[:, None], total.shape),
+        "Remaining MtCO2e": budget[:, None] - total,
+        "Within budget": ~exceeded.any(axis=1),
+        "Exceeded in": np.where(
+            exceeded.any(axis=1), years[np.argmax(exceeded, axis=1)], 0
+        ),
+    }
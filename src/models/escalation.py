@@ -0,0 +1,147 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.utils.constants import PRESENT_YEAR
+
+# cost items of roll_cost_items an escalation can apply to
+ESCALATED_COST_ITEMS = ("CAPEX", "FO&M", "VO&M", "Fuel", "Carbon", "Decommissioning")
+
+
+class _Escalation(ABC):
+    """Escalations compare and hash by their schedule, so equal schedules
+    loaded by different sessions share cached results."""
+
+    @abstractmethod
+    def key(self):
+        """Hashable schedule of the escalation."""
+
+    @abstractmethod
+    def multipliers(self, years):
+        """Escalation multipliers of the given project years."""
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.key()))
+
+
+class ConstantEscalation(_Escalation):
+    """Escalates a cost at a constant growth rate per year from the present year."""
+
+    def __init__(self, growth_rate):
+        self.growth_rate = growth_rate
+
+    def key(self):
+        return (float(self.growth_rate),)
+
+    def multipliers(self, years):
+        """
+        Escalation multipliers of the given project years.
+
+        Args:
+            years (array-like): Project years.
+
+        Returns:
+            np.ndarray: (1 + growth_rate) ** (year - present year) per year.
+        """
+        periods = np.asarray(years) - PRESENT_YEAR
+        return (1 + self.growth_rate) ** periods
+
+
+class StepEscalation(_Escalation):
+    """
+    Escalates a cost with a step schedule. Each step sets the multiplier from
+    its year onward, until the next step; years before the first step keep
+    the unescalated cost.
+    """
+
+    def __init__(self, steps):
+        """
+        Args:
+            steps (dict): Multipliers keyed by the project year they start in.
+        """
+        step_years = sorted(steps)
+        self.step_years = np.asarray(step_years)
+        self.step_multipliers = np.asarray(
+            [1.0] + [float(steps[year]) for year in step_years]
+        )
+
+    def key(self):
+        return (
+            tuple(self.step_years.tolist()),
+            tuple(self.step_multipliers.tolist()),
+        )
+
+    def multipliers(self, years):
+        """
+        Escalation multipliers of the given project years.
+
+        Args:
+            years (array-like): Project years.
+
+        Returns:
+            np.ndarray: Multiplier of the latest step started by each year.
+        """
+        step_index = np.searchsorted(self.step_years, np.asarray(years), side="right")
+        return self.step_multipliers[step_index]
+
+
+class VectorEscalation(_Escalation):
+    """
+    Escalates a cost with an arbitrary vector of multipliers, the first one
+    applying to the present year. Years past the end of the vector keep its
+    last multiplier.
+    """
+
+    def __init__(self, multipliers):
+        self.vector = np.asarray(multipliers, dtype=float)
+        if self.vector.ndim != 1 or len(self.vector) == 0:
+            raise ValueError("Escalation vector needs at least one multiplier.")
+
+    def key(self):
+        return tuple(self.vector.tolist())
+
+    def multipliers(self, years):
+        """
+        Escalation multipliers of the given project years.
+
+        Args:
+            years (array-like): Project years.
+
+        Returns:
+            np.ndarray: Multiplier of each year taken from the vector.
+        """
+        periods = np.asarray(years) - PRESENT_YEAR
+        return self.vector[np.clip(periods, 0, len(self.vector) - 1)]
+
+
+def escalate_expense(expense_value, start_year, end_year, escalation):
+    """
+    Turn a constant yearly expense into an escalated per-year profile.
+
+    Args:
+        expense_value (float): Unescalated expense per year.
+        start_year (int): First year of the expense.
+        end_year (int): Last year of the expense.
+        escalation: ConstantEscalation, StepEscalation or VectorEscalation.
+
+    Returns:
+        np.ndarray: Expense value of every year from start_year to end_year.
+    """
+    years = np.arange(start_year, end_year + 1)
+    return expense_value * escalation.multipliers(years)
+
+
+def escalations_key(escalations):
+    """
+    Hashable, JSON-serialisable key of escalations keyed by cost item name,
+    equal for equal schedules; None without escalations.
+    """
+    if not escalations:
+        return None
+    return tuple(
+        (cost_item, type(escalation).__name__, escalation.key())
+        for cost_item, escalation in sorted(escalations.items())
+    )
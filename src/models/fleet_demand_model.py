@@ -0,0 +1,113 @@
+import numpy as np
+
+from src.models.lcoe_model import end_of_operation_period, start_of_operation_period
+from src.models.lng_demand_model import electricity_demand_pj, feedstock_demand_mtpa
+
+
+def fleet_operation_windows(construction_durations, operational_lifetimes):
+    """
+    First and last operating year of every plant in a fleet.
+
+    Args:
+        construction_durations (array-like): Construction duration per plant.
+        operational_lifetimes (array-like): Operational lifetime per plant.
+
+    Returns:
+        tuple: (operation_start, operation_end) integer arrays per plant.
+    """
+    construction_durations = np.asarray(construction_durations, dtype=int)
+    operational_lifetimes = np.asarray(operational_lifetimes, dtype=int)
+    operation_start = start_of_operation_period(construction_durations)
+    operation_end = end_of_operation_period(
+        construction_durations, operational_lifetimes
+    )
+
+    return operation_start, operation_end
+
+
+def fleet_demand_matrix(operation_start, operation_end, annual_demands, years):
+    """
+    Plants x years demand matrix: the annual demand of a plant in every year
+    of its operation window and zero outside of it.
+
+    Args:
+        operation_start (array-like): First operating year per plant.
+        operation_end (array-like): Last operating year per plant.
+        annual_demands (array-like): Steady-state annual demand per plant.
+        years (array-like): Years of the horizon.
+
+    Returns:
+        np.ndarray: Demand of every plant (rows) in every year (columns).
+    """
+    years = np.asarray(years)
+    operating = (years >= np.asarray(operation_start)[:, None]) & (
+        years <= np.asarray(operation_end)[:, None]
+    )
+
+    return operating * np.asarray(annual_demands, dtype=float)[:, None]
+
+
+def fleet_demand_timeseries(
+    operation_start, operation_end, annual_demands, first_year, last_year
+):
+    """
+    Aggregate annual demand of a fleet over a horizon.
+
+    Equivalent to summing fleet_demand_matrix over the plants, but built from
+    a difference array, so it takes O(plants + years) time and memory
+    whatever the size of the fleet and the length of the horizon.
+
+    Args:
+        operation_start (array-like): First operating year per plant.
+        operation_end (array-like): Last operating year per plant.
+        annual_demands (array-like): Steady-state annual demand per plant,
+        optionally with leading dimensions, e.g. (scenarios, plants).
+        first_year (int): First year of the horizon.
+        last_year (int): Last year of the horizon.
+
+    Returns:
+        np.ndarray: Fleet demand of every year from first_year to last_year,
+        with the leading dimensions of annual_demands.
+    """
+    annual_demands = np.asarray(annual_demands, dtype=float)
+    num_years = last_year - first_year + 1
+    start_index = np.clip(np.asarray(operation_start) - first_year, 0, num_years)
+    end_index = np.clip(np.asarray(operation_end) - first_year + 1, 0, num_years)
+
+    # demand is added in the first operating year and removed the year after
+    # the last one; a cumulative sum then yields the demand of every year.
+    leading_shape = annual_demands.shape[:-1]
+    changes = np.zeros(leading_shape + (num_years + 1,))
+    flat_changes = changes.reshape(-1, num_years + 1)
+    flat_demands = annual_demands.reshape(-1, annual_demands.shape[-1])
+    rows = np.arange(len(flat_changes))[:, None]
+    np.add.at(flat_changes, (rows, start_index[None, :]), flat_demands)
+    np.add.at(flat_changes, (rows, end_index[None, :]), -flat_demands)
+
+    return np.cumsum(changes, axis=-1)[..., :num_years]
+
+
+def fleet_scenario_demands(
+    installed_capacities_mw, efficiency_factors, capacity_factors
+):
+    """
+    Steady-state annual demand of every plant in every scenario.
+
+    Args:
+        installed_capacities_mw (array-like): Installed capacity per plant.
+        efficiency_factors (array-like): Efficiency per plant.
+        capacity_factors (array-like): Capacity factor (fraction) per scenario.
+
+    Returns:
+        tuple: (PJ, MTPA) arrays of shape (scenarios, plants).
+    """
+    installed_capacities_mw = np.asarray(installed_capacities_mw, dtype=float)
+    capacity_factors = np.asarray(capacity_factors, dtype=float)[:, None]
+    pj = electricity_demand_pj(installed_capacities_mw, capacity_factors)
+    mtpa = feedstock_demand_mtpa(
+        installed_capacities_mw,
+        capacity_factors,
+        np.asarray(efficiency_factors, dtype=float),
+    )
+
+    return pj, mtpa
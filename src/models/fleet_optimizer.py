@@ -0,0 +1,261 @@
+"""
+Capacity-mix optimisation of a fleet of LNG-to-power units.
+
+Every plant of the plant data is a unit type. A mix builds a number of units
+(0 to max_units) of every type, all units of a type run at one load factor
+of a grid, and the mix has to generate a target of electricity a year. Among
+the mixes meeting the target and the emission cap, the cheapest is the one
+with the least total discounted cost.
+
+The discounted costs of a unit are linear in the number of units built, so
+the cost items of every (type, load factor) are evaluated once with the
+batch evaluator of roll_cost_items / discount_cash_flows; a mix is then
+scored by a sum of one precomputed value per type, vectorized over chunks of
+mixes enumerated in mixed radix, i.e. millions of mixes a second.
+
+Load factors are in percent, as the scenario capacity factors. The costs,
+electricity output and emissions of a unit are all evaluated at the load
+factor as a fraction (load factor / 100), so the variable costs are those of
+the energy the unit delivers towards the target.
+"""
+
+import numpy as np
+
+from src.models.batch_lcoe_model import (
+    BATCH_PARAMETERS,
+    evaluate_cost_items_batch,
+)
+from src.utils.constants import HOURS_IN_YEAR, MWH_TO_PJ
+
+DEFAULT_MAX_UNITS = 3
+DEFAULT_LOAD_FACTORS = (10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0)
+# mixes scored at once, and the largest search space enumerated
+MIX_CHUNK_SIZE = 2**20
+MAX_MIXES = 10**9
+
+
+def unit_options(plants, load_factors=DEFAULT_LOAD_FACTORS, escalations=None):
+    """
+    Discounted cost, annual electricity output and emissions of one unit of
+    every plant at every load factor.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        load_factors (sequence): Load factors (%).
+        escalations (dict, optional): Escalation keyed by cost item name.
+
+    Returns:
+        dict: (plants x load factors) arrays keyed "Discounted cost" (R),
+        "PJ" and "MtCO2e", with the plant names and load factors.
+    """
+    plant_names = list(plants)
+    load_factors = np.asarray(load_factors, dtype=float)
+    if len(plant_names) == 0 or load_factors.ndim != 1 or len(load_factors) == 0:
+        raise ValueError("Plants and load factors need to be non-empty.")
+
+    # plant-major rows: one per (plant, load factor)
+    params = {
+        parameter: np.repeat(
+            [plants[plant][parameter] for plant in plant_names], len(load_factors)
+        )
+        for parameter in BATCH_PARAMETERS
+        if parameter != "capacity_factor"
+    }
+    params["capacity_factor"] = np.tile(load_factors / 100.0, len(plant_names))
+    cost_items = evaluate_cost_items_batch(params, escalations=escalations)
+    cost_items.pop("Revenue")
+    shape = (len(plant_names), len(load_factors))
+
+    pj = (
+        HOURS_IN_YEAR
+        * params["installed_capacity_mw"]
+        * params["capacity_factor"]
+        * MWH_TO_PJ
+    )
+
+    return {
+        "plant_names": plant_names,
+        "load_factors": load_factors,
+        "Discounted cost": sum(cost_items.values()).reshape(shape),
+        "PJ": pj.reshape(shape),
+        "MtCO2e": (pj * params["emission_factor_mtco2e_per_pj"]).reshape(shape),
+    }
+
+
+def _type_options(options, max_units):
+    """
+    Choices of every unit type: no unit, or 1 to max_units units at one of
+    the load factors. Returns the per-type (units, load factor index) of
+    every choice and the per-type cost, PJ and MtCO2e of every choice.
+    """
+    num_load_factors = len(options["load_factors"])
+    choices, values = [], []
+    for index, units in enumerate(max_units):
+        counts = np.repeat(np.arange(1, units + 1), num_load_factors)
+        load_factor_index = np.tile(np.arange(num_load_factors), units)
+        choices.append(
+            (
+                np.concatenate([[0], counts]),
+                np.concatenate([[-1], load_factor_index]),
+            )
+        )
+        values.append(
+            {
+                quantity: np.concatenate(
+                    [[0.0], counts * options[quantity][index, load_factor_index]]
+                )
+                for quantity in ("Discounted cost", "PJ", "MtCO2e")
+            }
+        )
+
+    return choices, values
+
+
+def score_mixes(values, choice_index):
+    """
+    Total discounted cost, output and emissions of mixes.
+
+    Args:
+        values (list): Per type, arrays of cost, PJ and MtCO2e per choice.
+        choice_index (tuple): Per type, the choice index of every mix.
+
+    Returns:
+        dict: Arrays keyed "Discounted cost", "PJ" and "MtCO2e", per mix.
+    """
+    return {
+        quantity: sum(
+            type_values[quantity][index]
+            for type_values, index in zip(values, choice_index)
+        )
+        for quantity in ("Discounted cost", "PJ", "MtCO2e")
+    }
+
+
+def _pareto_front(cost, emissions):
+    """Indices of the mixes no other mix beats on both cost and emissions."""
+    order = np.lexsort((emissions, cost))
+    sorted_emissions = emissions[order]
+    lowest_before = np.minimum.accumulate(
+        np.concatenate([[np.inf], sorted_emissions[:-1]])
+    )
+
+    return order[sorted_emissions < lowest_before]
+
+
+def optimize_fleet_mix(
+    plants,
+    demand_pj,
+    emission_cap_mtco2e=None,
+    max_units=DEFAULT_MAX_UNITS,
+    load_factors=DEFAULT_LOAD_FACTORS,
+    escalations=None,
+):
+    """
+    The least-cost mix of units generating at least demand_pj a year within
+    the emission cap, by exhaustive search over all mixes.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name, the unit types.
+        demand_pj (float): Electricity to generate (PJ/year).
+        emission_cap_mtco2e (float, optional): Cap on the emissions of the
+        mix (MtCO2e/year).
+        max_units (int or dict): Most units of every type, or per plant name.
+        load_factors (sequence): Load factors (%) a type can run at.
+        escalations (dict, optional): Escalation keyed by cost item name.
+
+    Returns:
+        dict: "best", the cheapest feasible mix or None if no mix is
+        feasible; "pareto_front", the mixes meeting the demand that no other
+        such mix beats on both cost and emissions, ordered by cost; and
+        "mixes_evaluated". A mix is a dict of its "units", (number of units,
+        load factor) keyed by plant name, and its "Discounted cost" (R), "PJ"
+        and "MtCO2e".
+    """
+    if demand_pj < 0:
+        raise ValueError("Demand needs to be non-negative.")
+    options = unit_options(plants, load_factors, escalations)
+    plant_names = options["plant_names"]
+    if isinstance(max_units, dict):
+        max_units = [max_units.get(plant, 0) for plant in plant_names]
+    else:
+        max_units = [max_units] * len(plant_names)
+    if min(max_units) < 0:
+        raise ValueError("Number of units needs to be non-negative.")
+
+    choices, values = _type_options(options, max_units)
+    shape = tuple(len(type_choices[0]) for type_choices in choices)
+    num_mixes = int(np.prod(shape, dtype=float))
+    if num_mixes > MAX_MIXES:
+        raise ValueError(
+            f"{num_mixes:.3g} mixes are too many to search: lower max_units or "
+            "use fewer load factors."
+        )
+
+    best, front = None, None
+    for start in range(0, num_mixes, MIX_CHUNK_SIZE):
+        mix_index = np.arange(start, min(start + MIX_CHUNK_SIZE, num_mixes))
+        choice_index = np.unravel_index(mix_index, shape)
+        scores = score_mixes(values, choice_index)
+        meets_demand = scores["PJ"] >= demand_pj * (1 - 1e-12)
+
+        feasible = meets_demand
+        if emission_cap_mtco2e is not None:
+            feasible = feasible & (scores["MtCO2e"] <= emission_cap_mtco2e)
+        if feasible.any():
+            cheapest = np.flatnonzero(feasible)[
+                np.argmin(scores["Discounted cost"][feasible])
+            ]
+            if (
+                best is None
+                or scores["Discounted cost"][cheapest] < best["Discounted cost"]
+            ):
+                best = _mix_scores(scores, mix_index, cheapest)
+
+        # the front of this chunk, merged with the front so far
+        candidates = np.flatnonzero(meets_demand)
+        candidates = candidates[
+            _pareto_front(
+                scores["Discounted cost"][candidates], scores["MtCO2e"][candidates]
+            )
+        ]
+        chunk_front = [_mix_scores(scores, mix_index, i) for i in candidates]
+        front = chunk_front if front is None else front + chunk_front
+        if front:
+            keep = _pareto_front(
+                np.array([mix["Discounted cost"] for mix in front]),
+                np.array([mix["MtCO2e"] for mix in front]),
+            )
+            front = [front[i] for i in keep]
+
+    def describe(mix):
+        choice_index = np.unravel_index(mix["index"], shape)
+        units = {}
+        for plant, (counts, load_factor_index), index in zip(
+            plant_names, choices, choice_index
+        ):
+            if counts[index] > 0:
+                units[plant] = (
+                    int(counts[index]),
+                    float(options["load_factors"][load_factor_index[index]]),
+                )
+        return {
+            "units": units,
+            "Discounted cost": mix["Discounted cost"],
+            "PJ": mix["PJ"],
+            "MtCO2e": mix["MtCO2e"],
+        }
+
+    return {
+        "best": None if best is None else describe(best),
+        "pareto_front": [describe(mix) for mix in front or []],
+        "mixes_evaluated": num_mixes,
+    }
+
+
+def _mix_scores(scores, mix_index, i):
+    return {
+        "index": int(mix_index[i]),
+        "Discounted cost": float(scores["Discounted cost"][i]),
+        "PJ": float(scores["PJ"][i]),
+        "MtCO2e": float(scores["MtCO2e"][i]),
+    }
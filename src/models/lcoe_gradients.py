@@ -0,0 +1,309 @@
+import numpy as np
+
+from src.models.plant_parameters import PLANT_PARAMETERS
+from src.utils.constants import (
+    HOURS_IN_YEAR,
+    MILLION,
+    MWH_TO_PJ,
+    PJ_TO_MTPA,
+    PRESENT_YEAR,
+    THOUSAND,
+)
+
+# every plant parameter of the schema, plus the scenario capacity factor, is
+# differentiated.
+GRADIENT_PARAMETERS = list(PLANT_PARAMETERS) + ["capacity_factor"]
+
+# discount rates closer to zero than this are evaluated at +/- this value,
+# where the annuity factor closed form is still numerically stable.
+MIN_DISCOUNT_RATE = 1e-6
+
+
+class Dual:
+    """
+    Forward-mode dual number: a value and its derivatives (tangent) with
+    respect to a set of parameters. The tangent has one leading axis per
+    parameter and otherwise broadcasts against the value.
+    """
+
+    # make numpy defer to Dual in mixed ndarray/Dual arithmetic
+    __array_priority__ = 1000
+
+    def __init__(self, value, tangent):
+        self.value = value
+        self.tangent = tangent
+
+    def __add__(self, other):
+        value, tangent = _parts(other)
+        return Dual(self.value + value, self.tangent + tangent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        value, tangent = _parts(other)
+        return Dual(self.value - value, self.tangent - tangent)
+
+    def __rsub__(self, other):
+        value, tangent = _parts(other)
+        return Dual(value - self.value, tangent - self.tangent)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.tangent)
+
+    def __mul__(self, other):
+        value, tangent = _parts(other)
+        return Dual(self.value * value, self.tangent * value + self.value * tangent)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        value, tangent = _parts(other)
+        return Dual(
+            self.value / value,
+            (self.tangent * value - self.value * tangent) / value**2,
+        )
+
+    def __rtruediv__(self, other):
+        value, tangent = _parts(other)
+        return Dual(
+            value / self.value,
+            (tangent * self.value - value * self.tangent) / self.value**2,
+        )
+
+
+def _parts(x):
+    if isinstance(x, Dual):
+        return x.value, x.tangent
+    return x, 0.0
+
+
+def _dual_sum(x, axis):
+    return Dual(np.sum(x.value, axis=axis), np.sum(x.tangent, axis=axis))
+
+
+def dual_exp(x):
+    value = np.exp(x.value)
+    return Dual(value, x.tangent * value)
+
+
+def dual_log(x):
+    return Dual(np.log(x.value), x.tangent / x.value)
+
+
+def dual_annuity_factor(start_offset, num_years, discount_rate):
+    """
+    Sum of the discount factors of num_years consecutive years, the first one
+    start_offset years after the present year, as a continuous function of
+    all three arguments (compiled_lcoe_model.annuity_factor on dual numbers):
+
+        (1 + r) ** -a * (1 - (1 + r) ** -n) / (1 - (1 + r) ** -1)
+
+    Args:
+        start_offset (Dual): Years from the present year to the first year.
+        num_years (Dual): Number of years.
+        discount_rate (Dual): Discount rate.
+
+    Returns:
+        Dual: Annuity factor.
+    """
+    log_growth = dual_log(1 + discount_rate)
+    return (
+        dual_exp(-start_offset * log_growth)
+        * (1 - dual_exp(-num_years * log_growth))
+        / (1 - dual_exp(-log_growth))
+    )
+
+
+def dual_escalated_annuity_factor(
+    start_offset, num_years, discount_rate, escalation=None
+):
+    """
+    dual_annuity_factor weighted by the escalation multipliers of the years,
+    i.e. compiled_lcoe_model.escalated_annuity_factor on dual numbers.
+
+    The annuity factor is scaled by the ratio of the escalated to the
+    unescalated sum of the discount factors over the integer years of the
+    window. Both sums are exact functions of the discount rate, so the value
+    and its discount rate derivative are exact; the duration derivatives keep
+    the average multiplier of the window fixed.
+
+    Args:
+        See dual_annuity_factor.
+        escalation (optional): ConstantEscalation, StepEscalation or
+        VectorEscalation.
+
+    Returns:
+        Dual: Escalated annuity factor.
+    """
+    annuity = dual_annuity_factor(start_offset, num_years, discount_rate)
+    if escalation is None:
+        return annuity
+
+    # the integer years of the window, as in roll_cost_items
+    start = np.rint(_parts(start_offset)[0])
+    end = start + np.rint(_parts(num_years)[0])
+    offsets = np.arange(int(np.max(end)))
+    in_window = (offsets >= start[..., None]) & (offsets < end[..., None])
+
+    log_growth = dual_log(1 + discount_rate)
+    discount = dual_exp(
+        Dual(log_growth.value[..., None], log_growth.tangent[..., None])
+        * -offsets.astype(float)
+    )
+    unescalated = _dual_sum(discount * in_window, axis=-1)
+    escalated = _dual_sum(
+        discount * (in_window * escalation.multipliers(PRESENT_YEAR + offsets)),
+        axis=-1,
+    )
+
+    return annuity * escalated / unescalated
+
+
+def lcoe_closed_form(p, escalations=None):
+    """
+    LCOE (R/kWh) of calculate_lcoe on the cost items of roll_cost_items, in
+    closed form. Every annual cash flow of a plant is constant over its period,
+    so its net present value is the annual value times an annuity factor.
+
+    Args:
+        p (dict): Dual numbers keyed by GRADIENT_PARAMETERS.
+        escalations (dict, optional): Escalation keyed by cost item name (see
+        roll_cost_items), applied through dual_escalated_annuity_factor.
+
+    Returns:
+        Dual: LCOE, unrounded.
+    """
+    construction_duration = p["construction_duration_years"]
+    operational_lifetime = p["operational_lifetime_years"]
+    exchange_rate = p["exchange_rate"]
+
+    escalations = escalations or {}
+
+    windows = {
+        "construction": (0.0, construction_duration),
+        "operation": (construction_duration, operational_lifetime),
+        "decommissioning": (
+            construction_duration + operational_lifetime,
+            p["decommissioning_duration_years"],
+        ),
+    }
+
+    def annuity(window, item=None):
+        start_offset, num_years = windows[window]
+        return dual_escalated_annuity_factor(
+            start_offset, num_years, p["discount_rate"], escalations.get(item)
+        )
+
+    overnight_capex = (
+        p["installed_capacity_mw"]
+        * THOUSAND
+        * p["overnight_capex_per_kw"]
+        * (1 + p["capex_contingency_factor"])
+        * exchange_rate
+    )  # R
+    capex_per_year = overnight_capex / construction_duration
+    output_mwh = HOURS_IN_YEAR * p["installed_capacity_mw"] * p["capacity_factor"]
+    lng_tonnes = output_mwh / p["efficiency_rate"] * MWH_TO_PJ * PJ_TO_MTPA * MILLION
+    tco2e = output_mwh * MWH_TO_PJ * p["emission_factor_mtco2e_per_pj"] * MILLION
+
+    discounted_costs = (
+        capex_per_year * annuity("construction", "CAPEX")
+        + capex_per_year * p["foam_cost_factor"] * annuity("operation", "FO&M")
+        + p["voam_cost_per_mwh"]
+        * output_mwh
+        * exchange_rate
+        * annuity("operation", "VO&M")
+        + p["fuel_cost_per_tLNG"]
+        * lng_tonnes
+        * exchange_rate
+        * annuity("operation", "Fuel")
+        + p["carbon_cost_per_tCO2e"]
+        * tco2e
+        * exchange_rate
+        * annuity("operation", "Carbon")
+        + p["decommissioning_cost_factor"]
+        * overnight_capex
+        / p["decommissioning_duration_years"]
+        * annuity("decommissioning", "Decommissioning")
+    )
+    discounted_revenue = output_mwh * annuity("operation")
+
+    return discounted_costs / discounted_revenue * exchange_rate / THOUSAND
+
+
+def lcoe_gradients(plants, scenarios, escalations=None):
+    """
+    LCOE and its exact derivatives with respect to every plant parameter and
+    the capacity factor, for all plants and scenarios in one pass.
+
+    Integer parameters (durations and lifetime) are differentiated as
+    continuous quantities of the annuity factors. Discount rates within
+    MIN_DISCOUNT_RATE of zero are evaluated at +/- MIN_DISCOUNT_RATE.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        scenarios (dict): Capacity factor keyed by scenario name.
+        escalations (dict, optional): Escalation keyed by cost item name (see
+        lcoe_closed_form).
+
+    Returns:
+        tuple: (lcoe, gradients, values), arrays of shape (scenarios, plants)
+        in the order of the dicts: the unrounded LCOE (R/kWh), and the
+        derivatives and parameter values keyed by GRADIENT_PARAMETERS.
+    """
+    plant_names = list(plants.keys())
+    num_parameters = len(GRADIENT_PARAMETERS)
+
+    # plant parameters vary along the last axis, scenarios along the first
+    values = {
+        parameter: np.asarray(
+            [[float(plants[plant][parameter]) for plant in plant_names]]
+        )
+        for parameter in PLANT_PARAMETERS
+    }
+    discount_rate = values["discount_rate"]
+    values["discount_rate"] = np.where(
+        np.abs(discount_rate) < MIN_DISCOUNT_RATE,
+        np.where(discount_rate < 0, -MIN_DISCOUNT_RATE, MIN_DISCOUNT_RATE),
+        discount_rate,
+    )
+    values["capacity_factor"] = np.asarray(
+        [float(capacity_factor) for capacity_factor in scenarios.values()]
+    )[:, None]
+
+    # seed every parameter with a unit tangent along its own axis
+    duals = {}
+    for index, parameter in enumerate(GRADIENT_PARAMETERS):
+        tangent = np.zeros((num_parameters,) + values[parameter].shape)
+        tangent[index] = 1.0
+        duals[parameter] = Dual(values[parameter], tangent)
+
+    lcoe = lcoe_closed_form(duals, escalations)
+    shape = (len(scenarios), len(plant_names))
+    gradients = {
+        parameter: np.broadcast_to(lcoe.tangent[index], shape)
+        for index, parameter in enumerate(GRADIENT_PARAMETERS)
+    }
+    values["discount_rate"] = discount_rate
+    values = {
+        parameter: np.broadcast_to(value, shape) for parameter, value in values.items()
+    }
+
+    return np.broadcast_to(lcoe.value, shape), gradients, values
+
+
+def lcoe_elasticities(lcoe, gradients, values):
+    """
+    Elasticities of LCOE: the relative change of LCOE per relative change of
+    a parameter, d(LCOE)/d(p) * p / LCOE, at the current operating point.
+
+    Args:
+        lcoe, gradients, values: Result of lcoe_gradients.
+
+    Returns:
+        dict: Elasticity arrays keyed by parameter.
+    """
+    return {
+        parameter: gradient * values[parameter] / lcoe
+        for parameter, gradient in gradients.items()
+    }
@@ -1,3 +1,6 @@
+import numpy as np
+
+from src.models.escalation import escalate_expense
 from src.models.lng_demand_model import (
     electricity_demand_pj_mtco2e,
     electricity_output_mwh,
@@ -10,8 +13,8 @@ class LCOEData:
     """Holds all data required to calculate net present value (NPV)"""
 
     def __init__(self, years, values, discount_rate=None):
-        self.years = years
-        self.values = values
+        self.years = np.asarray(years)
+        self.values = np.asarray(values, dtype=float)
         self.discount_rate = discount_rate
 
     def net_present_value(self, present_year, external_discount_rate=None):
@@ -38,10 +41,10 @@ class LCOEData:
                 "Discount rate needs to be specified, "
                 "either as a member object or as an argument to this method."
             )
-        npv = 0.0
-        for year, value in zip(self.years, self.values):
-            periods_into_future = year - present_year
-            npv += value / (1 + discount_rate) ** periods_into_future
+        # vectorized over the years, so a time-varying profile costs the same
+        # as a constant one.
+        periods_into_future = self.years - present_year
+        npv = float(np.sum(self.values / (1 + discount_rate) ** periods_into_future))
         return npv
 
 
@@ -51,15 +54,26 @@ def create_cash_flow(expense_tuple, discount_rate=None):
 
     Args:
         expense_tuple (tuple): Tuple containing (start_year, end_year, expense_value).
+        The expense_value is either a constant value per year or a sequence
+        with one value per year from start_year to end_year.
         discount_rate (float, optional): Discount rate for the cas flow.
 
     Returns:
         LCOEData object.
     """
     start_year, end_year, expense_value = expense_tuple
-    years = list(range(start_year, end_year + 1))
+    years = np.arange(start_year, end_year + 1)
+
+    values = np.asarray(expense_value, dtype=float)
+    if values.ndim == 0:
+        values = np.full(len(years), values)
+    elif values.shape != years.shape:
+        raise ValueError(
+            f"Expected {len(years)} yearly values from {start_year} "
+            f"to {end_year}, got {len(values)}."
+        )
 
-    return LCOEData(years, [expense_value for y in years], discount_rate)
+    return LCOEData(years, values, discount_rate)
 
 
 def create_cost_item(cost_item_name, expense_tuple, discount_rate=None):
@@ -155,6 +169,35 @@ def discount_cash_flows(cost_items, default_discount_rate, present_year):
     return discounted_cash_flows
 
 
+def calculate_unrounded_lcoe(
+    revenue_data, cost_items, default_discount_rate, exchange_rate, present_year
+):
+    """
+    Levelised Cost of Energy (LCOE) of calculate_lcoe, before its rounding.
+
+    Args:
+        See calculate_lcoe.
+
+    Returns:
+        float: LCOE in R/kWh.
+    """
+    revenue_discount_rate = revenue_data.discount_rate or default_discount_rate
+    total_discounted_revenue = revenue_data.net_present_value(
+        present_year, revenue_discount_rate
+    )
+
+    discounted_expenses = discount_cash_flows(
+        cost_items, default_discount_rate, present_year
+    )
+    total_discounted_expenses = 0.0
+    for _, discounted_expense in discounted_expenses.items():
+        total_discounted_expenses += discounted_expense
+
+    return (
+        (total_discounted_expenses / total_discounted_revenue) * exchange_rate
+    ) / THOUSAND  # R/kWh
+
+
 def calculate_lcoe(
     revenue_data, cost_items, default_discount_rate, exchange_rate, present_year
 ):
@@ -178,21 +221,10 @@ def calculate_lcoe(
 
 
     """
-    revenue_discount_rate = revenue_data.discount_rate or default_discount_rate
-    total_discounted_revenue = revenue_data.net_present_value(
-        present_year, revenue_discount_rate
-    )
-
-    discounted_expenses = discount_cash_flows(
-        cost_items, default_discount_rate, present_year
-    )
-    total_discounted_expenses = 0.0
-    for _, discounted_expense in discounted_expenses.items():
-        total_discounted_expenses += discounted_expense
-
     lcoe = round(
-        ((total_discounted_expenses / total_discounted_revenue) * exchange_rate)
-        / THOUSAND,
+        calculate_unrounded_lcoe(
+            revenue_data, cost_items, default_discount_rate, exchange_rate, present_year
+        ),
         2,
     )  # R/kWh
 
@@ -393,7 +425,22 @@ def roll_cost_items(
     emission_factor,
     efficiency_factor,
     exchange_rate,
+    escalations=None,
 ):
+    """
+    Roll the cost items of a power plant into (start_year, end_year,
+    expense_value) tuples.
+
+    Args:
+        escalations (dict, optional): Escalation (ConstantEscalation,
+        StepEscalation or VectorEscalation) keyed by cost item name, e.g.
+        LNG price escalation for "Fuel" or a carbon price trajectory for
+        "Carbon". The expense_value of an escalated cost item becomes an
+        array with one value per year.
+
+    Returns:
+        dict: Cost item tuples keyed by cost item name.
+    """
     # construction period
     construction_start = PRESENT_YEAR
     construction_end = end_of_construction_period(construction_duration)
@@ -484,4 +531,13 @@ def roll_cost_items(
         ),
     }
 
+    if escalations is not None:
+        for cost_item_name, escalation in escalations.items():
+            start_year, end_year, expense_value = cost_items_rolled[cost_item_name]
+            cost_items_rolled[cost_item_name] = (
+                start_year,
+                end_year,
+                escalate_expense(expense_value, start_year, end_year, escalation),
+            )
+
     return cost_items_rolled
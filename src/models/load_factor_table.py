@@ -0,0 +1,214 @@
+"""
+Precomputed load factor tables of the dashboard results.
+
+The scenario sliders of the dashboard only change load factors, so the
+discounted cost items, discounted output, LCOE, PJ and MTPA of every plant
+are tabulated once over the admissible slider range and looked up by linear
+interpolation while a slider moves. A table is rebuilt only when the plants
+or the escalations change.
+
+Interpolation error: the discounted cost items, the discounted output and
+the demands are linear in the load factor (CAPEX, FO&M and decommissioning
+constant, VO&M, fuel, carbon, output and demand proportional to it), so
+their linear interpolation is exact up to rounding, and so is LCOE, which is
+computed from the interpolated cost items and output. Every table is checked
+at the midpoints of its grid against the batch evaluator when it is built,
+and rejected if its relative error exceeds INTERPOLATION_ERROR_BOUND.
+"""
+
+import json
+import threading
+
+import numpy as np
+
+from src.models.batch_lcoe_model import (
+    BATCH_PARAMETERS,
+    evaluate_cost_items_batch,
+)
+from src.models.escalation import escalations_key
+from src.utils.constants import (
+    HOURS_IN_YEAR,
+    MWH_TO_PJ,
+    PJ_TO_MTPA,
+    THOUSAND,
+)
+
+# admissible range of the scenario sliders (%)
+TABLE_LOAD_FACTORS = np.linspace(1.0, 100.0, 100)
+INTERPOLATION_ERROR_BOUND = 1e-9
+MAX_CACHED_TABLES = 16
+COST_ITEMS = ["CAPEX", "FO&M", "VO&M", "Fuel", "Carbon", "Decommissioning"]
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+class LoadFactorTable:
+    """
+    Tabulated results of a set of plants over a grid of load factors (%), as
+    passed to roll_cost_items.
+    """
+
+    def __init__(self, plant_names, load_factors, values, exchange_rate):
+        self.plant_names = plant_names
+        self.load_factors = load_factors
+        # (plants x load factors) arrays keyed by cost item, "Revenue", "PJ"
+        # and "MTPA"
+        self.values = values
+        self.exchange_rate = exchange_rate
+        self.max_relative_error = None
+
+    def lookup(self, load_factor):
+        """
+        Interpolated values of every plant at a load factor.
+
+        Returns:
+            dict: Arrays of one value per plant keyed as the table values.
+        """
+        low, high = self.load_factors[0], self.load_factors[-1]
+        if not low <= load_factor <= high:
+            raise ValueError(
+                f"Load factor {load_factor} is outside of the table, "
+                f"from {low} to {high}."
+            )
+        index = min(
+            int(np.searchsorted(self.load_factors, load_factor, side="right")) - 1,
+            len(self.load_factors) - 2,
+        )
+        weight = (load_factor - self.load_factors[index]) / (
+            self.load_factors[index + 1] - self.load_factors[index]
+        )
+
+        return {
+            name: (1 - weight) * values[:, index] + weight * values[:, index + 1]
+            for name, values in self.values.items()
+        }
+
+    def discounted_cost_items(self, load_factor):
+        """Discounted cost items (R), as compute_discount_cash_flows."""
+        values = self.lookup(load_factor)
+        return {
+            plant: {item: float(values[item][index]) for item in COST_ITEMS}
+            for index, plant in enumerate(self.plant_names)
+        }
+
+    def lcoe(self, load_factor, decimals=2):
+        """LCOE (R/kWh) of every plant, as calculate_lcoe."""
+        values = self.lookup(load_factor)
+        lcoe = (
+            sum(values[item] for item in COST_ITEMS)
+            / values["Revenue"]
+            * self.exchange_rate
+            / THOUSAND
+        )
+        return lcoe if decimals is None else np.round(lcoe, decimals)
+
+    def demand(self, load_factor):
+        """Electricity (PJ) and LNG (MTPA) demand of every plant a year."""
+        values = self.lookup(load_factor)
+        return values["PJ"], values["MTPA"]
+
+
+def _evaluate(plants, load_factors, escalations):
+    """(plants x load factors) values of the table at the load factors."""
+    plant_names = list(plants)
+    shape = (len(plant_names), len(load_factors))
+    params = {
+        parameter: np.repeat(
+            [plants[plant][parameter] for plant in plant_names], len(load_factors)
+        )
+        for parameter in BATCH_PARAMETERS
+        if parameter != "capacity_factor"
+    }
+    params["capacity_factor"] = np.tile(load_factors, len(plant_names))
+    values = {
+        item: values.reshape(shape)
+        for item, values in evaluate_cost_items_batch(
+            params, escalations=escalations
+        ).items()
+    }
+
+    # demand takes the load factor as a fraction, as the demand projections
+    pj = (
+        HOURS_IN_YEAR
+        * params["installed_capacity_mw"]
+        * params["capacity_factor"]
+        / 100.0
+        * MWH_TO_PJ
+    )
+    values["PJ"] = pj.reshape(shape)
+    values["MTPA"] = (pj / params["efficiency_rate"] * PJ_TO_MTPA).reshape(shape)
+
+    return values
+
+
+def build_load_factor_table(plants, escalations=None, load_factors=None):
+    """
+    Tabulate the results of the plants over a grid of load factors.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        escalations (dict, optional): Escalation keyed by cost item name.
+        load_factors (array-like, optional): Increasing grid of load factors
+        (%), TABLE_LOAD_FACTORS by default.
+
+    Returns:
+        LoadFactorTable: The table, with its max_relative_error measured at
+        the midpoints of the grid.
+    """
+    load_factors = np.asarray(
+        TABLE_LOAD_FACTORS if load_factors is None else load_factors, dtype=float
+    )
+    if len(load_factors) < 2 or np.any(np.diff(load_factors) <= 0):
+        raise ValueError("Load factors need to be an increasing grid of 2 or more.")
+
+    table = LoadFactorTable(
+        list(plants),
+        load_factors,
+        _evaluate(plants, load_factors, escalations),
+        np.array([plants[plant]["exchange_rate"] for plant in plants], dtype=float),
+    )
+
+    midpoints = (load_factors[:-1] + load_factors[1:]) / 2
+    exact = _evaluate(plants, midpoints, escalations)
+    error = 0.0
+    for index, midpoint in enumerate(midpoints):
+        interpolated = table.lookup(midpoint)
+        for name, values in exact.items():
+            scale = np.maximum(np.abs(values[:, index]), np.finfo(float).tiny)
+            error = max(
+                error,
+                float(np.max(np.abs(interpolated[name] - values[:, index]) / scale)),
+            )
+    if error > INTERPOLATION_ERROR_BOUND:
+        raise ValueError(
+            f"Interpolation error {error:.3g} exceeds "
+            f"{INTERPOLATION_ERROR_BOUND:.3g}."
+        )
+    table.max_relative_error = error
+
+    return table
+
+
+def get_load_factor_table(plants, escalations=None):
+    """
+    The load factor table of the plants, built once per set of plant
+    parameters and escalations and shared by all sessions of the process.
+    Escalations are matched by their schedules, so sessions that loaded the
+    same escalation data share a table.
+    """
+    key = json.dumps([plants, escalations_key(escalations)], sort_keys=True)
+    with _tables_lock:
+        cached = _tables.get(key)
+    if cached is not None:
+        return cached
+
+    table = build_load_factor_table(plants, escalations)
+    with _tables_lock:
+        _tables.pop(key, None)
+        _tables[key] = table
+        # keep the most recently built tables only
+        while len(_tables) > MAX_CACHED_TABLES:
+            del _tables[next(iter(_tables))]
+
+    return table
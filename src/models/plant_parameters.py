@@ -0,0 +1,240 @@
+"""
+Typed plant parameters, validated column by column.
+
+PLANT_PARAMETERS is the schema of the plant data: the type of every
+parameter and the range the models are defined on, e.g. a construction
+duration of at least a year (overnight_capex divides by it) and an
+efficiency rate in (0, 1] (electricity_input_mwh divides by it). A
+PlantBatch holds the parameters of many plants as one typed array per
+parameter and checks every column in one vectorized pass, so bad data is
+reported with the plant and parameter at load time instead of surfacing as
+a ZeroDivisionError in the models. A PlantRecord holds the parameters of a
+single plant as typed slots.
+
+Plants still travel through the app as dicts keyed by plant name (the
+session state and the scenario store are JSON-like); PlantBatch.to_plants
+gives them already cast, so the models need no casting of their own.
+"""
+
+import numpy as np
+
+# parameter: (type, lowest value, whether the lowest value is excluded,
+# highest value), in the column order of data/plant_parameters.csv
+PLANT_PARAMETERS = {
+    "installed_capacity_mw": (float, 0.0, True, np.inf),
+    "construction_duration_years": (int, 1, False, np.inf),
+    "overnight_capex_per_kw": (float, 0.0, False, np.inf),
+    "operational_lifetime_years": (int, 1, False, np.inf),
+    "foam_cost_factor": (float, 0.0, False, np.inf),
+    "voam_cost_per_mwh": (float, 0.0, False, np.inf),
+    "fuel_cost_per_tLNG": (float, 0.0, False, np.inf),
+    "carbon_cost_per_tCO2e": (float, 0.0, False, np.inf),
+    "decommissioning_duration_years": (int, 1, False, np.inf),
+    "capex_contingency_factor": (float, -1.0, True, np.inf),
+    "decommissioning_cost_factor": (float, 0.0, False, np.inf),
+    "efficiency_rate": (float, 0.0, True, 1.0),
+    "emission_factor_mtco2e_per_pj": (float, 0.0, False, np.inf),
+    "discount_rate": (float, -1.0, True, np.inf),
+    "exchange_rate": (float, 0.0, True, np.inf),
+}
+
+
+def _parameter_range(parameter):
+    _, low, low_excluded, high = PLANT_PARAMETERS[parameter]
+    text = f"above {low:g}" if low_excluded else f"at least {low:g}"
+    if np.isfinite(high):
+        text += f" and at most {high:g}"
+
+    return text
+
+
+def validate_plant_columns(plant_names, columns):
+    """
+    Cast and check the columns of plant parameters.
+
+    Args:
+        plant_names (list): Plant names, one per row.
+        columns (dict): Array-likes of one value per plant keyed by
+        PLANT_PARAMETERS; other keys are ignored.
+
+    Returns:
+        dict: A typed array (int or float) per parameter of PLANT_PARAMETERS.
+
+    Raises:
+        ValueError: If a parameter is missing, not numeric, not a whole
+        number where an integer is expected, or out of its range, naming
+        every offending plant and parameter.
+    """
+    missing = [parameter for parameter in PLANT_PARAMETERS if parameter not in columns]
+    if missing:
+        raise ValueError(f"Plant parameters {missing} are missing.")
+
+    checked, errors = {}, []
+    for parameter, (dtype, low, low_excluded, high) in PLANT_PARAMETERS.items():
+        try:
+            values = np.asarray(columns[parameter], dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(f"Plant parameter {parameter} needs to be numeric.")
+        if values.shape != (len(plant_names),):
+            raise ValueError(f"Plant parameter {parameter} needs one value per plant.")
+
+        with np.errstate(invalid="ignore"):
+            invalid = ~np.isfinite(values) | (values > high)
+            invalid |= values <= low if low_excluded else values < low
+            if dtype is int:
+                invalid |= np.mod(values, 1) != 0
+        for index in np.flatnonzero(invalid):
+            errors.append(
+                f"{plant_names[index]}: {parameter} is {values[index]:g}, needs "
+                f"to be {'a whole number ' if dtype is int else ''}"
+                f"{_parameter_range(parameter)}"
+            )
+        checked[parameter] = values
+
+    if errors:
+        raise ValueError("Invalid plant parameters: " + "; ".join(errors) + ".")
+
+    return {
+        parameter: values.astype(PLANT_PARAMETERS[parameter][0])
+        for parameter, values in checked.items()
+    }
+
+
+def plant_columns(plants, parameters):
+    """
+    Arrays of one value per plant of the parameters: the typed columns of a
+    PlantBatch as they are, or those of a dict of plants (keyed by plant
+    name) cast to the types of PLANT_PARAMETERS, without checking.
+    """
+    if isinstance(plants, PlantBatch):
+        return {parameter: plants.columns[parameter] for parameter in parameters}
+
+    return {
+        parameter: np.array(
+            [plants[plant][parameter] for plant in plants],
+            dtype=PLANT_PARAMETERS[parameter][0],
+        )
+        for parameter in parameters
+    }
+
+
+class PlantRecord:
+    """Typed parameters of a single plant."""
+
+    __slots__ = ("name",) + tuple(PLANT_PARAMETERS)
+
+    def __init__(self, name, **parameters):
+        columns = validate_plant_columns(
+            [name],
+            {
+                parameter: [value]
+                for parameter, value in parameters.items()
+                if parameter in PLANT_PARAMETERS
+            },
+        )
+        self.name = name
+        for parameter, values in columns.items():
+            setattr(self, parameter, values.item())
+
+    @classmethod
+    def from_dict(cls, name, parameters):
+        """The record of a plant from its parameters keyed by name."""
+        return cls(name, **parameters)
+
+    def as_dict(self):
+        """Parameters keyed by name, as load_plant_data."""
+        return {parameter: getattr(self, parameter) for parameter in PLANT_PARAMETERS}
+
+
+class PlantBatch:
+    """Typed parameters of many plants, one array per parameter."""
+
+    __slots__ = ("plant_names", "columns")
+
+    def __init__(self, plant_names, columns):
+        plant_names = list(plant_names)
+        if len(set(plant_names)) != len(plant_names):
+            raise ValueError("Plant names need to be unique.")
+        self.plant_names = plant_names
+        self.columns = validate_plant_columns(plant_names, columns)
+
+    def __len__(self):
+        return len(self.plant_names)
+
+    def __iter__(self):
+        # plant names, as iterating a dict of plants
+        return iter(self.plant_names)
+
+    @classmethod
+    def from_plants(cls, plants):
+        """The batch of plant parameters keyed by plant name."""
+        return cls(
+            plants,
+            {
+                parameter: [plants[plant][parameter] for plant in plants]
+                for parameter in PLANT_PARAMETERS
+            },
+        )
+
+    @classmethod
+    def from_records(cls, records, names=None):
+        """
+        The batch of a list of parameter dicts, e.g. the records of the
+        compute service; the records are named by their index by default.
+        """
+        names = list(range(len(records))) if names is None else names
+        try:
+            columns = {
+                parameter: [record[parameter] for record in records]
+                for parameter in PLANT_PARAMETERS
+            }
+        except KeyError as error:
+            raise ValueError(f"Plant parameter {error} is missing.")
+        except TypeError:
+            raise ValueError("Records need to be dicts of plant parameters.")
+
+        return cls(names, columns)
+
+    @classmethod
+    def from_frame(cls, data):
+        """
+        The batch of a data frame laid out as data/plant_parameters.csv: the
+        plant names, then the parameters in the order of PLANT_PARAMETERS.
+        """
+        if data.shape[1] != len(PLANT_PARAMETERS) + 1:
+            raise ValueError(
+                f"Plant data needs {len(PLANT_PARAMETERS) + 1} columns, the "
+                f"plant name and {list(PLANT_PARAMETERS)}."
+            )
+
+        return cls(
+            data.iloc[:, 0].to_list(),
+            {
+                parameter: data.iloc[:, index + 1].to_numpy()
+                for index, parameter in enumerate(PLANT_PARAMETERS)
+            },
+        )
+
+    def records(self):
+        """PlantRecord of every plant."""
+        return [self.record(index) for index in range(len(self))]
+
+    def record(self, index):
+        """PlantRecord of the plant at an index, from the checked columns."""
+        record = PlantRecord.__new__(PlantRecord)
+        record.name = self.plant_names[index]
+        for parameter, values in self.columns.items():
+            setattr(record, parameter, values[index].item())
+
+        return record
+
+    def to_plants(self):
+        """Parameters keyed by plant name, cast to Python int and float."""
+        columns = {
+            parameter: values.tolist() for parameter, values in self.columns.items()
+        }
+
+        return {
+            plant: {parameter: values[index] for parameter, values in columns.items()}
+            for index, plant in enumerate(self.plant_names)
+        }
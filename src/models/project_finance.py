@@ -0,0 +1,393 @@
+"""
+Project-finance cash-flow waterfall of power plants.
+
+The annual cost items of roll_cost_items are laid out as (plants x years)
+arrays, and the waterfall is computed on those arrays for all plants at once,
+looping over the years only where a year depends on the previous one (debt
+balances and tax losses carried forward):
+
+    revenue - operating costs                   = EBITDA
+    EBITDA - tax                                = CFADS
+    CFADS - interest - principal                = cash flow to equity
+    - (CAPEX - debt drawdowns)                  = equity contributions
+
+Debt tranches finance a share of the CAPEX; interest during construction is
+capitalised, and the balance is repaid over the tenor after the start of
+operation and a grace period, as an annuity, in straight-line instalments or
+as a bullet. The CAPEX is depreciated from the start of operation following
+a depreciation profile; tax losses are carried forward. Decommissioning costs
+are operating costs of the decommissioning years.
+
+Revenue is the tariff times the electricity output, converted as
+calculate_lcoe converts LCOE, so that a tariff equal to the unrounded LCOE
+recovers the discounted costs at the plant discount rate: the default.
+"""
+
+import numpy as np
+
+from src.models.lcoe_model import (
+    end_of_decommissioning_period,
+    end_of_operation_period,
+    roll_cost_items,
+    start_of_operation_period,
+)
+from src.models.lng_demand_model import electricity_output_mwh
+from src.utils.constants import PRESENT_YEAR, THOUSAND
+
+REPAYMENT_PROFILES = ("annuity", "straight_line", "bullet")
+OPERATING_COST_ITEMS = ["FO&M", "VO&M", "Fuel", "Carbon", "Decommissioning"]
+DEFAULT_TAX_RATE = 0.27
+DEFAULT_DEPRECIATION_YEARS = 20
+# rates scanned for the sign changes of the net present value
+IRR_RATES = np.linspace(-0.9, 1.0, 191)
+IRR_ITERATIONS = 60
+
+
+class DebtTranche:
+    """A loan financing a share of the CAPEX of every plant."""
+
+    def __init__(
+        self, share, interest_rate, tenor_years, repayment="annuity", grace_years=0
+    ):
+        if repayment not in REPAYMENT_PROFILES:
+            raise ValueError(
+                f"Repayment needs to be one of {REPAYMENT_PROFILES}, "
+                f"got {repayment}."
+            )
+        if not 0 <= share <= 1 or tenor_years < 1 or grace_years < 0:
+            raise ValueError(
+                "Debt share needs to be in [0, 1], the tenor at least a year "
+                "and the grace period non-negative."
+            )
+        self.share = share
+        self.interest_rate = interest_rate
+        self.tenor_years = int(tenor_years)
+        self.repayment = repayment
+        self.grace_years = int(grace_years)
+
+
+DEFAULT_TRANCHES = (DebtTranche(0.7, 0.1, 15),)
+
+
+def cost_item_arrays(plants, capacity_factor, escalations=None):
+    """
+    Annual cost items of roll_cost_items as year-indexed arrays.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        capacity_factor (float): Capacity factor, as in roll_cost_items.
+        escalations (dict, optional): Escalation keyed by cost item name.
+
+    Returns:
+        tuple: The years (PRESENT_YEAR to the last decommissioning year) and
+        a dict of (plants x years) arrays (R) keyed by cost item name.
+    """
+    last_year = max(
+        end_of_decommissioning_period(
+            p["construction_duration_years"],
+            p["operational_lifetime_years"],
+            p["decommissioning_duration_years"],
+        )
+        for p in plants.values()
+    )
+    years = np.arange(PRESENT_YEAR, last_year + 1)
+
+    items = {}
+    for index, p in enumerate(plants.values()):
+        rolled = roll_cost_items(
+            p["installed_capacity_mw"],
+            p["construction_duration_years"],
+            p["operational_lifetime_years"],
+            p["decommissioning_duration_years"],
+            p["overnight_capex_per_kw"],
+            p["capex_contingency_factor"],
+            p["foam_cost_factor"],
+            p["voam_cost_per_mwh"],
+            p["fuel_cost_per_tLNG"],
+            p["carbon_cost_per_tCO2e"],
+            p["decommissioning_cost_factor"],
+            capacity_factor,
+            p["emission_factor_mtco2e_per_pj"],
+            p["efficiency_rate"],
+            p["exchange_rate"],
+            escalations,
+        )
+        for item, (start_year, end_year, value) in rolled.items():
+            values = items.setdefault(item, np.zeros((len(plants), len(years))))
+            values[index, start_year - PRESENT_YEAR : end_year - PRESENT_YEAR + 1] = (
+                value
+            )
+
+    return years, items
+
+
+def depreciation_profile(depreciation):
+    """
+    Fractions of the CAPEX depreciated per year of operation.
+
+    Args:
+        depreciation (int or sequence): Years of straight-line depreciation,
+        or the fraction of every year, e.g. (0.4, 0.2, 0.2, 0.2).
+    """
+    if np.ndim(depreciation) == 0:
+        if int(depreciation) < 1:
+            raise ValueError("Depreciation needs to last at least a year.")
+        return np.full(int(depreciation), 1 / int(depreciation))
+    profile = np.asarray(depreciation, dtype=float)
+    if not np.isclose(profile.sum(), 1):
+        raise ValueError("Depreciation fractions need to sum to 1.")
+
+    return profile
+
+
+def _debt_schedule(tranche, capex, year_index, operation_start_index):
+    """
+    Drawdowns, interest paid, principal repaid and closing balance of a
+    tranche, (plants x years), with interest during construction capitalised.
+    """
+    num_plants, num_years = capex.shape
+    rate = tranche.interest_rate
+    repayment_start = operation_start_index + tranche.grace_years
+    drawdown = tranche.share * capex
+
+    schedule = {
+        line: np.zeros((num_plants, num_years))
+        for line in ("drawdown", "interest", "principal", "balance")
+    }
+    schedule["drawdown"] = drawdown
+    balance = np.zeros(num_plants)
+    instalment = np.zeros(num_plants)
+    for t in year_index:
+        constructing = t < operation_start_index
+        interest = balance * rate
+        # the instalment is set by the balance when repayments start
+        starting = t == repayment_start
+        if tranche.repayment == "annuity":
+            annuity = (
+                1 / tranche.tenor_years
+                if rate == 0
+                else rate / (1 - (1 + rate) ** -tranche.tenor_years)
+            )
+            instalment = np.where(starting, balance * annuity, instalment)
+        elif tranche.repayment == "straight_line":
+            instalment = np.where(starting, balance / tranche.tenor_years, instalment)
+        repaying = (t >= repayment_start) & (t < repayment_start + tranche.tenor_years)
+        if tranche.repayment == "annuity":
+            principal = np.where(repaying, instalment - interest, 0.0)
+        elif tranche.repayment == "straight_line":
+            principal = np.where(repaying, instalment, 0.0)
+        else:
+            principal = np.zeros(num_plants)
+        # the last repayment clears the balance, rounding errors included
+        principal = np.where(
+            t == repayment_start + tranche.tenor_years - 1, balance, principal
+        )
+        principal = np.minimum(principal, balance)
+
+        schedule["interest"][:, t] = np.where(constructing, 0.0, interest)
+        schedule["principal"][:, t] = principal
+        balance = (
+            balance + drawdown[:, t] + np.where(constructing, interest, 0.0) - principal
+        )
+        schedule["balance"][:, t] = balance
+
+    return schedule
+
+
+def _tax(taxable_income, tax_rate):
+    """Tax of every year, with the losses of earlier years carried forward."""
+    tax = np.zeros_like(taxable_income)
+    losses = np.zeros(taxable_income.shape[0])
+    for t in range(taxable_income.shape[1]):
+        income = taxable_income[:, t] - losses
+        tax[:, t] = tax_rate * np.maximum(income, 0.0)
+        losses = np.maximum(-income, 0.0)
+
+    return tax
+
+
+def internal_rate_of_return(cash_flows, years):
+    """
+    IRR of every row of cash flows, for all rows at once: the highest rate of
+    IRR_RATES at which the net present value changes sign, refined by
+    bisection, NaN where it keeps its sign. Decommissioning costs at the end
+    of a project give the net present value a second root at low rates; the
+    highest one is the return of the project.
+
+    Args:
+        cash_flows (np.ndarray): (rows x years) cash flows.
+        years (np.ndarray): Years of the columns.
+    """
+    periods = years - PRESENT_YEAR
+
+    def npv(rate):
+        return np.sum(cash_flows / (1 + rate[..., None]) ** periods, axis=-1)
+
+    rates = np.asarray(IRR_RATES)
+    npv_rates = npv(np.broadcast_to(rates[:, None], (len(rates), len(cash_flows))))
+    sign_changes = np.sign(npv_rates[1:]) != np.sign(npv_rates[:-1])
+    bracketed = sign_changes.any(axis=0)
+    highest = len(rates) - 2 - np.argmax(sign_changes[::-1], axis=0)
+
+    low, high = rates[highest], rates[highest + 1]
+    npv_low = npv(low)
+    for _ in range(IRR_ITERATIONS):
+        middle = (low + high) / 2
+        npv_middle = npv(middle)
+        same_sign = np.sign(npv_middle) == np.sign(npv_low)
+        low = np.where(same_sign, middle, low)
+        npv_low = np.where(same_sign, npv_middle, npv_low)
+        high = np.where(same_sign, high, middle)
+
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+
+def project_finance_waterfall(
+    plants,
+    capacity_factor,
+    tranches=DEFAULT_TRANCHES,
+    tax_rate=DEFAULT_TAX_RATE,
+    depreciation=DEFAULT_DEPRECIATION_YEARS,
+    tariff_r_per_kwh=None,
+    escalations=None,
+):
+    """
+    Annual project-finance waterfall of every plant.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        capacity_factor (float): Capacity factor, as in roll_cost_items.
+        tranches (sequence): DebtTranche objects; their shares of the CAPEX
+        sum to at most 1, the rest is equity.
+        tax_rate (float): Tax rate on the taxable income.
+        depreciation (int or sequence): See depreciation_profile.
+        tariff_r_per_kwh (float or array, optional): Electricity tariff per
+        plant, by default the LCOE at the plant discount rate.
+        escalations (dict, optional): Escalation keyed by cost item name.
+
+    Returns:
+        dict: "years", "plant_names", (plants x years) arrays of the
+        waterfall lines keyed by line name, and per plant "Equity IRR",
+        "Project IRR" (pre-tax, unlevered) and "Minimum DSCR".
+    """
+    if sum(tranche.share for tranche in tranches) > 1:
+        raise ValueError("Debt shares need to sum to at most 1.")
+    plant_names = list(plants)
+    years, items = cost_item_arrays(plants, capacity_factor, escalations)
+    year_index = np.arange(len(years))
+
+    def parameter(name):
+        return np.array([plants[plant][name] for plant in plant_names])
+
+    construction_duration = parameter("construction_duration_years")
+    operation_start_index = (
+        start_of_operation_period(construction_duration) - PRESENT_YEAR
+    )
+    operation_end_index = (
+        end_of_operation_period(
+            construction_duration, parameter("operational_lifetime_years")
+        )
+        - PRESENT_YEAR
+    )
+    operating = (year_index >= operation_start_index[:, None]) & (
+        year_index <= operation_end_index[:, None]
+    )
+
+    # revenue at the tariff, converted as calculate_lcoe converts LCOE
+    exchange_rate = parameter("exchange_rate")
+    output_mwh = np.where(
+        operating,
+        electricity_output_mwh(parameter("installed_capacity_mw"), capacity_factor)[
+            :, None
+        ],
+        0.0,
+    )
+    if tariff_r_per_kwh is None:
+        discount = (1 + parameter("discount_rate")[:, None]) ** -(years - PRESENT_YEAR)
+        costs = sum(items.values())
+        tariff_r_per_kwh = (
+            (costs * discount).sum(axis=1)
+            / (output_mwh * discount).sum(axis=1)
+            * exchange_rate
+            / THOUSAND
+        )
+    tariff = np.broadcast_to(np.asarray(tariff_r_per_kwh, dtype=float), (len(plants),))
+    revenue = output_mwh * (tariff * THOUSAND / exchange_rate)[:, None]
+
+    capex = items["CAPEX"]
+    operating_costs = sum(items[item] for item in OPERATING_COST_ITEMS)
+    ebitda = revenue - operating_costs
+
+    lines = {
+        "Revenue": revenue,
+        "Operating costs": operating_costs,
+        "EBITDA": ebitda,
+        "CAPEX": capex,
+        "Debt drawdown": np.zeros_like(capex),
+        "Interest": np.zeros_like(capex),
+        "Principal": np.zeros_like(capex),
+        "Debt balance": np.zeros_like(capex),
+    }
+    for tranche in tranches:
+        schedule = _debt_schedule(tranche, capex, year_index, operation_start_index)
+        lines["Debt drawdown"] += schedule["drawdown"]
+        lines["Interest"] += schedule["interest"]
+        lines["Principal"] += schedule["principal"]
+        lines["Debt balance"] += schedule["balance"]
+
+    # depreciation of the CAPEX from the start of operation
+    profile = depreciation_profile(depreciation)
+    depreciation_index = year_index - operation_start_index[:, None]
+    in_profile = (depreciation_index >= 0) & (depreciation_index < len(profile))
+    lines["Depreciation"] = np.where(
+        in_profile,
+        capex.sum(axis=1)[:, None]
+        * profile[np.clip(depreciation_index, 0, len(profile) - 1)],
+        0.0,
+    )
+    lines["Taxable income"] = ebitda - lines["Interest"] - lines["Depreciation"]
+    lines["Tax"] = _tax(lines["Taxable income"], tax_rate)
+    lines["CFADS"] = ebitda - lines["Tax"]
+    lines["Debt service"] = lines["Interest"] + lines["Principal"]
+    lines["Equity contribution"] = capex - lines["Debt drawdown"]
+    lines["Equity cash flow"] = (
+        lines["CFADS"] - lines["Debt service"] - lines["Equity contribution"]
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr = np.where(
+            lines["Debt service"] > 0, lines["CFADS"] / lines["Debt service"], np.inf
+        )
+    minimum_dscr = dscr.min(axis=1)
+
+    return {
+        "years": years,
+        "plant_names": plant_names,
+        "lines": lines,
+        "Tariff": tariff,
+        "Equity IRR": internal_rate_of_return(lines["Equity cash flow"], years),
+        "Project IRR": internal_rate_of_return(ebitda - capex, years),
+        "Minimum DSCR": np.where(np.isinf(minimum_dscr), np.nan, minimum_dscr),
+    }
+
+
+def summarize_project_finance(waterfall):
+    """
+    Per-plant summary of a waterfall.
+
+    Returns:
+        pd.DataFrame: One row per plant with its tariff, IRRs, minimum DSCR
+        and total tax.
+    """
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "Power Plant": waterfall["plant_names"],
+            "Tariff (R/kWh)": waterfall["Tariff"],
+            "Equity IRR": waterfall["Equity IRR"],
+            "Project IRR": waterfall["Project IRR"],
+            "Minimum DSCR": waterfall["Minimum DSCR"],
+            "Total tax (R)": waterfall["lines"]["Tax"].sum(axis=1),
+        }
+    )
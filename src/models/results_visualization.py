@@ -1,8 +1,19 @@
 ## GRAPH ONE ##
 
 
+import copy
+import functools
+
+import numpy as np
 import pandas as pd
 
+from src.models.compiled_lcoe_model import compile_plants
+from src.models.emission_pathways import check_carbon_budget, emission_pathways
+from src.models.fleet_demand_model import (
+    fleet_demand_timeseries,
+    fleet_operation_windows,
+    fleet_scenario_demands,
+)
 from src.models.lcoe_model import (
     calculate_lcoe,
     create_cash_flow,
@@ -12,18 +23,29 @@ from src.models.lcoe_model import (
     roll_cost_items,
     start_of_operation_period,
 )
+from src.models.lcoe_gradients import (
+    GRADIENT_PARAMETERS,
+    lcoe_elasticities,
+    lcoe_gradients,
+)
 from src.models.lng_demand_model import (
     electricity_demand_pj,
     electricity_output_mwh,
     feedstock_demand_mtpa,
 )
+from src.models.sensitivity_model import evaluate_lcoe_sensitivities
 from src.utils.constants import PRESENT_YEAR
+from src.utils.memory_profiling import memory_profiled, profile_memory
 
 
-def compute_demand_scenario_projections(plants, scenarios):
+@memory_profiled
+def compute_demand_scenario_projections(plants, scenarios, table=None):
     """
-    Demand scenario projections.
+    Demand scenario projections, looked up in a LoadFactorTable of the
+    plants if one is given.
     """
+    if table is not None:
+        return lookup_demand_scenario_projections(table, scenarios)
 
     plant_list = []
     scenario_list = []
@@ -44,21 +66,80 @@ def compute_demand_scenario_projections(plants, scenarios):
             pj_demands.append(pj)
             mtpa_demands.append(mtpa)
 
-    demand_df = pd.DataFrame(
+    with profile_memory("compute_demand_scenario_projections: DataFrame"):
+        demand_df = pd.DataFrame(
+            {
+                "Power Plant": plant_list,
+                "Scenario": scenario_list,
+                "PJ": pj_demands,
+                "MTPA": mtpa_demands,
+            }
+        )
+
+    return demand_df
+
+
+def lookup_demand_scenario_projections(table, scenarios):
+    """compute_demand_scenario_projections from a LoadFactorTable."""
+    scenario_demands = [table.demand(cf) for cf in scenarios.values()]
+    # (plants x scenarios) rows, plant-major
+    pj = np.stack([pj for pj, _ in scenario_demands], axis=1)
+    mtpa = np.stack([mtpa for _, mtpa in scenario_demands], axis=1)
+
+    return pd.DataFrame(
         {
-            "Power Plant": plant_list,
-            "Scenario": scenario_list,
-            "PJ": pj_demands,
-            "MTPA": mtpa_demands,
+            "Power Plant": np.repeat(table.plant_names, len(scenarios)),
+            "Scenario": np.tile(list(scenarios.keys()), len(table.plant_names)),
+            "PJ": pj.ravel(),
+            "MTPA": mtpa.ravel(),
         }
     )
 
-    return demand_df
+
+@memory_profiled
+def compute_fleet_demand_timeseries(plants, scenarios):
+    """
+    Fleet demand time series: aggregate annual electricity production and LNG
+    demand by scenario, as plants come online and retire.
+    """
+    plant_names = list(plants.keys())
+    operation_start, operation_end = fleet_operation_windows(
+        [plants[plant]["construction_duration_years"] for plant in plant_names],
+        [plants[plant]["operational_lifetime_years"] for plant in plant_names],
+    )
+    pj, mtpa = fleet_scenario_demands(
+        [plants[plant]["installed_capacity_mw"] for plant in plant_names],
+        [plants[plant]["efficiency_rate"] for plant in plant_names],
+        [capacity_factor / 100.0 for capacity_factor in scenarios.values()],
+    )
+
+    first_year = PRESENT_YEAR
+    last_year = int(operation_end.max())
+    pj_timeseries = fleet_demand_timeseries(
+        operation_start, operation_end, pj, first_year, last_year
+    )
+    mtpa_timeseries = fleet_demand_timeseries(
+        operation_start, operation_end, mtpa, first_year, last_year
+    )
+
+    num_years = last_year - first_year + 1
+    with profile_memory("compute_fleet_demand_timeseries: DataFrame"):
+        fleet_demand_df = pd.DataFrame(
+            {
+                "Scenario": np.repeat(list(scenarios.keys()), num_years),
+                "Year": np.tile(np.arange(first_year, last_year + 1), len(scenarios)),
+                "PJ": pj_timeseries.ravel(),
+                "MTPA": mtpa_timeseries.ravel(),
+            }
+        )
+
+    return fleet_demand_df
 
 
 ## GRAPH TWO ##
 
 
+@memory_profiled
 def compute_demand_scenario_emissions(demands, emission_factor_mtco2e_per_pjs):
     """
     Demand scenario emissions.
@@ -78,25 +159,117 @@ def compute_demand_scenario_emissions(demands, emission_factor_mtco2e_per_pjs):
 
             mtco2e_list.append(mtco2e)
 
-    mtco2e_df = pd.DataFrame(
-        {
-            "Scenario": scenario_list,
-            "Power Plant": plant_list,
-            "Fuel Type": fuel_type_list,
-            "MtCO2e": mtco2e_list,
-        }
-    )
+    with profile_memory("compute_demand_scenario_emissions: DataFrame"):
+        mtco2e_df = pd.DataFrame(
+            {
+                "Scenario": scenario_list,
+                "Power Plant": plant_list,
+                "Fuel Type": fuel_type_list,
+                "MtCO2e": mtco2e_list,
+            }
+        )
 
     return mtco2e_df
 
 
+@memory_profiled
+def compute_emission_pathways(
+    plants,
+    scenarios,
+    emission_factors,
+    carbon_budget_mtco2e=None,
+    construction_mtco2e_per_mw=0.0,
+    decommissioning_mtco2e_per_mw=0.0,
+):
+    """
+    Annual and cumulative fleet emissions per scenario and fuel type over the
+    timeline of the plants, embodied emissions included (see
+    emission_pathways), with the carbon budget and whether the cumulative
+    emissions are still within it.
+    """
+    pathways = emission_pathways(
+        plants,
+        scenarios,
+        emission_factors,
+        construction_mtco2e_per_mw,
+        decommissioning_mtco2e_per_mw,
+    )
+    fleet_mtco2e = pathways["MtCO2e"].sum(axis=1)  # scenarios x years x carriers
+    cumulative = np.cumsum(fleet_mtco2e, axis=1)
+    num_scenarios, num_years, num_carriers = fleet_mtco2e.shape
+
+    with profile_memory("compute_emission_pathways: DataFrame"):
+        pathways_df = pd.DataFrame(
+            {
+                "Scenario": np.repeat(
+                    pathways["scenario_names"], num_years * num_carriers
+                ),
+                "Year": np.tile(
+                    np.repeat(pathways["years"], num_carriers), num_scenarios
+                ),
+                "Fuel Type": np.tile(pathways["carriers"], num_scenarios * num_years),
+                "MtCO2e": fleet_mtco2e.ravel(),
+                "Cumulative MtCO2e": cumulative.ravel(),
+            }
+        )
+        if carbon_budget_mtco2e is not None:
+            budget = check_carbon_budget(pathways, carbon_budget_mtco2e)
+            pathways_df["Budget MtCO2e"] = np.repeat(
+                budget["Budget MtCO2e"][:, 0], num_years * num_carriers
+            )
+            pathways_df["Within budget"] = (
+                pathways_df["Cumulative MtCO2e"] <= pathways_df["Budget MtCO2e"]
+            )
+
+    return pathways_df
+
+
+@memory_profiled
+def compute_lcoe_load_factor_curves(
+    plants,
+    escalations=None,
+    num_points=1000,
+    first_load_factor=1.0,
+    last_load_factor=100.0,
+):
+    """
+    LCOE of every plant over a dense grid of load factors (%), evaluated in
+    closed form (see CompiledPlants.lcoe_curve_terms) in one call. Optional
+    cost escalations (see roll_cost_items) apply to every plant; escalated
+    costs stay linear in the load factor.
+    """
+    load_factors = np.linspace(first_load_factor, last_load_factor, num_points)
+    lcoe = compile_plants(plants, escalations).lcoe_curves(load_factors)
+
+    with profile_memory("compute_lcoe_load_factor_curves: DataFrame"):
+        curves_df = pd.DataFrame(
+            {
+                "Power Plant": np.repeat(list(plants.keys()), num_points),
+                "Load factor": np.tile(load_factors, len(plants)),
+                "LCOE": lcoe.T.ravel(),
+            }
+        )
+
+    return curves_df
+
+
 ## GRAPH THREE ##
 
 
-def compute_discount_cash_flows(plants, scenarios, scenario_name):
+@memory_profiled
+def compute_discount_cash_flows(
+    plants, scenarios, scenario_name, escalations=None, table=None
+):
     """
     Compute discounted cash flows.
+
+    Optional cost escalations (see roll_cost_items) apply to every plant. The
+    cash flows are looked up in a LoadFactorTable of the plants and
+    escalations if one is given.
     """
+    if table is not None:
+        return table.discounted_cost_items(scenarios[scenario_name])
+
     plant_discounted_cash_flow = {}
     for plant, characteristics in plants.items():
         installed_capacity_mw = float(plants[plant]["installed_capacity_mw"])
@@ -137,6 +310,7 @@ def compute_discount_cash_flows(plants, scenarios, scenario_name):
             emission_factor_mtco2e_per_pj,
             efficiency_rate,
             exchange_rate,
+            escalations,
         )
 
         cost_items = create_cost_items(plant_cost_items)
@@ -151,10 +325,17 @@ def compute_discount_cash_flows(plants, scenarios, scenario_name):
 ## GRAPH FOUR ##
 
 
-def compute_scenario_lcoe(plants, scenarios):
+@memory_profiled
+def compute_scenario_lcoe(plants, scenarios, escalations=None, table=None):
     """
     Compute scenario localized cost of electricity.
+
+    Optional cost escalations (see roll_cost_items) apply to every plant. The
+    LCOE is looked up in a LoadFactorTable of the plants and escalations if
+    one is given.
     """
+    if table is not None:
+        return lookup_scenario_lcoe(table, scenarios)
 
     scenario_list = []
     plant_list = []
@@ -208,6 +389,7 @@ def compute_scenario_lcoe(plants, scenarios):
                 emission_factor_mtco2e_per_pj,
                 efficiency_rate,
                 exchange_rate,
+                escalations,
             )
 
             revenue_item = create_cash_flow(plant_revenue_item)
@@ -221,323 +403,101 @@ def compute_scenario_lcoe(plants, scenarios):
             plant_list.append(plant)
             lcoe_list.append(scenario_plant_lcoe)
 
-    plant_lcoe = pd.DataFrame(
+    with profile_memory("compute_scenario_lcoe: DataFrame"):
+        plant_lcoe = pd.DataFrame(
+            {
+                "Scenario": scenario_list,
+                "Power Plant": plant_list,
+                "LCOE": lcoe_list,
+            }
+        )
+
+    return plant_lcoe
+
+
+def lookup_scenario_lcoe(table, scenarios):
+    """compute_scenario_lcoe from a LoadFactorTable."""
+    # (plants x scenarios) rows, plant-major
+    lcoe = np.stack([table.lcoe(cf) for cf in scenarios.values()], axis=1)
+
+    return pd.DataFrame(
         {
-            "Scenario": scenario_list,
-            "Power Plant": plant_list,
-            "LCOE": lcoe_list,
+            "Scenario": np.tile(list(scenarios.keys()), len(table.plant_names)),
+            "Power Plant": np.repeat(table.plant_names, len(scenarios)),
+            "LCOE": lcoe.ravel(),
         }
     )
 
-    return plant_lcoe
-
 
 ## GRAPH FIVE ##
 
 
-def compute_lcoe_sensitivities(plants, scenarios, selected_parameters):
-    # plants = data.plants
-    # scenarios = data.selected_scenarios
-    # selected_parameters = data.sensitivities
-
-    plant_list = []
-    scenario_list = []
-    parameter_list = []
-    value_list = []
-    lcoe_list = []
+@memory_profiled
+def compute_lcoe_sensitivities(
+    plants, scenarios, selected_parameters, escalations=None
+):
+    """
+    LCOE of every plant at every value of the selected sensitivity columns,
+    keyed as SENSITIVITY_PARAMETERS, with optional cost escalations (see
+    evaluate_lcoe_sensitivities).
+    """
+    sensitivities = evaluate_lcoe_sensitivities(
+        plants, scenarios, selected_parameters, escalations=escalations
+    )
 
-    for plant, parameters in plants.items():
-        installed_capacity_mw = float(plants[plant]["installed_capacity_mw"])
-        construction_duration_years = int(plants[plant]["construction_duration_years"])
-        overnight_capex_per_kw = float(plants[plant]["overnight_capex_per_kw"])
-        operational_lifetime_years = int(plants[plant]["operational_lifetime_years"])
-        foam_cost_factor = float(plants[plant]["foam_cost_factor"])
-        voam_cost_per_mwh = float(plants[plant]["voam_cost_per_mwh"])
-        fuel_cost_per_tlng = float(plants[plant]["fuel_cost_per_tLNG"])
-        carbon_cost_per_tco2e = float(plants[plant]["carbon_cost_per_tCO2e"])
-        decommissioning_duration_years = int(
-            plants[plant]["decommissioning_duration_years"]
-        )
-        capex_contingency_factor = float(plants[plant]["capex_contingency_factor"])
-        decommissioning_cost_factor = float(
-            plants[plant]["decommissioning_cost_factor"]
-        )
-        efficiency_rate = float(plants[plant]["efficiency_rate"])
-        emission_factor_mtco2e_per_pj = float(
-            plants[plant]["emission_factor_mtco2e_per_pj"]
-        )
-        discount_rate = float(plants[plant]["discount_rate"])
-        exchange_rate = float(plants[plant]["exchange_rate"])
+    with profile_memory("compute_lcoe_sensitivities: DataFrame"):
+        lcoe_sensitivities = pd.DataFrame(sensitivities)
 
-        if "capacity_factor" in selected_parameters:
-            for cf in selected_parameters["capacity_factor"]:
-                plant_revenue_item = (
-                    start_of_operation_period(construction_duration_years),
-                    end_of_operation_period(
-                        construction_duration_years, operational_lifetime_years
-                    ),
-                    electricity_output_mwh(installed_capacity_mw, cf),
-                )
-
-                plant_cost_items = roll_cost_items(
-                    installed_capacity_mw,
-                    construction_duration_years,
-                    operational_lifetime_years,
-                    decommissioning_duration_years,
-                    overnight_capex_per_kw,
-                    capex_contingency_factor,
-                    foam_cost_factor,
-                    voam_cost_per_mwh,
-                    fuel_cost_per_tlng,
-                    carbon_cost_per_tco2e,
-                    decommissioning_cost_factor,
-                    cf,
-                    emission_factor_mtco2e_per_pj,
-                    efficiency_rate,
-                    exchange_rate,
-                )
-
-                revenue_item = create_cash_flow(plant_revenue_item)
-                cost_items = create_cost_items(plant_cost_items)
-                lcoe_per_kwh = calculate_lcoe(
-                    revenue_item, cost_items, discount_rate, exchange_rate, PRESENT_YEAR
-                )
-                plant_list.append(plant)
-                scenario_list.append("All Scenarios")
-                parameter_list.append("Load factor")
-                value_list.append(cf)
-                lcoe_list.append(lcoe_per_kwh)
+    return lcoe_sensitivities
 
-        for scenario, cf in scenarios.items():
-            plant_revenue_item = (
-                start_of_operation_period(construction_duration_years),
-                end_of_operation_period(
-                    construction_duration_years, operational_lifetime_years
-                ),
-                electricity_output_mwh(installed_capacity_mw, cf),
-            )
 
-            plant_cost_items = roll_cost_items(
-                installed_capacity_mw,
-                construction_duration_years,
-                operational_lifetime_years,
-                decommissioning_duration_years,
-                overnight_capex_per_kw,
-                capex_contingency_factor,
-                foam_cost_factor,
-                voam_cost_per_mwh,
-                fuel_cost_per_tlng,
-                carbon_cost_per_tco2e,
-                decommissioning_cost_factor,
-                cf,
-                emission_factor_mtco2e_per_pj,
-                efficiency_rate,
-                exchange_rate,
-            )
+def lcoe_sensitivity_tasks(plants, scenarios, selected_parameters, escalations=None):
+    """
+    Split compute_lcoe_sensitivities into one task per plant, to run as a
+    background job. The inputs are copied, so later edits of the session state
+    do not change a running job. Concatenating the task results in order gives
+    the same table as compute_lcoe_sensitivities.
+    """
+    scenarios = copy.deepcopy(scenarios)
+    selected_parameters = copy.deepcopy(selected_parameters)
+    escalations = copy.deepcopy(escalations)
+
+    return [
+        functools.partial(
+            compute_lcoe_sensitivities,
+            {plant: copy.deepcopy(characteristics)},
+            scenarios,
+            selected_parameters,
+            escalations,
+        )
+        for plant, characteristics in plants.items()
+    ]
 
-            revenue_item = create_cash_flow(plant_revenue_item)
-            cost_items = create_cost_items(plant_cost_items)
 
-            for parameter, parameter_values in selected_parameters.items():
-                if parameter == "discount_rate":
-                    for dr in range(len(parameter_values)):
-                        lcoe_per_kwh = calculate_lcoe(
-                            revenue_item,
-                            cost_items,
-                            parameter_values[dr],
-                            exchange_rate,
-                            PRESENT_YEAR,
-                        )
-                        plant_list.append(plant)
-                        scenario_list.append(scenario)
-                        parameter_list.append("Discount rate")
-                        value_list.append(parameter_values[dr])
-                        lcoe_list.append(lcoe_per_kwh)
-
-                if parameter == "efficiency_rate":
-                    for er in range(len(parameter_values)):
-                        plant_cost_items = roll_cost_items(
-                            installed_capacity_mw,
-                            construction_duration_years,
-                            operational_lifetime_years,
-                            decommissioning_duration_years,
-                            overnight_capex_per_kw,
-                            capex_contingency_factor,
-                            foam_cost_factor,
-                            voam_cost_per_mwh,
-                            fuel_cost_per_tlng,
-                            carbon_cost_per_tco2e,
-                            decommissioning_cost_factor,
-                            cf,
-                            emission_factor_mtco2e_per_pj,
-                            parameter_values[er],
-                            exchange_rate,
-                        )
-
-                        cost_items = create_cost_items(plant_cost_items)
-                        lcoe_per_kwh = calculate_lcoe(
-                            revenue_item,
-                            cost_items,
-                            discount_rate,
-                            exchange_rate,
-                            PRESENT_YEAR,
-                        )
-                        plant_list.append(plant)
-                        scenario_list.append(scenario)
-                        parameter_list.append("Efficiency rate")
-                        value_list.append(parameter_values[er])
-                        lcoe_list.append(lcoe_per_kwh)
-
-                if parameter == "fuel_cost":
-                    for fc in range(len(parameter_values)):
-                        lng_cost = fuel_cost_per_tlng * parameter_values[fc]
-                        plant_cost_items = roll_cost_items(
-                            installed_capacity_mw,
-                            construction_duration_years,
-                            operational_lifetime_years,
-                            decommissioning_duration_years,
-                            overnight_capex_per_kw,
-                            capex_contingency_factor,
-                            foam_cost_factor,
-                            voam_cost_per_mwh,
-                            lng_cost,
-                            carbon_cost_per_tco2e,
-                            decommissioning_cost_factor,
-                            cf,
-                            emission_factor_mtco2e_per_pj,
-                            efficiency_rate,
-                            exchange_rate,
-                        )
-
-                        cost_items = create_cost_items(plant_cost_items)
-                        lcoe_per_kwh = calculate_lcoe(
-                            revenue_item,
-                            cost_items,
-                            discount_rate,
-                            exchange_rate,
-                            PRESENT_YEAR,
-                        )
-                        plant_list.append(plant)
-                        scenario_list.append(scenario)
-                        parameter_list.append("Fuel costs")
-                        value_list.append(parameter_values[fc])
-                        lcoe_list.append(lcoe_per_kwh)
-
-                if parameter == "carbon_cost":
-                    for cc in range(len(parameter_values)):
-                        tco2e_cost = carbon_cost_per_tco2e * parameter_values[cc]
-                        plant_cost_items = roll_cost_items(
-                            installed_capacity_mw,
-                            construction_duration_years,
-                            operational_lifetime_years,
-                            decommissioning_duration_years,
-                            overnight_capex_per_kw,
-                            capex_contingency_factor,
-                            foam_cost_factor,
-                            voam_cost_per_mwh,
-                            fuel_cost_per_tlng,
-                            tco2e_cost,
-                            decommissioning_cost_factor,
-                            cf,
-                            emission_factor_mtco2e_per_pj,
-                            efficiency_rate,
-                            exchange_rate,
-                        )
-
-                        cost_items = create_cost_items(plant_cost_items)
-                        lcoe_per_kwh = calculate_lcoe(
-                            revenue_item,
-                            cost_items,
-                            discount_rate,
-                            exchange_rate,
-                            PRESENT_YEAR,
-                        )
-                        plant_list.append(plant)
-                        scenario_list.append(scenario)
-                        parameter_list.append("Carbon costs")
-                        value_list.append(parameter_values[cc])
-                        lcoe_list.append(lcoe_per_kwh)
-
-                if parameter == "exchange_rate":
-                    for er in range(len(parameter_values)):
-                        ex_rate = exchange_rate * parameter_values[er]
-                        plant_cost_items = roll_cost_items(
-                            installed_capacity_mw,
-                            construction_duration_years,
-                            operational_lifetime_years,
-                            decommissioning_duration_years,
-                            overnight_capex_per_kw,
-                            capex_contingency_factor,
-                            foam_cost_factor,
-                            voam_cost_per_mwh,
-                            fuel_cost_per_tlng,
-                            carbon_cost_per_tco2e,
-                            decommissioning_cost_factor,
-                            cf,
-                            emission_factor_mtco2e_per_pj,
-                            efficiency_rate,
-                            ex_rate,
-                        )
-
-                        cost_items = create_cost_items(plant_cost_items)
-                        lcoe_per_kwh = calculate_lcoe(
-                            revenue_item,
-                            cost_items,
-                            discount_rate,
-                            exchange_rate,
-                            PRESENT_YEAR,
-                        )
-                        plant_list.append(plant)
-                        scenario_list.append(scenario)
-                        parameter_list.append("Exchange rate")
-                        value_list.append(parameter_values[er])
-                        lcoe_list.append(lcoe_per_kwh)
-
-                if parameter == "operational_lifetime":
-                    for lt in range(len(parameter_values)):
-                        lifetime_years = int(
-                            operational_lifetime_years * parameter_values[lt]
-                        )
-                        plant_cost_items = roll_cost_items(
-                            installed_capacity_mw,
-                            construction_duration_years,
-                            lifetime_years,
-                            decommissioning_duration_years,
-                            overnight_capex_per_kw,
-                            capex_contingency_factor,
-                            foam_cost_factor,
-                            voam_cost_per_mwh,
-                            fuel_cost_per_tlng,
-                            carbon_cost_per_tco2e,
-                            decommissioning_cost_factor,
-                            cf,
-                            emission_factor_mtco2e_per_pj,
-                            efficiency_rate,
-                            exchange_rate,
-                        )
-
-                        cost_items = create_cost_items(plant_cost_items)
-                        lcoe_per_kwh = calculate_lcoe(
-                            revenue_item,
-                            cost_items,
-                            discount_rate,
-                            exchange_rate,
-                            PRESENT_YEAR,
-                        )
-                        plant_list.append(plant)
-                        scenario_list.append(scenario)
-                        parameter_list.append("Lifetime")
-                        value_list.append(parameter_values[lt])
-                        lcoe_list.append(lcoe_per_kwh)
-
-    lcoe_sensitivities = pd.DataFrame(
-        {
-            "Power Plant": plant_list,
-            "Scenario": scenario_list,
-            "Parameter": parameter_list,
-            "Value": value_list,
-            "LCOE": lcoe_list,
-        }
-    )
+@memory_profiled
+def compute_lcoe_elasticities(plants, scenarios, escalations=None):
+    """
+    Exact derivatives and elasticities of LCOE with respect to every plant
+    parameter and the capacity factor, at the current parameters of every
+    plant and scenario, with optional cost escalations (see lcoe_gradients).
+    """
+    lcoe, gradients, values = lcoe_gradients(plants, scenarios, escalations)
+    elasticities = lcoe_elasticities(lcoe, gradients, values)
+
+    frames = []
+    for parameter in GRADIENT_PARAMETERS:
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Scenario": np.repeat(list(scenarios.keys()), len(plants)),
+                    "Power Plant": np.tile(list(plants.keys()), len(scenarios)),
+                    "Parameter": parameter,
+                    "Value": values[parameter].ravel(),
+                    "LCOE": lcoe.ravel(),
+                    "Derivative": gradients[parameter].ravel(),
+                    "Elasticity": elasticities[parameter].ravel(),
+                }
+            )
+        )
 
-    return lcoe_sensitivities
+    return pd.concat(frames, ignore_index=True)
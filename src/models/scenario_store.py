@@ -0,0 +1,523 @@
+import functools
+
+import pandas as pd
+
+from src.models.escalation import escalate_expense
+from src.models.lcoe_model import (
+    carbon_cost,
+    create_cash_flow,
+    decommissioning_cost,
+    end_of_construction_period,
+    end_of_decommissioning_period,
+    end_of_operation_period,
+    fixed_oam_cost,
+    fuel_cost,
+    overnight_capex,
+    start_of_construction_period,
+    start_of_decommissioning_period,
+    start_of_operation_period,
+    variable_oam_cost,
+)
+from src.models.lng_demand_model import (
+    electricity_demand_pj_mtco2e,
+    electricity_output_mwh,
+)
+from src.utils.constants import PRESENT_YEAR, THOUSAND
+
+BASE_VERSION_NAME = "Base"
+
+# inputs every discounted cash flow of a plant depends on: a comparison only
+# recomputes the cash flows whose inputs differ between two versions.
+CASH_FLOW_INPUTS = {
+    "CAPEX": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "overnight_capex_per_kw",
+        "capex_contingency_factor",
+        "exchange_rate",
+        "discount_rate",
+    ),
+    "FO&M": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "operational_lifetime_years",
+        "overnight_capex_per_kw",
+        "capex_contingency_factor",
+        "foam_cost_factor",
+        "exchange_rate",
+        "discount_rate",
+    ),
+    "VO&M": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "operational_lifetime_years",
+        "voam_cost_per_mwh",
+        "capacity_factor",
+        "exchange_rate",
+        "discount_rate",
+    ),
+    "Fuel": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "operational_lifetime_years",
+        "fuel_cost_per_tLNG",
+        "capacity_factor",
+        "efficiency_rate",
+        "exchange_rate",
+        "discount_rate",
+    ),
+    "Carbon": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "operational_lifetime_years",
+        "carbon_cost_per_tCO2e",
+        "capacity_factor",
+        "emission_factor_mtco2e_per_pj",
+        "exchange_rate",
+        "discount_rate",
+    ),
+    "Decommissioning": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "operational_lifetime_years",
+        "decommissioning_duration_years",
+        "overnight_capex_per_kw",
+        "capex_contingency_factor",
+        "decommissioning_cost_factor",
+        "exchange_rate",
+        "discount_rate",
+    ),
+    "Revenue": (
+        "installed_capacity_mw",
+        "construction_duration_years",
+        "operational_lifetime_years",
+        "capacity_factor",
+        "discount_rate",
+    ),
+}
+COST_ITEMS = [item for item in CASH_FLOW_INPUTS if item != "Revenue"]
+
+
+@functools.lru_cache(maxsize=65536)
+def discounted_cash_flow(item, inputs, escalation=None):
+    """
+    Discounted value of one cash flow of a plant, as in roll_cost_items and
+    calculate_lcoe. Cached by the values of its inputs and its escalation, so
+    unchanged cash flows are shared by all versions.
+
+    Args:
+        item (str): Cost item name, or "Revenue" for the electricity output.
+        inputs (tuple): Values of CASH_FLOW_INPUTS[item], in order.
+        escalation (optional): Escalation of the cost item (see
+        roll_cost_items); the revenue is never escalated.
+
+    Returns:
+        float: Net present value (R, or MWh for the revenue).
+    """
+    p = dict(zip(CASH_FLOW_INPUTS[item], inputs))
+    construction_duration = int(p["construction_duration_years"])
+
+    if item == "CAPEX":
+        start = start_of_construction_period()
+        end = end_of_construction_period(construction_duration)
+        value = overnight_capex(
+            p["installed_capacity_mw"],
+            construction_duration,
+            p["overnight_capex_per_kw"],
+            p["capex_contingency_factor"],
+            p["exchange_rate"],
+        )
+    elif item == "Decommissioning":
+        operational_lifetime = int(p["operational_lifetime_years"])
+        decommissioning_duration = int(p["decommissioning_duration_years"])
+        start = start_of_decommissioning_period(
+            construction_duration, operational_lifetime
+        )
+        end = end_of_decommissioning_period(
+            construction_duration, operational_lifetime, decommissioning_duration
+        )
+        value = decommissioning_cost(
+            p["installed_capacity_mw"],
+            p["overnight_capex_per_kw"],
+            p["capex_contingency_factor"],
+            decommissioning_duration,
+            p["decommissioning_cost_factor"],
+            p["exchange_rate"],
+        )
+    else:
+        start = start_of_operation_period(construction_duration)
+        end = end_of_operation_period(
+            construction_duration, int(p["operational_lifetime_years"])
+        )
+        if item == "FO&M":
+            value = fixed_oam_cost(
+                p["installed_capacity_mw"],
+                construction_duration,
+                p["overnight_capex_per_kw"],
+                p["capex_contingency_factor"],
+                p["exchange_rate"],
+                p["foam_cost_factor"],
+            )
+        elif item == "VO&M":
+            value = variable_oam_cost(
+                p["installed_capacity_mw"],
+                p["voam_cost_per_mwh"],
+                p["capacity_factor"],
+                p["exchange_rate"],
+            )
+        elif item == "Fuel":
+            value = fuel_cost(
+                p["installed_capacity_mw"],
+                p["fuel_cost_per_tLNG"],
+                p["capacity_factor"],
+                p["efficiency_rate"],
+                p["exchange_rate"],
+            )
+        elif item == "Carbon":
+            value = carbon_cost(
+                p["installed_capacity_mw"],
+                p["capacity_factor"],
+                p["emission_factor_mtco2e_per_pj"],
+                p["carbon_cost_per_tCO2e"],
+                p["exchange_rate"],
+            )
+        else:
+            value = electricity_output_mwh(
+                p["installed_capacity_mw"], p["capacity_factor"]
+            )
+
+    if escalation is not None and item != "Revenue":
+        value = escalate_expense(value, start, end, escalation)
+    return create_cash_flow((start, end, value)).net_present_value(
+        PRESENT_YEAR, p["discount_rate"]
+    )
+
+
+class ScenarioVersion:
+    """
+    A stored version: the plant parameters and scenario capacity factors that
+    differ from the base, plants added to and removed from the base.
+    """
+
+    def __init__(
+        self,
+        name,
+        version,
+        plant_deltas,
+        scenario_deltas,
+        removed_plants=(),
+        removed_scenarios=(),
+    ):
+        self.name = name
+        self.version = version
+        self.plant_deltas = plant_deltas
+        self.scenario_deltas = scenario_deltas
+        self.removed_plants = frozenset(removed_plants)
+        self.removed_scenarios = frozenset(removed_scenarios)
+
+    @property
+    def label(self):
+        return f"{self.name} v{self.version}"
+
+    def num_deltas(self):
+        """Number of parameter values recorded by the version."""
+        return (
+            sum(len(delta) for delta in self.plant_deltas.values())
+            + len(self.scenario_deltas)
+            + len(self.removed_plants)
+            + len(self.removed_scenarios)
+        )
+
+
+class ScenarioStore:
+    """
+    Named, versioned copies of the plant parameters and scenarios. Every
+    version records only its deltas from a shared base, so the store grows with
+    the number of edits rather than with the size of the plant table.
+
+    Args:
+        base_plants (dict): Plant parameters keyed by plant name.
+        base_scenarios (dict): Capacity factor keyed by scenario name.
+    """
+
+    def __init__(self, base_plants, base_scenarios):
+        self.base_plants = {
+            plant: dict(parameters) for plant, parameters in base_plants.items()
+        }
+        self.base_scenarios = dict(base_scenarios)
+        self._versions = {
+            BASE_VERSION_NAME: [ScenarioVersion(BASE_VERSION_NAME, 0, {}, {})]
+        }
+
+    def save(self, name, plants, scenarios):
+        """
+        Store plants and scenarios as the next version of name.
+
+        Returns:
+            ScenarioVersion: The stored version.
+        """
+        if name == BASE_VERSION_NAME:
+            raise ValueError(f"{BASE_VERSION_NAME} is reserved for the base.")
+        if not name:
+            raise ValueError("A version needs a name.")
+
+        plant_deltas = {}
+        for plant, parameters in plants.items():
+            base_parameters = self.base_plants.get(plant, {})
+            delta = {
+                parameter: value
+                for parameter, value in parameters.items()
+                if parameter not in base_parameters
+                or base_parameters[parameter] != value
+            }
+            if delta:
+                plant_deltas[plant] = delta
+        scenario_deltas = {
+            scenario: capacity_factor
+            for scenario, capacity_factor in scenarios.items()
+            if self.base_scenarios.get(scenario) != capacity_factor
+        }
+
+        versions = self._versions.setdefault(name, [])
+        version = ScenarioVersion(
+            name,
+            len(versions) + 1,
+            plant_deltas,
+            scenario_deltas,
+            removed_plants=self.base_plants.keys() - plants.keys(),
+            removed_scenarios=self.base_scenarios.keys() - scenarios.keys(),
+        )
+        versions.append(version)
+
+        return version
+
+    def names(self):
+        return list(self._versions.keys())
+
+    def versions(self, name):
+        """All versions stored under name, oldest first."""
+        if name not in self._versions:
+            raise ValueError(f"Unknown scenario version {name}.")
+        return list(self._versions[name])
+
+    def get(self, name, version=None):
+        """A stored version; the latest one of name if version is None."""
+        versions = self.versions(name)
+        if version is None:
+            return versions[-1]
+        for stored in versions:
+            if stored.version == version:
+                return stored
+        raise ValueError(f"Unknown version {version} of {name}.")
+
+    def plant_parameters(self, version, plant):
+        """Parameters of a plant in a version, or None if it is not in it."""
+        if plant in version.removed_plants:
+            return None
+        base_parameters = self.base_plants.get(plant)
+        delta = version.plant_deltas.get(plant)
+        if delta is None:
+            return base_parameters
+        if base_parameters is None:
+            return delta
+        return {**base_parameters, **delta}
+
+    def plant_names(self, version):
+        names = [
+            plant for plant in self.base_plants if plant not in version.removed_plants
+        ]
+        return names + [
+            plant for plant in version.plant_deltas if plant not in self.base_plants
+        ]
+
+    def scenarios(self, version):
+        scenarios = {
+            scenario: capacity_factor
+            for scenario, capacity_factor in self.base_scenarios.items()
+            if scenario not in version.removed_scenarios
+        }
+        scenarios.update(version.scenario_deltas)
+        return scenarios
+
+    def materialize(self, name, version=None):
+        """Full (plants, scenarios) copies of a version, e.g. to load it."""
+        stored = self.get(name, version)
+        plants = {
+            plant: dict(self.plant_parameters(stored, plant))
+            for plant in self.plant_names(stored)
+        }
+        return plants, self.scenarios(stored)
+
+    def compare(self, name_a, name_b, version_a=None, version_b=None, escalations=None):
+        """
+        LCOE, discounted cost and emission deltas from version a to version b,
+        with optional cost escalations (see roll_cost_items) applying to both.
+
+        Only the plants and scenarios whose inputs differ between the versions
+        are evaluated, and for those only the cash flows whose inputs differ
+        are computed for both versions; unchanged ones are computed once and
+        shared through the discounted_cash_flow cache.
+
+        Returns:
+            pd.DataFrame: One row per changed plant, scenario and metric
+            ("LCOE" in R/kWh, cost items in R, "Emissions" in MtCO2e/year),
+            with the value in both versions and the delta. Plants or scenarios
+            missing from a version have NaN values there.
+        """
+        stored_a = self.get(name_a, version_a)
+        stored_b = self.get(name_b, version_b)
+        scenarios_a = self.scenarios(stored_a)
+        scenarios_b = self.scenarios(stored_b)
+        scenario_names = list(scenarios_a) + [
+            scenario for scenario in scenarios_b if scenario not in scenarios_a
+        ]
+        plant_names = list(
+            dict.fromkeys(self.plant_names(stored_a) + self.plant_names(stored_b))
+        )
+
+        # only plants with deltas in either version can differ
+        candidates = (
+            set(stored_a.plant_deltas)
+            | set(stored_b.plant_deltas)
+            | stored_a.removed_plants
+            | stored_b.removed_plants
+        )
+        changed_scenarios = {
+            scenario
+            for scenario in scenario_names
+            if scenarios_a.get(scenario) != scenarios_b.get(scenario)
+        }
+
+        rows = []
+        for plant in plant_names:
+            parameters_a = self.plant_parameters(stored_a, plant)
+            parameters_b = self.plant_parameters(stored_b, plant)
+            plant_changed = plant in candidates and parameters_a != parameters_b
+            for scenario in scenario_names:
+                if not plant_changed and scenario not in changed_scenarios:
+                    continue
+                rows.extend(
+                    _compare_plant(
+                        plant,
+                        scenario,
+                        _with_capacity_factor(parameters_a, scenarios_a, scenario),
+                        _with_capacity_factor(parameters_b, scenarios_b, scenario),
+                        escalations,
+                    )
+                )
+
+        return pd.DataFrame(
+            rows,
+            columns=[
+                "Scenario",
+                "Power Plant",
+                "Metric",
+                stored_a.label,
+                stored_b.label,
+                "Delta",
+            ],
+        )
+
+
+def _with_capacity_factor(parameters, scenarios, scenario):
+    if parameters is None or scenario not in scenarios:
+        return None
+    return {**parameters, "capacity_factor": scenarios[scenario]}
+
+
+def _cash_flows(parameters, items, escalations):
+    escalations = escalations or {}
+    return {
+        item: discounted_cash_flow(
+            item,
+            tuple(parameters[name] for name in CASH_FLOW_INPUTS[item]),
+            escalations.get(item),
+        )
+        for item in items
+    }
+
+
+def _lcoe(cash_flows, exchange_rate):
+    total_discounted_expenses = 0.0
+    for item in COST_ITEMS:
+        total_discounted_expenses += cash_flows[item]
+
+    return round(
+        ((total_discounted_expenses / cash_flows["Revenue"]) * exchange_rate)
+        / THOUSAND,
+        2,
+    )
+
+
+def _emissions(parameters):
+    return electricity_demand_pj_mtco2e(
+        parameters["installed_capacity_mw"],
+        parameters["capacity_factor"] / 100.0,
+        parameters["emission_factor_mtco2e_per_pj"],
+    )
+
+
+def _compare_plant(plant, scenario, parameters_a, parameters_b, escalations):
+    nan = float("nan")
+    if parameters_a is None or parameters_b is None:
+        # the plant or scenario is only in one version: report its values.
+        rows = []
+        for parameters, is_a in ((parameters_a, True), (parameters_b, False)):
+            if parameters is None:
+                continue
+            cash_flows = _cash_flows(parameters, CASH_FLOW_INPUTS, escalations)
+            metrics = {
+                "LCOE": _lcoe(cash_flows, parameters["exchange_rate"]),
+                **{item: cash_flows[item] for item in COST_ITEMS},
+                "Emissions": _emissions(parameters),
+            }
+            for metric, value in metrics.items():
+                values = (value, nan) if is_a else (nan, value)
+                rows.append((scenario, plant, metric, *values, nan))
+        return rows
+
+    changed = [
+        item
+        for item, inputs in CASH_FLOW_INPUTS.items()
+        if any(parameters_a[name] != parameters_b[name] for name in inputs)
+    ]
+    cash_flows_a = _cash_flows(parameters_a, CASH_FLOW_INPUTS, escalations)
+    cash_flows_b = _cash_flows(parameters_b, changed, escalations)
+    cash_flows_b = {**cash_flows_a, **cash_flows_b}
+
+    rows = []
+    lcoe_a = _lcoe(cash_flows_a, parameters_a["exchange_rate"])
+    lcoe_b = _lcoe(cash_flows_b, parameters_b["exchange_rate"])
+    rows.append((scenario, plant, "LCOE", lcoe_a, lcoe_b, lcoe_b - lcoe_a))
+    for item in COST_ITEMS:
+        if item in changed:
+            rows.append(
+                (
+                    scenario,
+                    plant,
+                    item,
+                    cash_flows_a[item],
+                    cash_flows_b[item],
+                    cash_flows_b[item] - cash_flows_a[item],
+                )
+            )
+    emission_inputs = (
+        "installed_capacity_mw",
+        "capacity_factor",
+        "emission_factor_mtco2e_per_pj",
+    )
+    if any(parameters_a[name] != parameters_b[name] for name in emission_inputs):
+        emissions_a = _emissions(parameters_a)
+        emissions_b = _emissions(parameters_b)
+        rows.append(
+            (
+                scenario,
+                plant,
+                "Emissions",
+                emissions_a,
+                emissions_b,
+                emissions_b - emissions_a,
+            )
+        )
+
+    return rows
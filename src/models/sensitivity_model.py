@@ -0,0 +1,196 @@
+"""
+LCOE sensitivities of the plants to the columns of the sensitivity data.
+
+Every column of the sensitivity data perturbs one plant parameter (one of
+BATCH_PARAMETERS), declared in SENSITIVITY_PARAMETERS: the column values
+either replace the parameter ("absolute") or scale it ("multiplier"). A sweep
+of any number of columns is one set of batch rows, each the base parameters
+of a plant in a scenario with one parameter perturbed, evaluated at once by
+evaluate_cost_items_batch. Sensitivity to a new parameter is one more entry
+of SENSITIVITY_PARAMETERS.
+
+As the original sweeps, LCOE is converted at the base exchange rate of the
+plant, and a perturbation of the capacity factor replaces the scenario, so its
+rows are reported once per plant for "All Scenarios". Cost escalations apply
+to every row as in roll_cost_items.
+"""
+
+import numpy as np
+
+from src.models.batch_lcoe_model import (
+    BATCH_PARAMETERS,
+    INTEGER_PARAMETERS,
+    evaluate_cost_items_batch,
+)
+from src.utils.constants import THOUSAND
+
+ABSOLUTE = "absolute"
+MULTIPLIER = "multiplier"
+SENSITIVITY_MODES = (ABSOLUTE, MULTIPLIER)
+ALL_SCENARIOS = "All Scenarios"
+
+
+class SensitivityParameter:
+    """The plant parameter a column of the sensitivity data perturbs."""
+
+    def __init__(self, parameter, mode, label, costs_only=False):
+        if parameter not in BATCH_PARAMETERS:
+            raise ValueError(
+                f"Parameter needs to be one of {BATCH_PARAMETERS}, got {parameter}."
+            )
+        if mode not in SENSITIVITY_MODES:
+            raise ValueError(
+                f"Mode needs to be one of {SENSITIVITY_MODES}, got {mode}."
+            )
+        self.parameter = parameter
+        self.mode = mode
+        # name of the parameter in the results and charts
+        self.label = label
+        # perturb the cost items only, the discounted output being that of the
+        # base parameters
+        self.costs_only = costs_only
+
+    def perturb(self, base, values):
+        """The parameter at the column values, from its base values."""
+        values = values if self.mode == ABSOLUTE else base * values
+        if self.parameter in INTEGER_PARAMETERS:
+            values = np.asarray(values).astype(int)
+
+        return values
+
+
+# sensitivity data columns, in the order of the charts
+SENSITIVITY_PARAMETERS = {
+    "discount_rate": SensitivityParameter("discount_rate", ABSOLUTE, "Discount rate"),
+    "capacity_factor": SensitivityParameter("capacity_factor", ABSOLUTE, "Load factor"),
+    "operational_lifetime": SensitivityParameter(
+        "operational_lifetime_years", MULTIPLIER, "Lifetime", costs_only=True
+    ),
+    "fuel_cost": SensitivityParameter("fuel_cost_per_tLNG", MULTIPLIER, "Fuel costs"),
+    "carbon_cost": SensitivityParameter(
+        "carbon_cost_per_tCO2e", MULTIPLIER, "Carbon costs"
+    ),
+    "efficiency_rate": SensitivityParameter(
+        "efficiency_rate", ABSOLUTE, "Efficiency rate"
+    ),
+    "exchange_rate": SensitivityParameter("exchange_rate", MULTIPLIER, "Exchange rate"),
+}
+
+
+def sensitivity_parameter(column):
+    """The SensitivityParameter of a column of the sensitivity data."""
+    if column not in SENSITIVITY_PARAMETERS:
+        raise ValueError(
+            f"Unknown sensitivity {column}, expected one of "
+            f"{list(SENSITIVITY_PARAMETERS)}."
+        )
+
+    return SENSITIVITY_PARAMETERS[column]
+
+
+def sensitivity_labels(sensitivities):
+    """Labels of the sensitivity columns, in the order of the charts."""
+    return [
+        sensitivity.label
+        for column, sensitivity in SENSITIVITY_PARAMETERS.items()
+        if column in sensitivities
+    ]
+
+
+def _sweep_blocks(plants, scenarios, sensitivities):
+    """
+    Blocks of rows of the sweep in the order of the results, as (plant
+    index, scenario name, capacity factor, column): per plant, the capacity
+    factor sweep, then every other column in every scenario.
+    """
+    sweeps_capacity_factor = {
+        column: sensitivity_parameter(column).parameter == "capacity_factor"
+        for column in sensitivities
+    }
+    for plant_index in range(len(plants)):
+        for column, replaces_scenario in sweeps_capacity_factor.items():
+            if replaces_scenario:
+                yield plant_index, ALL_SCENARIOS, np.nan, column
+        for scenario, cf in scenarios.items():
+            for column, replaces_scenario in sweeps_capacity_factor.items():
+                if not replaces_scenario:
+                    yield plant_index, scenario, cf, column
+
+
+def evaluate_lcoe_sensitivities(
+    plants, scenarios, sensitivities, decimals=2, escalations=None
+):
+    """
+    LCOE of every plant at every value of every sensitivity column.
+
+    Args:
+        plants (dict): Plant parameters keyed by plant name.
+        scenarios (dict): Capacity factor keyed by scenario name.
+        sensitivities (dict): Values keyed by column of SENSITIVITY_PARAMETERS.
+        decimals (int, optional): Rounding of the LCOE, None to keep the
+        unrounded value.
+        escalations (dict, optional): Escalation keyed by cost item name.
+
+    Returns:
+        dict: One value per row keyed "Power Plant", "Scenario", "Parameter"
+        (the label of the column), "Value" (the column value) and "LCOE".
+    """
+    plant_names = list(plants)
+    blocks = list(_sweep_blocks(plants, scenarios, sensitivities))
+    if not blocks:
+        return {
+            name: np.empty(0, dtype=object)
+            for name in ("Power Plant", "Scenario", "Parameter", "Value", "LCOE")
+        }
+    columns = [column for _, _, _, column in blocks]
+    sizes = [len(sensitivities[column]) for column in columns]
+
+    def rows(field):
+        return np.repeat([block[field] for block in blocks], sizes)
+
+    # base parameters of the plant and scenario of every row
+    plant_index = rows(0).astype(int)
+    base = {
+        parameter: np.array(
+            [plants[plant][parameter] for plant in plant_names],
+            dtype=int if parameter in INTEGER_PARAMETERS else float,
+        )[plant_index]
+        for parameter in BATCH_PARAMETERS
+        if parameter != "capacity_factor"
+    }
+    base["capacity_factor"] = rows(2).astype(float)
+    values = np.array(
+        [value for column in columns for value in sensitivities[column]],
+        dtype=float,
+    )
+
+    params = {parameter: array.copy() for parameter, array in base.items()}
+    costs_only = np.zeros(len(values), dtype=bool)
+    start = 0
+    for column, size in zip(columns, sizes):
+        sensitivity = SENSITIVITY_PARAMETERS[column]
+        block = slice(start, start + size)
+        params[sensitivity.parameter][block] = sensitivity.perturb(
+            base[sensitivity.parameter][block], values[block]
+        )
+        costs_only[block] = sensitivity.costs_only
+        start += size
+
+    cost_items = evaluate_cost_items_batch(params, escalations=escalations)
+    revenue = cost_items.pop("Revenue")
+    if costs_only.any():
+        revenue[costs_only] = evaluate_cost_items_batch(
+            {parameter: array[costs_only] for parameter, array in base.items()},
+            escalations=escalations,
+        )["Revenue"]
+    lcoe = sum(cost_items.values()) / revenue * base["exchange_rate"] / THOUSAND
+
+    return {
+        "Power Plant": np.asarray(plant_names, dtype=object)[plant_index],
+        "Scenario": rows(1).astype(object),
+        "Parameter": np.repeat(
+            [SENSITIVITY_PARAMETERS[column].label for column in columns], sizes
+        ).astype(object),
+        "Value": values,
+        "LCOE": lcoe if decimals is None else np.round(lcoe, decimals),
+    }
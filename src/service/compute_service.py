@@ -0,0 +1,338 @@
+"""
+Local HTTP compute service for the LNG2P models.
+
+Run it from the repository root with:
+
+    python -m src.service.compute_service --port 8765 --workers 4
+
+Every batch endpoint takes a POST with a JSON body {"records": [...]}, each
+record holding the plant parameters used in data/plant_parameters.csv (keyed
+as in load_plant_data) and a capacity_factor, and returns columnar results
+with one value per record:
+
+    POST /lcoe/batch        {"lcoe": [...]}
+    POST /cost-items/batch  {"CAPEX": [...], "FO&M": [...], ...}
+    POST /demand/batch      {"output_mwh": [...], "pj": [...], "mtpa": [...]}
+    POST /emissions/batch   {"mtco2e": [...]}
+    GET  /health            {"status": "ok"}
+
+Requests are handled asynchronously. The records of a batch are checked and
+typed once, as a PlantBatch and its capacity factors, and their columns are
+split into chunks of rows evaluated with the vectorised batch model in a pool
+of worker processes (or threads), so a large batch does not block other
+requests.
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from src.models.batch_lcoe_model import evaluate_cost_items_batch, evaluate_lcoe_batch
+from src.models.lng_demand_model import (
+    electricity_demand_pj,
+    electricity_demand_pj_mtco2e,
+    electricity_output_mwh,
+    feedstock_demand_mtpa,
+)
+from src.models.plant_parameters import PlantBatch
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+BATCH_CHUNK_SIZE = 256
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class BadRequestError(Exception):
+    """Raised when a request cannot be parsed or is missing data."""
+
+
+def batch_columns(records):
+    """
+    Check the records of a request as a whole and gather them in columns.
+
+    Args:
+        records (list): Dicts of the plant parameters and a capacity_factor.
+
+    Returns:
+        dict: A typed array per parameter of BATCH_PARAMETERS, one value per
+        record.
+
+    Raises:
+        BadRequestError: If a record is not a dict, or a plant parameter or
+        the capacity_factor is missing or invalid, naming the offending
+        records by index.
+    """
+    names = [f"Record {index}" for index in range(len(records))]
+    try:
+        columns = dict(PlantBatch.from_records(records, names).columns)
+    except ValueError as error:
+        raise BadRequestError(str(error))
+
+    missing = [
+        name for name, record in zip(names, records) if "capacity_factor" not in record
+    ]
+    if missing:
+        raise BadRequestError(f"capacity_factor is missing from {', '.join(missing)}.")
+    try:
+        capacity_factor = np.asarray(
+            [record["capacity_factor"] for record in records], dtype=float
+        )
+    except (TypeError, ValueError):
+        raise BadRequestError("capacity_factor needs to be numeric.")
+    # the LCOE divides by the electricity output, so zero is rejected too
+    with np.errstate(invalid="ignore"):
+        invalid = ~np.isfinite(capacity_factor) | ~(capacity_factor > 0)
+    if invalid.any():
+        raise BadRequestError(
+            "Invalid capacity factors: "
+            + "; ".join(
+                f"{names[index]}: capacity_factor is {capacity_factor[index]:g}, "
+                "needs to be above 0"
+                for index in np.flatnonzero(invalid)
+            )
+            + "."
+        )
+    columns["capacity_factor"] = capacity_factor
+
+    return columns
+
+
+## batch computations, run in the worker pool
+
+
+def compute_lcoe_batch(params):
+    """LCOE (R/kWh) of every row of the batch columns."""
+    return {"lcoe": evaluate_lcoe_batch(params).tolist()}
+
+
+def compute_cost_items_batch(params):
+    """Discounted cost items (R) of every row, one column per cost item."""
+    discounted_cost_items = evaluate_cost_items_batch(params)
+    del discounted_cost_items["Revenue"]
+
+    return {
+        cost_item: discounted_costs.tolist()
+        for cost_item, discounted_costs in discounted_cost_items.items()
+    }
+
+
+def compute_demand_batch(params):
+    """Electricity output (MWh/year and PJ/year) and LNG demand (MTPA)."""
+    installed_capacity_mw = params["installed_capacity_mw"]
+    capacity_factor = params["capacity_factor"]
+
+    return {
+        "output_mwh": electricity_output_mwh(
+            installed_capacity_mw, capacity_factor
+        ).tolist(),
+        "pj": electricity_demand_pj(installed_capacity_mw, capacity_factor).tolist(),
+        "mtpa": feedstock_demand_mtpa(
+            installed_capacity_mw, capacity_factor, params["efficiency_rate"]
+        ).tolist(),
+    }
+
+
+def compute_emissions_batch(params):
+    """Greenhouse gas emissions (MtCO2e/year) of every row."""
+    return {
+        "mtco2e": electricity_demand_pj_mtco2e(
+            params["installed_capacity_mw"],
+            params["capacity_factor"],
+            params["emission_factor_mtco2e_per_pj"],
+        ).tolist()
+    }
+
+
+BATCH_ENDPOINTS = {
+    "/lcoe/batch": compute_lcoe_batch,
+    "/cost-items/batch": compute_cost_items_batch,
+    "/demand/batch": compute_demand_batch,
+    "/emissions/batch": compute_emissions_batch,
+}
+
+
+## HTTP handling
+
+
+class ComputeService:
+    """
+    Asynchronous HTTP server dispatching batch computations to a worker pool.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free port.
+        workers (int, optional): Size of the worker pool.
+        executor (str): "process" for a process pool (CPU-bound batches run in
+        parallel) or "thread" for a thread pool.
+        chunk_size (int): Number of records evaluated per worker task.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8765,
+        workers=None,
+        executor="process",
+        chunk_size=BATCH_CHUNK_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.executor_kind = executor
+        self.chunk_size = chunk_size
+        self.executor = None
+        self.server = None
+
+    async def start(self):
+        if self.executor_kind == "process":
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        elif self.executor_kind == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        else:
+            raise ValueError(f"Unknown executor: {self.executor_kind}.")
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def run_batch(self, compute_batch, columns):
+        """Split the columns in chunks of rows, evaluate them in the pool and merge."""
+        loop = asyncio.get_running_loop()
+        num_rows = len(columns["capacity_factor"])
+        chunks = [
+            {
+                parameter: values[index : index + self.chunk_size]
+                for parameter, values in columns.items()
+            }
+            for index in range(0, num_rows, self.chunk_size)
+        ]
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(self.executor, compute_batch, chunk)
+                for chunk in chunks
+            ]
+        )
+
+        columns = {}
+        for result in results:
+            for column, values in result.items():
+                columns.setdefault(column, []).extend(values)
+
+        return columns
+
+    async def handle_request(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET."}
+            return 200, {"status": "ok"}
+
+        compute_batch = BATCH_ENDPOINTS.get(path)
+        if compute_batch is None:
+            return 404, {"error": f"Unknown endpoint {path}."}
+        if method != "POST":
+            return 405, {"error": "Use POST."}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise BadRequestError("Request body is not valid JSON.")
+        records = payload.get("records") if isinstance(payload, dict) else None
+        if not isinstance(records, list):
+            raise BadRequestError('Request body needs a "records" list.')
+        # check the whole batch up front, so a bad record is reported by index
+        # rather than failing in a worker
+        return 200, await self.run_batch(compute_batch, batch_columns(records))
+
+    async def handle_connection(self, reader, writer):
+        try:
+            try:
+                status, response = await self.handle_request(
+                    *await self.read_request(reader)
+                )
+            except BadRequestError as error:
+                status, response = 400, {"error": str(error)}
+            except Exception as error:
+                status, response = 500, {"error": str(error)}
+            await self.write_response(writer, status, response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise BadRequestError("Malformed request line.")
+        method, target, _ = request_line
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            content_length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise BadRequestError("Content-Length needs to be an integer.")
+        if content_length < 0:
+            raise BadRequestError("Content-Length cannot be negative.")
+        if content_length > MAX_REQUEST_BYTES:
+            raise BadRequestError("Request body is too large.")
+        body = await reader.readexactly(content_length) if content_length else b""
+
+        return method.upper(), target.split("?", 1)[0], body
+
+    async def write_response(self, writer, status, response):
+        body = json.dumps(response).encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LNG2P compute service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--executor", choices=("process", "thread"), default="process")
+    args = parser.parse_args()
+
+    service = ComputeService(args.host, args.port, args.workers, args.executor)
+    asyncio.run(service.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
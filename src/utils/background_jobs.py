@@ -0,0 +1,149 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+MAX_FINISHED_JOBS = 100
+
+
+class Job:
+    """
+    A background job made of a list of tasks, run one after the other in a
+    worker thread. The results of finished tasks are available while the job
+    is still running, and the job can be cancelled between two tasks.
+    """
+
+    def __init__(self, tasks, key=None):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = PENDING
+        self.error = None
+        self.total = len(tasks)
+        self._tasks = tasks
+        self._results = []
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    def run(self):
+        with self._lock:
+            if self._cancelled.is_set():
+                self.status = CANCELLED
+                self._finished.set()
+                return
+            self.status = RUNNING
+        try:
+            for task in self._tasks:
+                if self._cancelled.is_set():
+                    break
+                result = task()
+                with self._lock:
+                    self._results.append(result)
+            with self._lock:
+                self.status = CANCELLED if self._cancelled.is_set() else COMPLETED
+        except Exception as error:
+            with self._lock:
+                self.status = FAILED
+                self.error = error
+        finally:
+            self._tasks = None
+            self._finished.set()
+
+    def cancel(self):
+        """Ask the job to stop before its next task."""
+        self._cancelled.set()
+
+    def done(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the job to finish. Returns True if it did."""
+        return self._finished.wait(timeout)
+
+    @property
+    def completed(self):
+        with self._lock:
+            return len(self._results)
+
+    @property
+    def progress(self):
+        """Fraction of the tasks completed."""
+        return self.completed / self.total if self.total else 1.0
+
+    def results(self):
+        """Results of the tasks completed so far, in task order."""
+        with self._lock:
+            return list(self._results)
+
+
+class JobManager:
+    """
+    Runs background jobs in a pool of worker threads and keeps track of them by
+    job id, so that a Streamlit rerun can poll a job submitted earlier.
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lng2p-job"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, tasks, key=None):
+        """
+        Submit a job.
+
+        Args:
+            tasks (list): Callables without arguments, run in order.
+            key (optional): Identifies the inputs of the job, e.g. a hash of
+            the parameters it evaluates.
+
+        Returns:
+            Job: The submitted job.
+        """
+        job = Job(tasks, key)
+        with self._lock:
+            self._prune_finished_jobs()
+            self._jobs[job.id] = job
+        self._executor.submit(job.run)
+
+        return job
+
+    def get(self, job_id):
+        """The job with the given id, or None if it is unknown."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find(self, key):
+        """The most recent job submitted with the given key, or None."""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.key == key]
+        return jobs[-1] if jobs else None
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def _prune_finished_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done()]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """The job manager shared by all sessions of the app process."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
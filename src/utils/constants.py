@@ -7,6 +7,13 @@ THOUSAND = 1000
 MILLION = 1000000
 BILLION = 1000000000
 
+# Default carbon budget of the fleet emission pathways (MtCO2e).
+DEFAULT_CARBON_BUDGET_MTCO2E = 1000.0
+
+# Point budget of a WebGL sensitivity figure, shared between all its series.
+MAX_SENSITIVITY_FIGURE_POINTS = 20000
+MIN_POINTS_PER_SERIES = 3
+
 
 # Define data labels
 def parameter_labels():
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def lttb_downsample(x, y, threshold):
+    """
+    Reduce a series to a bounded number of points with the
+    Largest-Triangle-Three-Buckets (LTTB) algorithm.
+
+    The first and last points are always kept. The points in between are split
+    into threshold - 2 buckets and from each bucket the point forming the
+    largest triangle with the previously selected point and the average of the
+    next bucket is kept, which preserves the visual shape of the curve.
+
+    Args:
+        x (array-like): x values of the series.
+        y (array-like): y values of the series.
+        threshold (int): Maximum number of points to keep.
+
+    Returns:
+        tuple: (x, y) numpy arrays with at most threshold points, sorted by x.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) != len(y):
+        raise ValueError("x and y need to have the same number of points.")
+
+    num_points = len(x)
+    if threshold >= num_points or threshold < 3:
+        return x, y
+
+    order = np.argsort(x, kind="stable")
+    x = x[order]
+    y = y[order]
+
+    # bucket boundaries of the points between the first and the last one
+    edges = np.floor(np.arange(threshold - 1) * (num_points - 2) / (threshold - 2))
+    edges = edges.astype(int) + 1
+    edges[-1] = num_points - 1
+
+    # average point of every bucket, plus the last point acting as a bucket
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[1:-1], edges[:-1] - 1) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[1:-1], edges[:-1] - 1) / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = num_points - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        area = np.abs(
+            (x[a] - avg_x[bucket + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[bucket + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+
+    return x[selected], y[selected]
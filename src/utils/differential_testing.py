@@ -0,0 +1,574 @@
+"""
+Differential testing of the accelerated evaluation paths against the
+reference scalar model (calculate_lcoe, discount_cash_flows and
+feedstock_demand_mtpa).
+
+Plant parameter sets and cost escalations are drawn at random across realistic
+ranges; every path evaluates them and its results are compared with the
+reference within the path's stated tolerance, next to its speedup. Run a report with:
+
+    python -m src.utils.differential_testing --plants 500 --seed 0
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.batch_lcoe_model import (
+    FLOAT32_RELATIVE_ERROR_BOUND,
+    batch_parameters,
+    evaluate_cost_items_batch,
+    evaluate_demand_batch,
+    evaluate_lcoe_batch,
+)
+from src.models.compiled_lcoe_model import compile_plants
+from src.models.dispatch_model import compute_dispatch_lcoe
+from src.models.escalation import ConstantEscalation, StepEscalation
+from src.models.fleet_demand_model import fleet_scenario_demands
+from src.models.lcoe_gradients import lcoe_gradients
+from src.models.lcoe_model import (
+    calculate_unrounded_lcoe,
+    create_cash_flow,
+    create_cost_items,
+    discount_cash_flows,
+    end_of_operation_period,
+    roll_cost_items,
+    start_of_operation_period,
+)
+from src.models.lng_demand_model import electricity_output_mwh, feedstock_demand_mtpa
+from src.models.scenario_store import CASH_FLOW_INPUTS, discounted_cash_flow
+from src.utils.constants import HOURS_IN_YEAR, PRESENT_YEAR
+
+# (low, high) ranges of the random plant parameters
+PARAMETER_RANGES = {
+    "installed_capacity_mw": (50.0, 4000.0),
+    "construction_duration_years": (1, 6),
+    "overnight_capex_per_kw": (400.0, 3000.0),
+    "operational_lifetime_years": (15, 60),
+    "foam_cost_factor": (0.0, 0.05),
+    "voam_cost_per_mwh": (2.0, 15.0),
+    "fuel_cost_per_tLNG": (50.0, 200.0),
+    "carbon_cost_per_tCO2e": (0.0, 100.0),
+    "decommissioning_duration_years": (1, 15),
+    "capex_contingency_factor": (0.0, 0.3),
+    "decommissioning_cost_factor": (0.0, 0.3),
+    "efficiency_rate": (0.3, 0.65),
+    "emission_factor_mtco2e_per_pj": (0.04, 0.1),
+    "discount_rate": (0.01, 0.25),
+    "exchange_rate": (10.0, 25.0),
+}
+# scenario capacity factors are drawn in percent, as used by the dashboard
+CAPACITY_FACTOR_RANGE = (1.0, 100.0)
+# (low, high) ranges of the random escalation growth rates and step multipliers
+ESCALATION_GROWTH_RANGE = (-0.03, 0.08)
+ESCALATION_STEP_RANGE = (0.5, 3.0)
+
+COST_ITEMS = ["CAPEX", "FO&M", "VO&M", "Fuel", "Carbon", "Decommissioning"]
+
+# relative tolerance of float64 paths, which only differ from the reference
+# by the order of their floating point operations.
+FLOAT64_RELATIVE_TOLERANCE = 1e-12
+
+
+def random_plants(rng, num_plants):
+    """
+    Random plant parameter sets.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        num_plants (int): Number of plants.
+
+    Returns:
+        dict: Plant parameters keyed by plant name, as load_plant_data.
+    """
+    columns = {}
+    for parameter, (low, high) in PARAMETER_RANGES.items():
+        if isinstance(low, int):
+            columns[parameter] = rng.integers(low, high, num_plants, endpoint=True)
+        else:
+            columns[parameter] = rng.uniform(low, high, num_plants)
+
+    return {
+        f"Plant {index}": {
+            parameter: (
+                int(values[index])
+                if isinstance(PARAMETER_RANGES[parameter][0], int)
+                else float(values[index])
+            )
+            for parameter, values in columns.items()
+        }
+        for index in range(num_plants)
+    }
+
+
+def random_scenarios(rng, num_scenarios=3):
+    """Random capacity factors (percent) keyed by scenario name."""
+    return {
+        f"Scenario {index}": float(value)
+        for index, value in enumerate(
+            rng.uniform(*CAPACITY_FACTOR_RANGE, num_scenarios)
+        )
+    }
+
+
+def random_escalations(rng, num_steps=3):
+    """
+    Random cost escalations: a constant growth rate of the CAPEX, Fuel and
+    Decommissioning costs and a step schedule of the FO&M and Carbon costs,
+    with steps across the plant timelines. VO&M is left unescalated.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        num_steps (int): Number of steps of each step schedule.
+
+    Returns:
+        dict: Escalation keyed by cost item name, as load_escalation_data.
+    """
+    last_year = PRESENT_YEAR + sum(
+        PARAMETER_RANGES[parameter][1]
+        for parameter in (
+            "construction_duration_years",
+            "operational_lifetime_years",
+            "decommissioning_duration_years",
+        )
+    )
+    escalations = {}
+    for item in ("CAPEX", "Fuel", "Decommissioning"):
+        escalations[item] = ConstantEscalation(
+            float(rng.uniform(*ESCALATION_GROWTH_RANGE))
+        )
+    for item in ("FO&M", "Carbon"):
+        step_years = rng.choice(
+            np.arange(PRESENT_YEAR, last_year), num_steps, replace=False
+        )
+        escalations[item] = StepEscalation(
+            {
+                int(year): float(rng.uniform(*ESCALATION_STEP_RANGE))
+                for year in step_years
+            }
+        )
+
+    return escalations
+
+
+def _plant_cost_items(characteristics, capacity_factor, escalations=None):
+    return roll_cost_items(
+        characteristics["installed_capacity_mw"],
+        characteristics["construction_duration_years"],
+        characteristics["operational_lifetime_years"],
+        characteristics["decommissioning_duration_years"],
+        characteristics["overnight_capex_per_kw"],
+        characteristics["capex_contingency_factor"],
+        characteristics["foam_cost_factor"],
+        characteristics["voam_cost_per_mwh"],
+        characteristics["fuel_cost_per_tLNG"],
+        characteristics["carbon_cost_per_tCO2e"],
+        characteristics["decommissioning_cost_factor"],
+        capacity_factor,
+        characteristics["emission_factor_mtco2e_per_pj"],
+        characteristics["efficiency_rate"],
+        characteristics["exchange_rate"],
+        escalations,
+    )
+
+
+## reference scalar model
+
+
+def reference_cost_items(plants, scenarios, escalations=None):
+    """
+    Discounted cost items from discount_cash_flows, (scenarios, plants), with
+    optional cost escalations as in roll_cost_items.
+    """
+    items = {item: [] for item in COST_ITEMS}
+    for capacity_factor in scenarios.values():
+        row = {item: [] for item in COST_ITEMS}
+        for characteristics in plants.values():
+            discounted = discount_cash_flows(
+                create_cost_items(
+                    _plant_cost_items(characteristics, capacity_factor, escalations)
+                ),
+                characteristics["discount_rate"],
+                PRESENT_YEAR,
+            )
+            for item in COST_ITEMS:
+                row[item].append(discounted[item])
+        for item in COST_ITEMS:
+            items[item].append(row[item])
+
+    return {item: np.asarray(values) for item, values in items.items()}
+
+
+def reference_lcoe(plants, scenarios, escalations=None):
+    """
+    LCOE of calculate_lcoe before its rounding (calculate_unrounded_lcoe),
+    (scenarios, plants), so that paths are compared without rounding-boundary
+    noise. Optional cost escalations apply as in roll_cost_items.
+    """
+    lcoe = []
+    for capacity_factor in scenarios.values():
+        row = []
+        for characteristics in plants.values():
+            construction_duration = characteristics["construction_duration_years"]
+            revenue_item = create_cash_flow(
+                (
+                    start_of_operation_period(construction_duration),
+                    end_of_operation_period(
+                        construction_duration,
+                        characteristics["operational_lifetime_years"],
+                    ),
+                    electricity_output_mwh(
+                        characteristics["installed_capacity_mw"], capacity_factor
+                    ),
+                )
+            )
+            cost_items = create_cost_items(
+                _plant_cost_items(characteristics, capacity_factor, escalations)
+            )
+            row.append(
+                calculate_unrounded_lcoe(
+                    revenue_item,
+                    cost_items,
+                    characteristics["discount_rate"],
+                    characteristics["exchange_rate"],
+                    PRESENT_YEAR,
+                )
+            )
+        lcoe.append(row)
+
+    return np.asarray(lcoe)
+
+
+def reference_demand(plants, scenarios):
+    """LNG demand (MTPA) of feedstock_demand_mtpa, (scenarios, plants)."""
+    return np.asarray(
+        [
+            [
+                feedstock_demand_mtpa(
+                    characteristics["installed_capacity_mw"],
+                    capacity_factor / 100.0,
+                    characteristics["efficiency_rate"],
+                )
+                for characteristics in plants.values()
+            ]
+            for capacity_factor in scenarios.values()
+        ]
+    )
+
+
+## accelerated paths
+
+
+def _stack_items(items, shape):
+    return np.stack([np.reshape(items[item], shape) for item in COST_ITEMS])
+
+
+def _capacity_factors(scenarios):
+    return np.asarray(list(scenarios.values()))[:, None]
+
+
+def compiled_lcoe_path(plants, scenarios, escalations=None):
+    return compile_plants(plants, escalations).lcoe(
+        _capacity_factors(scenarios), decimals=None
+    )
+
+
+def lcoe_curves_path(plants, scenarios, escalations=None):
+    return compile_plants(plants, escalations).lcoe_curves(list(scenarios.values()))
+
+
+def compiled_cost_items_path(plants, scenarios, escalations=None):
+    items = compile_plants(plants, escalations).discounted_cost_items(
+        _capacity_factors(scenarios)
+    )
+    shape = (len(scenarios), len(plants))
+    # capital cost items do not depend on the capacity factor
+    return _stack_items(
+        {item: np.broadcast_to(values, shape) for item, values in items.items()},
+        shape,
+    )
+
+
+def batch_lcoe_path(plants, scenarios, escalations=None, dtype=np.float64):
+    lcoe = evaluate_lcoe_batch(
+        batch_parameters(plants, scenarios),
+        dtype=dtype,
+        escalations=escalations,
+        decimals=None,
+    )
+    return lcoe.reshape(len(scenarios), len(plants))
+
+
+def batch_float32_lcoe_path(plants, scenarios):
+    return batch_lcoe_path(plants, scenarios, dtype=np.float32)
+
+
+def batch_cost_items_path(plants, scenarios, escalations=None):
+    items = evaluate_cost_items_batch(
+        batch_parameters(plants, scenarios), escalations=escalations
+    )
+    return _stack_items(items, (len(scenarios), len(plants)))
+
+
+def gradient_lcoe_path(plants, scenarios, escalations=None):
+    return lcoe_gradients(plants, scenarios, escalations)[0]
+
+
+def scenario_store_cost_items_path(plants, scenarios, escalations=None):
+    # timed without the cash flows cached by earlier runs
+    discounted_cash_flow.cache_clear()
+    items = {item: [] for item in COST_ITEMS}
+    for capacity_factor in scenarios.values():
+        for characteristics in plants.values():
+            parameters = {**characteristics, "capacity_factor": capacity_factor}
+            for item in COST_ITEMS:
+                items[item].append(
+                    discounted_cash_flow(
+                        item,
+                        tuple(parameters[name] for name in CASH_FLOW_INPUTS[item]),
+                        (escalations or {}).get(item),
+                    )
+                )
+    return _stack_items(items, (len(scenarios), len(plants)))
+
+
+def fleet_demand_path(plants, scenarios):
+    _, mtpa = fleet_scenario_demands(
+        [plants[plant]["installed_capacity_mw"] for plant in plants],
+        [plants[plant]["efficiency_rate"] for plant in plants],
+        [capacity_factor / 100.0 for capacity_factor in scenarios.values()],
+    )
+    return mtpa
+
+
+def batch_demand_path(plants, scenarios):
+    # every row is its own group; its demand over the horizon peaks at its
+    # steady-state annual demand.
+    params = batch_parameters(
+        plants,
+        {scenario: value / 100.0 for scenario, value in scenarios.items()},
+    )
+    num_rows = len(plants) * len(scenarios)
+    last_year = PRESENT_YEAR + max(
+        plant["construction_duration_years"] for plant in plants.values()
+    )
+    demand = evaluate_demand_batch(
+        params, PRESENT_YEAR, last_year, groups=np.arange(num_rows)
+    )
+    return demand["MTPA"].max(axis=1).reshape(len(scenarios), len(plants))
+
+
+def dispatch_demand_path(plants, scenarios):
+    # a flat hourly profile at the scenario capacity factor reproduces the
+    # capacity-factor model.
+    mtpa = []
+    for capacity_factor in scenarios.values():
+        profile = np.full(HOURS_IN_YEAR, capacity_factor / 100.0)
+        dispatch = compute_dispatch_lcoe(plants, {plant: profile for plant in plants})
+        mtpa.append([dispatch[plant]["mtpa"] for plant in plants])
+    return np.asarray(mtpa)
+
+
+# name: (path, reference, relative tolerance, escalated); escalated paths and
+# their reference are evaluated with random cost escalations.
+PATHS = {
+    "Compiled LCOE": (compiled_lcoe_path, "lcoe", FLOAT64_RELATIVE_TOLERANCE, False),
+    "LCOE curves": (lcoe_curves_path, "lcoe", FLOAT64_RELATIVE_TOLERANCE, False),
+    "Compiled cost items": (
+        compiled_cost_items_path,
+        "cost_items",
+        FLOAT64_RELATIVE_TOLERANCE,
+        False,
+    ),
+    "Batch float64 LCOE": (batch_lcoe_path, "lcoe", FLOAT64_RELATIVE_TOLERANCE, False),
+    "Batch float32 LCOE": (
+        batch_float32_lcoe_path,
+        "lcoe",
+        FLOAT32_RELATIVE_ERROR_BOUND,
+        False,
+    ),
+    "Batch cost items": (
+        batch_cost_items_path,
+        "cost_items",
+        FLOAT64_RELATIVE_TOLERANCE,
+        False,
+    ),
+    "Gradient closed form LCOE": (
+        gradient_lcoe_path,
+        "lcoe",
+        FLOAT64_RELATIVE_TOLERANCE,
+        False,
+    ),
+    "Scenario store cost items": (
+        scenario_store_cost_items_path,
+        "cost_items",
+        0.0,
+        False,
+    ),
+    "Escalated compiled LCOE": (
+        compiled_lcoe_path,
+        "lcoe",
+        FLOAT64_RELATIVE_TOLERANCE,
+        True,
+    ),
+    "Escalated LCOE curves": (
+        lcoe_curves_path,
+        "lcoe",
+        FLOAT64_RELATIVE_TOLERANCE,
+        True,
+    ),
+    "Escalated compiled cost items": (
+        compiled_cost_items_path,
+        "cost_items",
+        FLOAT64_RELATIVE_TOLERANCE,
+        True,
+    ),
+    "Escalated batch LCOE": (
+        batch_lcoe_path,
+        "lcoe",
+        FLOAT64_RELATIVE_TOLERANCE,
+        True,
+    ),
+    "Escalated batch cost items": (
+        batch_cost_items_path,
+        "cost_items",
+        FLOAT64_RELATIVE_TOLERANCE,
+        True,
+    ),
+    "Escalated gradient closed form LCOE": (
+        gradient_lcoe_path,
+        "lcoe",
+        FLOAT64_RELATIVE_TOLERANCE,
+        True,
+    ),
+    "Escalated scenario store cost items": (
+        scenario_store_cost_items_path,
+        "cost_items",
+        0.0,
+        True,
+    ),
+    "Fleet demand": (fleet_demand_path, "demand", FLOAT64_RELATIVE_TOLERANCE, False),
+    "Batch demand": (batch_demand_path, "demand", FLOAT64_RELATIVE_TOLERANCE, False),
+    # hourly values summed over 8760 hours
+    "Hourly dispatch demand": (dispatch_demand_path, "demand", 1e-11, False),
+}
+
+REFERENCES = {
+    "lcoe": reference_lcoe,
+    "cost_items": lambda plants, scenarios, escalations=None: _stack_items(
+        reference_cost_items(plants, scenarios, escalations),
+        (len(scenarios), len(plants)),
+    ),
+    "demand": reference_demand,
+}
+
+
+def _timed(function, *args, repeats=1):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def relative_error(values, reference):
+    """
+    Largest relative error of values against reference. Reference values
+    near zero (below 1e-12 of the largest one) are compared to that floor.
+    """
+    values = np.asarray(values, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    floor = max(np.max(np.abs(reference), initial=0.0) * 1e-12, np.finfo(float).tiny)
+    return float(
+        np.max(np.abs(values - reference) / np.maximum(np.abs(reference), floor))
+    )
+
+
+def run_differential_tests(
+    num_plants=200, num_scenarios=3, seed=0, paths=None, repeats=1
+):
+    """
+    Compare accelerated paths with the reference model on random plants.
+
+    Args:
+        num_plants (int): Number of random plants.
+        num_scenarios (int): Number of random scenarios.
+        seed (int): Seed of the random generator.
+        paths (list, optional): Names of the PATHS to run, all by default.
+        repeats (int): Timing repeats; the best time is reported.
+
+    Returns:
+        list: One dict per path with its name, tolerance, relative error,
+        passed flag, path and reference seconds, and speedup.
+    """
+    rng = np.random.default_rng(seed)
+    plants = random_plants(rng, num_plants)
+    scenarios = random_scenarios(rng, num_scenarios)
+    escalations = random_escalations(rng)
+
+    references = {}
+    results = []
+    for name in paths or PATHS:
+        path, reference_name, tolerance, escalated = PATHS[name]
+        inputs = (plants, scenarios, escalations) if escalated else (plants, scenarios)
+        if (reference_name, escalated) not in references:
+            references[reference_name, escalated] = _timed(
+                REFERENCES[reference_name], *inputs, repeats=repeats
+            )
+        reference, reference_seconds = references[reference_name, escalated]
+        values, path_seconds = _timed(path, *inputs, repeats=repeats)
+        error = relative_error(values, reference)
+        results.append(
+            {
+                "path": name,
+                "tolerance": tolerance,
+                "relative_error": error,
+                "passed": error <= tolerance,
+                "path_seconds": path_seconds,
+                "reference_seconds": reference_seconds,
+                "speedup": reference_seconds / path_seconds,
+            }
+        )
+
+    return results
+
+
+def format_report(results):
+    """Plain text table of run_differential_tests results."""
+    lines = [
+        f"{'Path':<38}{'Rel. error':>12}{'Tolerance':>12}{'Path s':>10}"
+        f"{'Ref. s':>10}{'Speedup':>10}  Result"
+    ]
+    for result in results:
+        lines.append(
+            f"{result['path']:<38}{result['relative_error']:>12.2e}"
+            f"{result['tolerance']:>12.0e}{result['path_seconds']:>10.4f}"
+            f"{result['reference_seconds']:>10.4f}{result['speedup']:>9.1f}x  "
+            + ("ok" if result["passed"] else "FAILED")
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the accelerated paths with the reference model."
+    )
+    parser.add_argument("--plants", type=int, default=200)
+    parser.add_argument("--scenarios", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run_differential_tests(
+        args.plants, args.scenarios, args.seed, repeats=args.repeats
+    )
+    print(format_report(results))
+    if not all(result["passed"] for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
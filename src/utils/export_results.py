@@ -0,0 +1,369 @@
+"""
+Streaming export of the model results to CSV, Parquet or Excel.
+
+A table is an iterable of pandas DataFrame chunks with the same columns. The
+writers consume the chunks one at a time, so only a chunk of a large table
+(e.g. a sensitivity sweep) is held in memory while it is written. Several
+tables are written as a zip archive of CSV or Parquet files, or as the sheets
+of one Excel workbook. Export the results of the csv data in data/ to output/
+from the repository root with:
+
+    python -m src.utils.export_results --format csv
+"""
+
+import argparse
+import copy
+import importlib.util
+import os
+import re
+import tempfile
+import zipfile
+
+EXPORT_FORMATS = {
+    "csv": {"label": "CSV", "extension": "csv", "mime": "text/csv"},
+    "parquet": {
+        "label": "Parquet",
+        "extension": "parquet",
+        "mime": "application/vnd.apache.parquet",
+    },
+    "excel": {
+        "label": "Excel",
+        "extension": "xlsx",
+        "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    },
+}
+
+# rows written per chunk; larger chunks of a table are split.
+EXPORT_CHUNK_ROWS = 100000
+# rows of an Excel sheet, including the header row
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_SHEET_NAME = 31
+
+
+def available_export_formats():
+    """Export formats whose writer package is installed."""
+    return [
+        export_format
+        for export_format in EXPORT_FORMATS
+        if export_format != "excel" or importlib.util.find_spec("openpyxl")
+    ]
+
+
+## tables
+
+
+def _bounded_chunks(chunks, chunk_rows=None):
+    # read at call time, so EXPORT_CHUNK_ROWS can be changed at run time
+    chunk_rows = EXPORT_CHUNK_ROWS if chunk_rows is None else chunk_rows
+    for chunk in chunks:
+        for start in range(0, len(chunk), chunk_rows):
+            yield chunk.iloc[start : start + chunk_rows]
+
+
+def discounted_cost_chunks(plants, scenarios, escalations=None):
+    """Discounted cost item of every plant, one chunk per scenario."""
+    import pandas as pd
+
+    from src.models.results_visualization import compute_discount_cash_flows
+
+    for scenario in scenarios:
+        discounted_costs = compute_discount_cash_flows(
+            plants, scenarios, scenario, escalations
+        )
+        rows = [
+            (scenario, plant, item, cost)
+            for plant, items in discounted_costs.items()
+            for item, cost in items.items()
+        ]
+        yield pd.DataFrame(
+            rows, columns=["Scenario", "Power Plant", "Cost Item", "Discounted Cost"]
+        )
+
+
+def emission_pathway_chunks(plants, scenarios, emission_factors):
+    """Annual emissions of every plant and fuel type, one chunk per scenario."""
+    import numpy as np
+    import pandas as pd
+
+    from src.models.emission_pathways import emission_pathways
+
+    for scenario, capacity_factor in scenarios.items():
+        pathways = emission_pathways(
+            plants, {scenario: capacity_factor}, emission_factors
+        )
+        _, num_plants, num_years, num_carriers = pathways["MtCO2e"].shape
+        yield pd.DataFrame(
+            {
+                "Scenario": scenario,
+                "Power Plant": np.repeat(
+                    pathways["plant_names"], num_years * num_carriers
+                ),
+                "Year": np.tile(np.repeat(pathways["years"], num_carriers), num_plants),
+                "Fuel Type": np.tile(pathways["carriers"], num_plants * num_years),
+                "MtCO2e": pathways["MtCO2e"].ravel(),
+            }
+        )
+
+
+def sensitivity_chunks(plants, scenarios, sensitivities, escalations=None):
+    """LCOE sensitivities, computed and yielded one plant at a time."""
+    from src.models.results_visualization import lcoe_sensitivity_tasks
+
+    for task in lcoe_sensitivity_tasks(plants, scenarios, sensitivities, escalations):
+        yield task()
+
+
+def dashboard_tables(plants, scenarios, emission_factors, escalations=None):
+    """
+    Tables of the dashboard results, keyed by table name. The inputs are
+    copied, and every table is computed lazily while it is written.
+    """
+    from src.models.results_visualization import (
+        compute_demand_scenario_emissions,
+        compute_demand_scenario_projections,
+        compute_scenario_lcoe,
+    )
+
+    plants = copy.deepcopy(plants)
+    scenarios = copy.deepcopy(scenarios)
+    emission_factors = copy.deepcopy(emission_factors)
+    escalations = copy.deepcopy(escalations)
+
+    def demand():
+        yield compute_demand_scenario_projections(plants, scenarios)
+
+    def emissions():
+        yield compute_demand_scenario_emissions(
+            compute_demand_scenario_projections(plants, scenarios), emission_factors
+        )
+
+    def lcoe():
+        yield compute_scenario_lcoe(plants, scenarios, escalations)
+
+    return {
+        "Demand projections": demand,
+        "Emissions": emissions,
+        "Emission pathways": lambda: emission_pathway_chunks(
+            plants, scenarios, emission_factors
+        ),
+        "Discounted costs": lambda: discounted_cost_chunks(
+            plants, scenarios, escalations
+        ),
+        "LCOE": lcoe,
+    }
+
+
+def sensitivity_tables(
+    plants, scenarios, sensitivities, results=None, escalations=None
+):
+    """
+    Tables of the sensitivity analysis. results, the per-plant DataFrames of
+    a finished sweep, are exported as they are instead of being recomputed.
+    """
+    if results is not None:
+        return {"Sensitivities": lambda: iter(list(results))}
+
+    plants = copy.deepcopy(plants)
+    scenarios = copy.deepcopy(scenarios)
+    sensitivities = copy.deepcopy(sensitivities)
+    escalations = copy.deepcopy(escalations)
+
+    return {
+        "Sensitivities": lambda: sensitivity_chunks(
+            plants, scenarios, sensitivities, escalations
+        )
+    }
+
+
+## writers
+
+
+def write_csv(chunks, file):
+    """Write DataFrame chunks to a binary file as one CSV table."""
+    header = True
+    for chunk in _bounded_chunks(chunks):
+        file.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+
+
+def write_parquet(chunks, file):
+    """Write DataFrame chunks to a binary file as one Parquet table."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _bounded_chunks(chunks):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(file, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_excel(tables, file):
+    """
+    Write tables to a binary file as the sheets of one Excel workbook, with
+    openpyxl in write-only mode. A table longer than a sheet continues on
+    further sheets.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError(
+            "Excel export needs the openpyxl package: pip install openpyxl"
+        )
+
+    workbook = Workbook(write_only=True)
+    for table_name, chunks in tables.items():
+        sheet, sheet_rows, sheet_count, header = None, 0, 0, None
+        for chunk in _bounded_chunks(chunks()):
+            header = list(chunk.columns)
+            for row in chunk.itertuples(index=False, name=None):
+                if sheet is None or sheet_rows == EXCEL_MAX_ROWS:
+                    sheet_count += 1
+                    sheet = workbook.create_sheet(_sheet_name(table_name, sheet_count))
+                    sheet.append(header)
+                    sheet_rows = 1
+                sheet.append(row)
+                sheet_rows += 1
+        if sheet is None:
+            sheet = workbook.create_sheet(_sheet_name(table_name, 1))
+            if header is not None:
+                sheet.append(header)
+    workbook.save(file)
+
+
+def _sheet_name(table_name, sheet_count):
+    suffix = "" if sheet_count == 1 else f" ({sheet_count})"
+    name = re.sub(r"[\[\]:*?/\\]", " ", table_name)
+    return name[: EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+
+
+def _file_name(table_name, extension):
+    slug = re.sub(r"[^a-z0-9]+", "_", table_name.lower()).strip("_")
+    return f"{slug}.{extension}"
+
+
+def export_tables(tables, export_format, file):
+    """
+    Write tables to a binary file.
+
+    Args:
+        tables (dict): Callables returning an iterable of DataFrame chunks,
+        keyed by table name.
+        export_format (str): "csv", "parquet" or "excel".
+        file: Binary file object.
+
+    Returns:
+        str: Extension of the written file: the format's for a single table
+        or an Excel workbook, "zip" for several CSV or Parquet tables.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}.")
+    if export_format == "excel":
+        write_excel(tables, file)
+        return EXPORT_FORMATS["excel"]["extension"]
+
+    write_table = write_csv if export_format == "csv" else write_parquet
+    extension = EXPORT_FORMATS[export_format]["extension"]
+    if len(tables) == 1:
+        (chunks,) = tables.values()
+        write_table(chunks(), file)
+        return extension
+
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+        for table_name, chunks in tables.items():
+            with archive.open(_file_name(table_name, extension), "w") as member:
+                write_table(chunks(), member)
+    return "zip"
+
+
+def export_to_temporary_file(tables, export_format):
+    """
+    Export tables to an anonymous temporary file, e.g. for a download.
+
+    Returns:
+        file: Binary file object positioned at its start.
+    """
+    file = tempfile.TemporaryFile()
+    export_tables(tables, export_format, file)
+    file.seek(0)
+
+    return file
+
+
+def export_file_name(tables, export_format, name="lng2p_results"):
+    """File name of an export of the tables in the given format."""
+    if export_format != "excel" and len(tables) > 1:
+        return f"{name}_{export_format}.zip"
+    return f"{name}.{EXPORT_FORMATS[export_format]['extension']}"
+
+
+def export_mime(tables, export_format):
+    """MIME type of an export of the tables in the given format."""
+    if export_format != "excel" and len(tables) > 1:
+        return "application/zip"
+    return EXPORT_FORMATS[export_format]["mime"]
+
+
+def main():
+    from src.utils.load_data import (
+        load_emission_factors_data,
+        load_escalation_data,
+        load_plant_data,
+        load_scenario_data,
+        load_sensitivity_data,
+        read_data_file,
+    )
+
+    parser = argparse.ArgumentParser(description="Export the LNG2P results.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--data", default="data", help="Directory of the csv data.")
+    parser.add_argument("--output", default="output", help="Output directory.")
+    parser.add_argument(
+        "--no-sensitivities",
+        action="store_true",
+        help="Leave out the sensitivity sweep.",
+    )
+    args = parser.parse_args()
+
+    def read(file_name, load_function):
+        return read_data_file(os.path.join(args.data, file_name), load_function)
+
+    plants = read("plant_parameters.csv", load_plant_data)
+    scenarios = read("scenarios.csv", load_scenario_data)
+    escalations = None
+    if os.path.exists(os.path.join(args.data, "escalation_profiles.csv")):
+        escalations = read("escalation_profiles.csv", load_escalation_data)
+    tables = dashboard_tables(
+        plants,
+        scenarios,
+        read("emission_factors.csv", load_emission_factors_data),
+        escalations,
+    )
+    if not args.no_sensitivities:
+        tables.update(
+            sensitivity_tables(
+                plants,
+                scenarios,
+                read("sensitivity_parameters.csv", load_sensitivity_data),
+                escalations=escalations,
+            )
+        )
+
+    os.makedirs(args.output, exist_ok=True)
+    file_path = os.path.join(args.output, export_file_name(tables, args.format))
+    try:
+        with open(file_path, "wb") as file:
+            export_tables(tables, args.format, file)
+    except Exception:
+        os.remove(file_path)
+        raise
+    print(f"Results written to {file_path}.")
+
+
+if __name__ == "__main__":
+    main()
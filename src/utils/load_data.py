@@ -1,26 +1,49 @@
+import copy
+import os
+
+from src.models.escalation import ESCALATED_COST_ITEMS, StepEscalation
+from src.models.plant_parameters import PlantBatch
+from src.models.sensitivity_model import sensitivity_parameter
+
+# Parsed data files keyed by (file path, load function), with the file
+# modification time they were parsed at.
+_parsed_data_files = {}
+
+
+def read_data_file(file_path, load_function):
+    """
+    Parse a csv data file once per process.
+
+    The file is read with pandas and passed to load_function. The result is
+    kept in memory and only re-parsed when the modification time of the file
+    changes, so reruns of the app do not touch the file system beyond a stat.
+
+    Args:
+        file_path (str): Path of the csv file.
+        load_function (callable): One of the load_*_data functions below.
+
+    Returns:
+        A deep copy of the parsed data, safe to edit in session state.
+    """
+    mtime = os.path.getmtime(file_path)
+    key = (file_path, load_function.__name__)
+    parsed = _parsed_data_files.get(key)
+    if parsed is None or parsed[0] != mtime:
+        # pandas is only imported once a data file actually needs parsing.
+        import pandas as pd
+
+        parsed = (mtime, load_function(pd.read_csv(file_path)))
+        _parsed_data_files[key] = parsed
+
+    return copy.deepcopy(parsed[1])
+
+
 def load_plant_data(data):
-    plants = {}
-    for i in range(len(data)):
-        plant = data.iloc[i, 0]
-
-        plants[plant] = {}
-        plants[plant]["installed_capacity_mw"] = float(data.iloc[i, 1])
-        plants[plant]["construction_duration_years"] = int(data.iloc[i, 2])
-        plants[plant]["overnight_capex_per_kw"] = float(data.iloc[i, 3])
-        plants[plant]["operational_lifetime_years"] = int(data.iloc[i, 4])
-        plants[plant]["foam_cost_factor"] = float(data.iloc[i, 5])
-        plants[plant]["voam_cost_per_mwh"] = float(data.iloc[i, 6])
-        plants[plant]["fuel_cost_per_tLNG"] = float(data.iloc[i, 7])
-        plants[plant]["carbon_cost_per_tCO2e"] = float(data.iloc[i, 8])
-        plants[plant]["decommissioning_duration_years"] = int(data.iloc[i, 9])
-        plants[plant]["capex_contingency_factor"] = float(data.iloc[i, 10])
-        plants[plant]["decommissioning_cost_factor"] = float(data.iloc[i, 11])
-        plants[plant]["efficiency_rate"] = float(data.iloc[i, 12])
-        plants[plant]["emission_factor_mtco2e_per_pj"] = float(data.iloc[i, 13])
-        plants[plant]["discount_rate"] = float(data.iloc[i, 14])
-        plants[plant]["exchange_rate"] = float(data.iloc[i, 15])
-
-    return plants
+    """
+    Load plant parameters, keyed by plant name, cast and checked column by
+    column against PLANT_PARAMETERS (see PlantBatch.from_frame).
+    """
+    return PlantBatch.from_frame(data).to_plants()
 
 
 # FIXME: is not currently used, since the data type problem.
@@ -42,13 +65,52 @@ def load_emission_factors_data(data):
 
 
 def load_sensitivity_data(data):
+    """
+    Load sensitivity values: one column of values per sensitivity, each
+    declared in SENSITIVITY_PARAMETERS. Columns may have different lengths,
+    the missing values being left empty.
+    """
+    for column in data.columns:
+        sensitivity_parameter(column)
+
     sensitivities = {}
-    sensitivities["discount_rate"] = data["discount_rate"].to_list()
-    sensitivities["capacity_factor"] = data["capacity_factor"].to_list()
-    sensitivities["efficiency_rate"] = data["efficiency_rate"].to_list()
-    sensitivities["fuel_cost"] = data["fuel_cost"].to_list()
-    sensitivities["carbon_cost"] = data["carbon_cost"].to_list()
-    sensitivities["exchange_rate"] = data["exchange_rate"].to_list()
-    sensitivities["operational_lifetime"] = data["operational_lifetime"].to_list()
+    for column in data.columns:
+        sensitivities[column] = data[column].dropna().astype(float).to_list()
 
     return sensitivities
+
+
+def load_escalation_data(data):
+    """
+    Load cost escalation profiles.
+
+    The data has a year column (project year, the present year being 1) and
+    one column of multipliers per cost item, e.g. Fuel or Carbon. Each row
+    sets the multipliers from its year onward, so a file may list every year
+    or only the years in which the multipliers change.
+
+    Raises:
+        ValueError: If the year column is missing or a column is not one of
+        ESCALATED_COST_ITEMS.
+    """
+    if "year" not in data.columns:
+        raise ValueError("Escalation data needs a year column.")
+    unknown = [
+        column
+        for column in data.columns
+        if column != "year" and column not in ESCALATED_COST_ITEMS
+    ]
+    if unknown:
+        raise ValueError(
+            f"Unknown escalated cost items {unknown}, expected columns of "
+            f"{list(ESCALATED_COST_ITEMS)}."
+        )
+
+    escalations = {}
+    years = data["year"].astype(int).to_list()
+    for cost_item in data.columns:
+        if cost_item != "year":
+            multipliers = data[cost_item].astype(float).to_list()
+            escalations[cost_item] = StepEscalation(dict(zip(years, multipliers)))
+
+    return escalations
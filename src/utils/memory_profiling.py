@@ -0,0 +1,199 @@
+import functools
+import json
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# Memory profiling is opt-in: set LNG2P_MEMORY_PROFILING=1 before starting the
+# app to trace allocations. tracemalloc traces the whole process, so it is
+# switched on for the process at startup, never by a single session.
+MEMORY_PROFILING_ENV = "LNG2P_MEMORY_PROFILING"
+MAX_RERUNS = 50
+TOP_RETAINED_LINES = 10
+# session state key of the snapshot of the previous rerun of a session
+RERUN_SNAPSHOT_KEY = "memory_profile_snapshot"
+
+_enabled = os.environ.get(MEMORY_PROFILING_ENV, "") not in ("", "0")
+_lock = threading.Lock()
+# blocks running under profile_memory, in every thread
+_active_blocks = []
+_call_sites = {}
+_reruns = []
+
+
+def enable_memory_profiling(frames=1):
+    """
+    Start tracing allocations with tracemalloc.
+
+    Args:
+        frames (int): Frames stored per traced allocation.
+    """
+    global _enabled
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _enabled = True
+
+
+def disable_memory_profiling():
+    """Stop tracing allocations and forget the recorded profile."""
+    global _enabled
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    with _lock:
+        _active_blocks.clear()
+        _call_sites.clear()
+        _reruns.clear()
+
+
+def memory_profiling_enabled():
+    return _enabled
+
+
+def _fold_peak():
+    """
+    Credit the tracemalloc peak since its last reset to every running block,
+    then reset it. Every block starts with a fold, so all running blocks were
+    running since the last reset. Callers hold the lock.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    for block in _active_blocks:
+        block["peak"] = max(block["peak"], peak)
+    tracemalloc.reset_peak()
+    return current
+
+
+@contextmanager
+def profile_memory(label):
+    """
+    Record the peak and retained allocations of a block of code under a
+    label. Does nothing unless memory profiling is enabled.
+
+    The peak is the highest traced memory while the block runs, above the
+    traced memory when it started; the retained allocations are the traced
+    memory still held when it ends. tracemalloc traces the whole process, so
+    code running at the same time in other threads is included: concurrent
+    blocks can over-report their peaks, never under-report them.
+
+    Args:
+        label (str): Call site name under which the allocations are recorded.
+    """
+    if not _enabled:
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    with _lock:
+        current = _fold_peak()
+        block = {"start": current, "peak": current}
+        _active_blocks.append(block)
+    try:
+        yield
+    finally:
+        with _lock:
+            current = _fold_peak()
+            _active_blocks.remove(block)
+        _record(label, block["peak"] - block["start"], current - block["start"])
+
+
+def memory_profiled(function):
+    """Decorator profiling every call of a function under its name."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with profile_memory(function.__qualname__):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _record(label, peak_bytes, retained_bytes):
+    with _lock:
+        call_site = _call_sites.setdefault(
+            label,
+            {
+                "calls": 0,
+                "last_peak_bytes": 0,
+                "max_peak_bytes": 0,
+                "last_retained_bytes": 0,
+                "total_retained_bytes": 0,
+            },
+        )
+        call_site["calls"] += 1
+        call_site["last_peak_bytes"] = peak_bytes
+        call_site["max_peak_bytes"] = max(call_site["max_peak_bytes"], peak_bytes)
+        call_site["last_retained_bytes"] = retained_bytes
+        call_site["total_retained_bytes"] += retained_bytes
+
+
+def record_rerun(label, session_state=None):
+    """
+    Close a rerun of the app: record the traced memory and the source lines
+    holding the most memory allocated since the previous rerun of the session.
+
+    Args:
+        label (str): Name of the rerun, e.g. the page.
+        session_state (optional): Mapping keeping the snapshot of the
+        session's previous rerun, e.g. st.session_state. Without it every
+        allocation traced so far is ranked.
+    """
+    if not _enabled or not tracemalloc.is_tracing():
+        return
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+    current, _ = tracemalloc.get_traced_memory()
+    previous = None
+    if session_state is not None:
+        previous = session_state.get(RERUN_SNAPSHOT_KEY)
+        session_state[RERUN_SNAPSHOT_KEY] = snapshot
+    if previous is None:
+        statistics = snapshot.statistics("lineno")
+    else:
+        statistics = snapshot.compare_to(previous, "lineno")
+
+    top_retained = [
+        {
+            "line": str(statistic.traceback[0]),
+            "bytes": getattr(statistic, "size_diff", statistic.size),
+        }
+        for statistic in statistics[:TOP_RETAINED_LINES]
+    ]
+    with _lock:
+        _reruns.append(
+            {
+                "rerun": label,
+                "traced_bytes": current,
+                "top_retained": top_retained,
+            }
+        )
+        del _reruns[:-MAX_RERUNS]
+
+
+def get_memory_profile():
+    """
+    Recorded memory profile.
+
+    Returns:
+        dict: Per call site the number of calls and the last and maximum peak
+        and the last and total retained bytes, and the last MAX_RERUNS reruns
+        of all sessions with their traced bytes and top retained source lines.
+    """
+    with _lock:
+        return {
+            "enabled": _enabled,
+            "call_sites": {label: dict(site) for label, site in _call_sites.items()},
+            "reruns": [dict(rerun) for rerun in _reruns],
+        }
+
+
+def dump_memory_profile(file_path):
+    """Write the recorded memory profile to a JSON file."""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "w") as file:
+        json.dump(get_memory_profile(), file, indent=2)
@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported, which the dashboard page does
+# before anything else, so it approximates the start of the app process.
+_process_start = time.perf_counter()
+_cold_start_seconds = None
+_timings = {}
+
+
+@contextmanager
+def record_timing(label):
+    """
+    Record the wall-clock duration of a block of code under a label.
+
+    Args:
+        label (str): Name under which the duration is recorded.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        timing = _timings.setdefault(
+            label, {"calls": 0, "last_seconds": 0.0, "total_seconds": 0.0}
+        )
+        timing["calls"] += 1
+        timing["last_seconds"] = duration
+        timing["total_seconds"] += duration
+
+
+def mark_cold_start():
+    """
+    Record the time from process start to the end of the first completed run.
+    Later calls leave the recorded value unchanged.
+    """
+    global _cold_start_seconds
+    if _cold_start_seconds is None:
+        _cold_start_seconds = time.perf_counter() - _process_start
+
+
+def get_timings():
+    """
+    Recorded timings.
+
+    Returns:
+        dict: Cold start duration and, per label, the number of calls and the
+        last and mean durations in seconds.
+    """
+    timings = {
+        label: {
+            "calls": timing["calls"],
+            "last_seconds": timing["last_seconds"],
+            "mean_seconds": timing["total_seconds"] / timing["calls"],
+        }
+        for label, timing in _timings.items()
+    }
+
+    return {"cold_start_seconds": _cold_start_seconds, "timings": timings}
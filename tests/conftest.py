@@ -0,0 +1,16 @@
+import pandas as pd
+import pytest
+
+from src.utils.load_data import load_plant_data
+
+
+@pytest.fixture
+def plants():
+    """Parameters of the shipped plants, keyed by plant name."""
+    return load_plant_data(pd.read_csv("data/plant_parameters.csv"))
+
+
+@pytest.fixture
+def scenarios():
+    """Capacity factors (%) of the peaking, mid-merit and baseload scenarios."""
+    return {"Peaking": 1.0, "Mid-merit": 21.0, "Baseload": 61.0}
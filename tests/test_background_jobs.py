@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from src.utils import background_jobs
+from src.utils.background_jobs import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    JobManager,
+)
+
+TIMEOUT = 10
+
+
+def blocking_task(started, release, result):
+    def task():
+        started.set()
+        assert release.wait(TIMEOUT)
+        return result
+
+    return task
+
+
+def test_tasks_run_in_order():
+    job = JobManager().submit([lambda i=i: i * i for i in range(5)], key="squares")
+
+    assert job.wait(TIMEOUT)
+    assert job.status == COMPLETED
+    assert job.results() == [0, 1, 4, 9, 16]
+    assert job.completed == job.total == 5 and job.progress == 1.0
+
+
+def test_cancelled_job_stops_before_its_next_task():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    job = JobManager().submit(
+        [blocking_task(started, release, "first"), lambda: calls.append(1)]
+    )
+
+    assert started.wait(TIMEOUT)
+    # the running task finishes, the next one never starts
+    job.cancel()
+    release.set()
+
+    assert job.wait(TIMEOUT)
+    assert job.status == CANCELLED
+    assert job.results() == ["first"] and calls == []
+
+
+def test_job_cancelled_while_pending_never_runs():
+    manager = JobManager(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    running = manager.submit([blocking_task(started, release, None)])
+    assert started.wait(TIMEOUT)
+
+    pending = manager.submit([lambda: pytest.fail("cancelled job ran")])
+    manager.cancel(pending.id)
+    release.set()
+
+    assert running.wait(TIMEOUT) and pending.wait(TIMEOUT)
+    assert pending.status == CANCELLED and pending.results() == []
+
+
+def test_a_replacing_job_is_found_by_its_key():
+    manager = JobManager()
+    started, release = threading.Event(), threading.Event()
+    replaced = manager.submit([blocking_task(started, release, "old")], key="inputs")
+    assert started.wait(TIMEOUT)
+
+    replaced.cancel()
+    replacement = manager.submit([lambda: "new"], key="inputs")
+    release.set()
+
+    assert manager.find("inputs") is replacement
+    assert manager.get(replaced.id) is replaced
+    assert replacement.wait(TIMEOUT) and replacement.results() == ["new"]
+    assert manager.find("other inputs") is None
+
+
+def test_failed_task_fails_the_job():
+    def fail():
+        raise ValueError("bad inputs")
+
+    job = JobManager().submit([lambda: 1, fail, lambda: 3])
+
+    assert job.wait(TIMEOUT)
+    assert job.status == FAILED and isinstance(job.error, ValueError)
+    assert job.results() == [1]
+
+
+def test_only_the_latest_finished_jobs_are_kept(monkeypatch):
+    monkeypatch.setattr(background_jobs, "MAX_FINISHED_JOBS", 2)
+    manager = JobManager()
+    jobs = []
+    for i in range(4):
+        jobs.append(manager.submit([lambda i=i: i]))
+        assert jobs[-1].wait(TIMEOUT)
+
+    # pruned when the last job was submitted: the two jobs before it remain
+    assert [manager.get(job.id) for job in jobs] == [None, jobs[1], jobs[2], jobs[3]]
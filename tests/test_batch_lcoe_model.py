@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.models.batch_lcoe_model import (
+    FLOAT32_RELATIVE_ERROR_BOUND,
+    ROW_YEAR_ARRAYS,
+    batch_parameters,
+    chunk_size,
+    evaluate_cost_items_batch,
+    evaluate_demand_batch,
+    evaluate_lcoe_batch,
+)
+from src.models.lcoe_model import end_of_decommissioning_period
+from src.utils.differential_testing import reference_cost_items, reference_lcoe
+
+# 15 rows with the 5 plants: chunks of 4 and 7 rows leave a partial last chunk
+SCENARIOS = {f"{cf:g}%": cf for cf in np.linspace(1.0, 99.0, 3)}
+
+
+def budget_for_rows(params, rows, dtype=np.float64):
+    """Memory budget (MB) of chunks of the given number of rows."""
+    num_years = int(
+        np.max(
+            end_of_decommissioning_period(
+                params["construction_duration_years"],
+                params["operational_lifetime_years"],
+                params["decommissioning_duration_years"],
+            )
+        )
+    )
+    row_bytes = num_years * np.dtype(dtype).itemsize * ROW_YEAR_ARRAYS
+    return (rows + 0.5) * row_bytes / 2**20
+
+
+def test_chunk_size_fits_the_budget():
+    assert chunk_size(128, np.float64, 2.0) == 2 * 2**20 // (128 * 8 * ROW_YEAR_ARRAYS)
+    assert chunk_size(128, np.float32, 2.0) == 2 * chunk_size(128, np.float64, 2.0)
+    assert chunk_size(128, np.float64, 1e-9) == 1
+    with pytest.raises(ValueError):
+        chunk_size(100, np.float64, 0)
+
+
+@pytest.mark.parametrize("rows_per_chunk", [1, 4, 7, 15, 1000])
+def test_chunk_boundaries_do_not_change_the_results(rows_per_chunk, plants):
+    params = batch_parameters(plants, SCENARIOS)
+    budget = budget_for_rows(params, rows_per_chunk)
+
+    items = evaluate_cost_items_batch(params, memory_budget_mb=budget)
+
+    expected = reference_cost_items(plants, SCENARIOS)
+    for item, values in expected.items():
+        np.testing.assert_allclose(items[item], values.ravel(), rtol=1e-13)
+    np.testing.assert_allclose(
+        evaluate_lcoe_batch(params, memory_budget_mb=budget, decimals=None),
+        reference_lcoe(plants, SCENARIOS).ravel(),
+        rtol=1e-13,
+    )
+
+
+def test_float32_stays_within_its_error_bound(plants):
+    params = batch_parameters(plants, SCENARIOS)
+    budget = budget_for_rows(params, 4, np.float32)
+
+    items = evaluate_cost_items_batch(params, np.float32, budget)
+    lcoe = evaluate_lcoe_batch(params, np.float32, budget, decimals=None)
+
+    expected = reference_cost_items(plants, SCENARIOS)
+    for item, values in expected.items():
+        assert items[item].dtype == np.float64
+        np.testing.assert_allclose(
+            items[item], values.ravel(), rtol=FLOAT32_RELATIVE_ERROR_BOUND
+        )
+    expected_lcoe = reference_lcoe(plants, SCENARIOS).ravel()
+    np.testing.assert_allclose(lcoe, expected_lcoe, rtol=FLOAT32_RELATIVE_ERROR_BOUND)
+    # float32 carries a rounding error, float64 does not
+    assert not np.array_equal(lcoe, expected_lcoe)
+
+
+def test_demand_groups_are_summed_across_chunks(plants):
+    params = batch_parameters(plants, SCENARIOS)
+    groups = np.repeat(np.arange(len(SCENARIOS)), len(plants))
+
+    chunked = evaluate_demand_batch(params, 1, 60, groups, memory_budget_mb=1e-9)
+    whole = evaluate_demand_batch(params, 1, 60, groups)
+
+    for quantity, values in whole.items():
+        assert values.shape == (len(SCENARIOS), 60)
+        np.testing.assert_allclose(chunked[quantity], values, rtol=1e-12)
+
+
+def test_empty_batch_has_no_results(plants):
+    params = batch_parameters(plants, {})
+    assert evaluate_cost_items_batch(params) == {}
+    assert evaluate_lcoe_batch(params).shape == (0,)
@@ -0,0 +1,63 @@
+import copy
+
+import numpy as np
+import pytest
+
+from src.models.compiled_lcoe_model import (
+    annuity_factor,
+    compile_plants,
+    escalated_annuity_factor,
+)
+from src.models.escalation import StepEscalation
+from src.utils.differential_testing import reference_lcoe
+
+
+@pytest.mark.parametrize("discount_rate", [0.0, 1e-9, 0.08, -0.02])
+def test_annuity_factor_sums_the_discount_factors(discount_rate):
+    expected = sum((1 + discount_rate) ** (1 - year) for year in range(4, 31))
+
+    assert annuity_factor(4, 30, discount_rate) == pytest.approx(expected, rel=1e-6)
+    assert escalated_annuity_factor(4, 30, discount_rate) == pytest.approx(
+        expected, rel=1e-6
+    )
+
+
+def test_escalated_annuity_factor_weights_the_years():
+    escalation = StepEscalation({10: 2.0})
+    expected = sum(
+        (2.0 if year >= 10 else 1.0) * 1.08 ** (1 - year) for year in range(4, 31)
+    )
+
+    factors = escalated_annuity_factor([4, 4], [30, 30], 0.08, escalation)
+    assert factors == pytest.approx([expected, expected], rel=1e-12)
+
+
+def test_linear_inputs_broadcast_over_the_plants(plants):
+    compiled = compile_plants(plants)
+    multipliers = np.array([0.5, 1.0, 2.0])
+    base = compiled.linear_inputs["fuel_cost_per_tlng"]
+
+    # a grid of fuel costs for every plant at a baseload capacity factor
+    lcoe = compiled.lcoe(
+        61.0, fuel_cost_per_tlng=multipliers[:, None] * base, decimals=None
+    )
+
+    for row, multiplier in zip(lcoe, multipliers):
+        perturbed = copy.deepcopy(plants)
+        for parameters in perturbed.values():
+            parameters["fuel_cost_per_tLNG"] *= multiplier
+        expected = reference_lcoe(perturbed, {"Baseload": 61.0})[0]
+        assert np.allclose(row, expected, rtol=1e-12)
+
+
+def test_curve_terms_give_the_lcoe(plants, scenarios):
+    compiled = compile_plants(plants)
+    capacity_factors = np.array(list(scenarios.values()))
+
+    assert np.allclose(
+        compiled.lcoe_curves(capacity_factors),
+        compiled.lcoe(capacity_factors[:, None], decimals=None),
+        rtol=1e-12,
+    )
+    fixed, variable = compiled.lcoe_curve_terms()
+    assert (fixed > 0).all() and (variable > 0).all()
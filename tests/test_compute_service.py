@@ -0,0 +1,139 @@
+import asyncio
+import json
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+import pytest
+
+from src.models.results_visualization import compute_scenario_lcoe
+from src.service.compute_service import ComputeService
+from src.utils.differential_testing import reference_cost_items
+
+
+@pytest.fixture(scope="module", params=["thread", "process"])
+def service_url(request):
+    loop = asyncio.new_event_loop()
+    service = ComputeService(port=0, workers=2, executor=request.param, chunk_size=2)
+    loop.run_until_complete(service.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{service.port}"
+
+    asyncio.run_coroutine_threadsafe(service.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def post(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_health(service_url):
+    with urllib.request.urlopen(service_url + "/health") as response:
+        assert json.loads(response.read()) == {"status": "ok"}
+
+
+def test_lcoe_batch_matches_dashboard(service_url, plants, scenarios):
+    records = [
+        dict(characteristics, capacity_factor=capacity_factor)
+        for characteristics in plants.values()
+        for capacity_factor in scenarios.values()
+    ]
+
+    status, result = post(service_url + "/lcoe/batch", {"records": records})
+
+    assert status == 200
+    expected = compute_scenario_lcoe(plants, scenarios)["LCOE"].to_list()
+    assert result["lcoe"] == expected
+
+
+def test_columnar_batches(service_url, plants):
+    records = [dict(c, capacity_factor=0.61) for c in plants.values()]
+
+    for endpoint, column in [
+        ("/cost-items/batch", "CAPEX"),
+        ("/demand/batch", "mtpa"),
+        ("/emissions/batch", "mtco2e"),
+    ]:
+        status, result = post(service_url + endpoint, {"records": records})
+        assert status == 200
+        assert len(result[column]) == len(records)
+
+
+def test_bad_requests(service_url, plants):
+    record = dict(next(iter(plants.values())))
+
+    assert post(service_url + "/lcoe/batch", {"records": [record]})[0] == 400
+    assert post(service_url + "/lcoe/batch", {"rows": []})[0] == 400
+    assert post(service_url + "/unknown", {"records": []})[0] == 404
+    for content_length in ("abc", "-1"):
+        assert raw_post(service_url, content_length).startswith(b"HTTP/1.1 400")
+
+
+def raw_post(url, content_length):
+    """Status line of a POST with a raw Content-Length header."""
+    address = urllib.parse.urlsplit(url)
+    with socket.create_connection((address.hostname, address.port)) as sock:
+        sock.sendall(
+            (
+                "POST /lcoe/batch HTTP/1.1\r\n"
+                f"Content-Length: {content_length}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        return sock.makefile("rb").readline()
+
+
+def test_invalid_plant_parameters_are_reported_by_record(service_url, plants):
+    records = [dict(c, capacity_factor=61.0) for c in plants.values()]
+    records[1]["efficiency_rate"] = 0.0
+
+    status, result = post(service_url + "/lcoe/batch", {"records": records})
+
+    assert status == 400
+    assert "Record 1: efficiency_rate" in result["error"]
+
+
+def test_invalid_capacity_factors_are_reported_by_record(service_url, plants):
+    records = [dict(c, capacity_factor=61.0) for c in plants.values()]
+    records[1]["capacity_factor"] = -0.5
+    del records[2]["capacity_factor"]
+
+    status, result = post(service_url + "/demand/batch", {"records": records})
+    assert status == 400
+    assert "Record 2" in result["error"]
+
+    del records[2]
+    status, result = post(service_url + "/lcoe/batch", {"records": records})
+    assert status == 400
+    assert "Record 1: capacity_factor is -0.5" in result["error"]
+
+
+def test_cost_items_batch_matches_the_cash_flow_model(service_url, plants, scenarios):
+    records = [
+        dict(characteristics, capacity_factor=capacity_factor)
+        for capacity_factor in scenarios.values()
+        for characteristics in plants.values()
+    ]
+
+    status, result = post(service_url + "/cost-items/batch", {"records": records})
+
+    assert status == 200
+    expected = reference_cost_items(plants, scenarios)
+    assert list(result) == list(expected)
+    for cost_item, discounted_costs in expected.items():
+        np.testing.assert_allclose(
+            result[cost_item], discounted_costs.ravel(), rtol=1e-12
+        )
@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.models.construction_risk import (
+    simulate_construction_risk,
+    summarize_construction_risk,
+)
+from src.models.results_visualization import compute_scenario_lcoe
+
+
+def test_no_risk_reproduces_the_deterministic_lcoe(plants, scenarios):
+    expected = (
+        compute_scenario_lcoe(plants, scenarios)
+        .pivot(index="Scenario", columns="Power Plant", values="LCOE")
+        .loc[list(scenarios), list(plants)]
+        .to_numpy()
+    )
+
+    results = simulate_construction_risk(
+        plants, scenarios, num_draws=2, mean_delay_years=0, overrun_sigma=0
+    )
+
+    assert np.array_equal(np.round(results["LCOE"][1], 2), expected)
+    assert np.array_equal(
+        results["first_power_year"][0],
+        [plants[plant]["construction_duration_years"] + 1 for plant in plants],
+    )
+
+
+def test_delays_shift_first_power_and_draws_are_seeded(plants, scenarios):
+
+    results = simulate_construction_risk(plants, scenarios, num_draws=500, seed=3)
+    again = simulate_construction_risk(plants, scenarios, num_draws=500, seed=3)
+
+    assert np.array_equal(results["LCOE"], again["LCOE"])
+    durations = np.array(
+        [plants[plant]["construction_duration_years"] for plant in plants]
+    )
+    assert np.array_equal(
+        results["first_power_year"], durations + 1 + results["delay_years"]
+    )
+    summary = summarize_construction_risk(results)
+    assert len(summary) == 2 * len(scenarios) * len(plants)
+    assert (summary["P5"] <= summary["P50"]).all()
+    assert (summary["P50"] <= summary["P95"]).all()
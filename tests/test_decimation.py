@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.utils.decimation import lttb_downsample
+
+
+def reference_lttb(x, y, threshold):
+    """Point by point LTTB, as originally described by Steinarsson."""
+    every = (len(x) - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(np.floor(bucket * every)) + 1
+        end = int(np.floor((bucket + 1) * every)) + 1
+        next_end = min(int(np.floor((bucket + 2) * every)) + 1, len(x))
+        if bucket == threshold - 3:
+            end, next_start, next_end = len(x) - 1, len(x) - 1, len(x)
+        else:
+            next_start = end
+        avg_x = np.mean(x[next_start:next_end])
+        avg_y = np.mean(y[next_start:next_end])
+        areas = [
+            abs((x[a] - avg_x) * (y[i] - y[a]) - (x[a] - x[i]) * (avg_y - y[a]))
+            for i in range(start, end)
+        ]
+        a = start + int(np.argmax(areas))
+        selected.append(a)
+    selected.append(len(x) - 1)
+    return x[selected], y[selected]
+
+
+@pytest.mark.parametrize("threshold", [3, 4, 10, 99])
+def test_matches_the_reference(threshold):
+    rng = np.random.default_rng(threshold)
+    x = np.arange(1000.0)
+    y = np.cumsum(rng.normal(size=1000))
+
+    downsampled = lttb_downsample(x, y, threshold)
+    expected = reference_lttb(x, y, threshold)
+
+    assert len(downsampled[0]) == threshold
+    np.testing.assert_array_equal(downsampled[0], expected[0])
+    np.testing.assert_array_equal(downsampled[1], expected[1])
+
+
+def test_keeps_the_end_points_and_a_spike():
+    x = np.linspace(0.0, 1.0, 500)
+    y = np.zeros(500)
+    y[321] = 10.0
+
+    down_x, down_y = lttb_downsample(x[::-1], y[::-1], 20)
+
+    assert down_x[0] == 0.0 and down_x[-1] == 1.0
+    assert np.all(np.diff(down_x) > 0)
+    assert 10.0 in down_y
+
+
+@pytest.mark.parametrize("threshold", [5, 6, 2, 0])
+def test_short_series_and_small_thresholds_are_kept(threshold):
+    x = [3.0, 1.0, 2.0, 5.0, 4.0]
+    y = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    down_x, down_y = lttb_downsample(x, y, threshold)
+
+    assert down_x.tolist() == x and down_y.tolist() == y
+
+
+def test_series_need_the_same_length():
+    with pytest.raises(ValueError):
+        lttb_downsample([1.0, 2.0], [1.0], 3)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.models.batch_lcoe_model import batch_parameters, evaluate_lcoe_batch
+from src.models.compiled_lcoe_model import compile_plants
+from src.models.results_visualization import compute_scenario_lcoe
+from src.utils.differential_testing import (
+    PATHS,
+    format_report,
+    random_escalations,
+    random_plants,
+    random_scenarios,
+    reference_lcoe,
+    run_differential_tests,
+)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("path", list(PATHS))
+def test_path_matches_reference(path, seed):
+    (result,) = run_differential_tests(num_plants=40, seed=seed, paths=[path])
+
+    assert result["passed"], format_report([result])
+
+
+def test_rounded_lcoe_matches_dashboard(plants, scenarios):
+    expected = (
+        compute_scenario_lcoe(plants, scenarios)
+        .pivot(index="Scenario", columns="Power Plant", values="LCOE")
+        .loc[list(scenarios), list(plants)]
+        .to_numpy()
+    )
+
+    compiled = compile_plants(plants).lcoe(
+        np.asarray(list(scenarios.values()))[:, None]
+    )
+    batch = evaluate_lcoe_batch(batch_parameters(plants, scenarios)).reshape(
+        expected.shape
+    )
+
+    np.testing.assert_array_equal(compiled, expected)
+    np.testing.assert_array_equal(batch, expected)
+
+
+def test_report_lists_speedups():
+    results = run_differential_tests(num_plants=5, paths=["Compiled LCOE"])
+    report = format_report(results)
+
+    assert "Compiled LCOE" in report
+    assert results[0]["speedup"] > 0
+
+
+def test_escalated_paths_are_checked_against_escalated_reference():
+    rng = np.random.default_rng(0)
+    plants = random_plants(rng, 10)
+    scenarios = random_scenarios(rng)
+    escalations = random_escalations(rng)
+
+    escalated = reference_lcoe(plants, scenarios, escalations)
+
+    # every escalated cost item changes the reference
+    assert not np.allclose(escalated, reference_lcoe(plants, scenarios))
+    for item in escalations:
+        unescalated = {other: e for other, e in escalations.items() if other != item}
+        assert not np.allclose(
+            escalated, reference_lcoe(plants, scenarios, unescalated)
+        )
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from src.models.dispatch_model import compute_dispatch_lcoe, simulate_hourly_dispatch
+from src.models.lng_demand_model import feedstock_demand_mtpa
+from src.models.results_visualization import compute_scenario_lcoe
+from src.utils.constants import HOURS_IN_YEAR
+
+
+def test_flat_profile_matches_the_steady_state_model(plants):
+    load = 0.45
+    profile = np.full(HOURS_IN_YEAR, load)
+
+    dispatch = compute_dispatch_lcoe(plants, {plant: profile for plant in plants})
+
+    expected_lcoe = compute_scenario_lcoe(plants, {"Flat": load})["LCOE"].to_list()
+    assert [dispatch[plant]["lcoe"] for plant in plants] == expected_lcoe
+    for plant, parameters in plants.items():
+        assert dispatch[plant]["capacity_factor"] == pytest.approx(load)
+        assert dispatch[plant]["starts"] == 0
+        assert dispatch[plant]["mtpa"] == pytest.approx(
+            feedstock_demand_mtpa(
+                parameters["installed_capacity_mw"],
+                load,
+                parameters["efficiency_rate"],
+            ),
+            rel=1e-12,
+        )
+
+
+def test_starts_are_counted_once_per_run_wrapping_the_year():
+    running = np.zeros(HOURS_IN_YEAR)
+    running[10:20] = 1.0
+    running[100:110] = 0.5
+    # the run at the end of the year continues the run at its start
+    wrapping = running.copy()
+    wrapping[:5] = 1.0
+    wrapping[-5:] = 1.0
+
+    dispatch = simulate_hourly_dispatch(
+        [100.0, 100.0],
+        [0.5, 0.5],
+        [0.05, 0.05],
+        np.column_stack([running, wrapping]),
+        startup_fuel_mwh_per_mw=2.0,
+    )
+
+    assert dispatch["starts"].sum(axis=0).tolist() == [2, 3]
+    # start-up fuel is burnt in the first hour of every run
+    assert dispatch["fuel_input_mwh"][10, 0] == pytest.approx(100.0 / 0.5 + 200.0)
+    assert dispatch["fuel_input_mwh"][11, 0] == pytest.approx(100.0 / 0.5)
+
+
+def test_part_load_burns_more_fuel_per_output():
+    dispatch = simulate_hourly_dispatch(
+        [100.0],
+        [0.5],
+        [0.05],
+        np.full(HOURS_IN_YEAR, 0.5),
+        part_load_efficiency_loss=0.2,
+    )
+
+    efficiency = dispatch["output_mwh"] / dispatch["fuel_input_mwh"]
+    assert np.allclose(efficiency, 0.5 * (1 - 0.2 * 0.5**2))
+
+
+def test_idle_plant_has_no_lcoe(plants):
+    idle, running = list(plants)[:2]
+    plants = {idle: plants[idle], running: plants[running]}
+
+    dispatch = compute_dispatch_lcoe(
+        plants,
+        {idle: np.zeros(HOURS_IN_YEAR), running: np.full(HOURS_IN_YEAR, 0.5)},
+    )
+
+    assert np.isnan(dispatch[idle]["lcoe"])
+    assert np.isnan(dispatch[idle]["efficiency_factor"])
+    assert dispatch[idle]["output_mwh"] == 0.0 and dispatch[idle]["mtpa"] == 0.0
+    assert dispatch[running]["lcoe"] > 0
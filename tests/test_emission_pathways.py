@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.emission_pathways import check_carbon_budget, emission_pathways
+from src.models.results_visualization import (
+    compute_demand_scenario_emissions,
+    compute_demand_scenario_projections,
+    compute_emission_pathways,
+)
+from src.utils.load_data import load_emission_factors_data
+
+
+@pytest.fixture
+def emission_factors():
+    return load_emission_factors_data(pd.read_csv("data/emission_factors.csv"))
+
+
+def test_operating_years_match_the_steady_state_emissions(
+    plants, scenarios, emission_factors
+):
+    expected = compute_demand_scenario_emissions(
+        compute_demand_scenario_projections(plants, scenarios), emission_factors
+    ).set_index(["Scenario", "Power Plant", "Fuel Type"])["MtCO2e"]
+
+    pathways = emission_pathways(plants, scenarios, emission_factors)
+
+    for s, scenario in enumerate(scenarios):
+        for p, plant in enumerate(plants):
+            construction_duration = plants[plant]["construction_duration_years"]
+            lifetime = plants[plant]["operational_lifetime_years"]
+            annual = pathways["MtCO2e"][s, p]
+            operating_years = annual[
+                construction_duration : construction_duration + lifetime
+            ]
+            assert np.allclose(
+                operating_years,
+                [expected[scenario, plant, carrier] for carrier in emission_factors],
+            )
+            assert np.allclose(annual.sum(axis=0), operating_years.sum(axis=0))
+
+
+def test_carbon_budget_is_exceeded_in_the_first_year_over_it(
+    plants, scenarios, emission_factors
+):
+    pathways = emission_pathways(plants, scenarios, emission_factors)
+
+    budget = check_carbon_budget(
+        pathways, {"Peaking": 1e6, "Mid-merit": 50.0, "Baseload": 50.0}
+    )
+
+    assert budget["Within budget"][0].all() and not budget["Within budget"][1:].any()
+    cumulative = budget["Cumulative MtCO2e"]
+    for s in (1, 2):
+        for c in range(len(emission_factors)):
+            year_index = budget["Exceeded in"][s, c] - budget["years"][0]
+            assert cumulative[s, year_index, c] > 50.0
+            assert cumulative[s, year_index - 1, c] <= 50.0
+
+
+def test_pathway_table_adds_embodied_emissions_and_checks_the_budget(
+    plants, scenarios, emission_factors
+):
+    pathways = compute_emission_pathways(plants, scenarios, emission_factors)
+    embodied = compute_emission_pathways(
+        plants,
+        scenarios,
+        emission_factors,
+        carbon_budget_mtco2e=50.0,
+        construction_mtco2e_per_mw=0.001,
+        decommissioning_mtco2e_per_mw=0.0005,
+    )
+
+    capacity = sum(plant["installed_capacity_mw"] for plant in plants.values())
+    added = embodied["MtCO2e"] - pathways["MtCO2e"]
+    # every scenario and fuel type adds the embodied emissions of the fleet once
+    assert np.allclose(
+        added.groupby([embodied["Scenario"], embodied["Fuel Type"]]).sum(),
+        capacity * 0.0015,
+    )
+
+    budget = check_carbon_budget(
+        emission_pathways(plants, scenarios, emission_factors, 0.001, 0.0005), 50.0
+    )
+    within = embodied.groupby(["Scenario", "Fuel Type"], sort=False)[
+        "Within budget"
+    ].all()
+    assert within.to_numpy().tolist() == budget["Within budget"].ravel().tolist()
+    assert (embodied["Budget MtCO2e"] == 50.0).all()
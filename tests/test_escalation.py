@@ -0,0 +1,138 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.batch_lcoe_model import BATCH_PARAMETERS, evaluate_cost_items_batch
+from src.models.escalation import (
+    ConstantEscalation,
+    StepEscalation,
+    VectorEscalation,
+    _Escalation,
+    escalate_expense,
+    escalations_key,
+)
+from src.models.lcoe_model import create_cash_flow
+from src.models.results_visualization import compute_scenario_lcoe
+from src.models.scenario_store import ScenarioStore
+from src.models.sensitivity_model import evaluate_lcoe_sensitivities
+from src.utils.load_data import load_escalation_data
+
+ESCALATIONS = {
+    "Fuel": ConstantEscalation(0.03),
+    "Carbon": StepEscalation({5: 1.5, 12: 2.5}),
+    "FO&M": VectorEscalation([1.0, 1.1, 1.2]),
+}
+
+
+def test_constant_escalation_compounds_from_the_present_year():
+    multipliers = ConstantEscalation(0.05).multipliers([1, 2, 11])
+    assert multipliers == pytest.approx([1.0, 1.05, 1.05**10])
+
+
+def test_step_escalation_holds_each_step_until_the_next():
+    escalation = StepEscalation({12: 2.5, 5: 1.5})
+    multipliers = escalation.multipliers([1, 4, 5, 11, 12, 40])
+    assert multipliers.tolist() == [1.0, 1.0, 1.5, 1.5, 2.5, 2.5]
+
+
+def test_vector_escalation_keeps_its_last_multiplier():
+    escalation = VectorEscalation([1.0, 1.1, 1.2])
+    assert escalation.multipliers([1, 2, 3, 10]).tolist() == [1.0, 1.1, 1.2, 1.2]
+    with pytest.raises(ValueError):
+        VectorEscalation([])
+
+
+def test_escalations_with_the_same_schedule_are_equal():
+    copied = copy.deepcopy(ESCALATIONS)
+    assert copied == ESCALATIONS
+    assert escalations_key(copied) == escalations_key(ESCALATIONS)
+    assert hash(copied["Carbon"]) == hash(ESCALATIONS["Carbon"])
+    assert StepEscalation({5: 1.5}) != VectorEscalation([1.5])
+    assert escalations_key({}) is None
+
+
+def test_incomplete_escalations_cannot_be_created():
+    class Unkeyed(_Escalation):
+        def multipliers(self, years):
+            return np.ones(len(years))
+
+    with pytest.raises(TypeError):
+        Unkeyed()
+
+
+def test_net_present_value_matches_a_yearly_sum():
+    values = escalate_expense(100.0, 3, 30, ESCALATIONS["Carbon"])
+    npv = create_cash_flow((3, 30, values)).net_present_value(1, 0.08)
+
+    expected = sum(
+        value / 1.08 ** (year - 1) for year, value in zip(range(3, 31), values)
+    )
+    assert npv == pytest.approx(expected, rel=1e-12)
+
+
+def test_batch_evaluator_matches_the_escalated_reference(plants, scenarios):
+    params = {
+        parameter: np.array(
+            [
+                (
+                    scenarios[scenario]
+                    if parameter == "capacity_factor"
+                    else plants[plant][parameter]
+                )
+                for plant in plants
+                for scenario in scenarios
+            ]
+        )
+        for parameter in BATCH_PARAMETERS
+    }
+
+    items = evaluate_cost_items_batch(params, escalations=ESCALATIONS)
+    revenue = items.pop("Revenue")
+    lcoe = sum(items.values()) / revenue * params["exchange_rate"] / 1000
+
+    expected = compute_scenario_lcoe(plants, scenarios, ESCALATIONS)["LCOE"]
+    assert np.round(lcoe, 2).tolist() == expected.to_list()
+    unescalated = compute_scenario_lcoe(plants, scenarios)["LCOE"]
+    assert (expected.to_numpy() > unescalated.to_numpy()).all()
+
+
+def test_sensitivities_apply_the_escalations(plants, scenarios):
+    results = evaluate_lcoe_sensitivities(
+        plants, scenarios, {"discount_rate": [0.08]}, escalations=ESCALATIONS
+    )
+
+    discounted = copy.deepcopy(plants)
+    for characteristics in discounted.values():
+        characteristics["discount_rate"] = 0.08
+    expected = compute_scenario_lcoe(discounted, scenarios, ESCALATIONS)["LCOE"]
+    assert results["LCOE"].tolist() == expected.to_list()
+
+
+def test_version_comparisons_apply_the_escalations(plants, scenarios):
+    store = ScenarioStore(plants, scenarios)
+    plant = next(iter(plants))
+    edited = copy.deepcopy(plants)
+    edited[plant]["fuel_cost_per_tLNG"] *= 2
+    store.save("Fuel", edited, scenarios)
+
+    comparison = store.compare("Base", "Fuel", escalations=ESCALATIONS)
+
+    lcoe = comparison[comparison.Metric == "LCOE"]
+    expected_a = compute_scenario_lcoe({plant: plants[plant]}, scenarios, ESCALATIONS)
+    expected_b = compute_scenario_lcoe({plant: edited[plant]}, scenarios, ESCALATIONS)
+    assert lcoe["Base v0"].to_list() == expected_a["LCOE"].to_list()
+    assert lcoe["Fuel v1"].to_list() == expected_b["LCOE"].to_list()
+
+
+def test_escalation_data_needs_known_cost_items():
+    escalations = load_escalation_data(
+        pd.DataFrame({"year": [1, 10], "Fuel": [1.0, 1.4], "Carbon": [1.0, 2.0]})
+    )
+    assert escalations["Fuel"].multipliers([9, 10]).tolist() == [1.0, 1.4]
+
+    with pytest.raises(ValueError):
+        load_escalation_data(pd.DataFrame({"year": [1], "Feul": [1.2]}))
+    with pytest.raises(ValueError):
+        load_escalation_data(pd.DataFrame({"Fuel": [1.2]}))
@@ -0,0 +1,80 @@
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+from src.utils import export_results
+from src.utils.export_results import (
+    export_file_name,
+    export_tables,
+    export_to_temporary_file,
+)
+
+TABLE = pd.DataFrame({"Power Plant": ["A", "B", "C", "D", "E"], "LCOE": range(5)})
+
+
+def chunked_tables():
+    return {
+        "LCOE": lambda: (TABLE.iloc[start : start + 2] for start in range(0, 5, 2)),
+        "Other table": lambda: iter([TABLE.head(1)]),
+    }
+
+
+def test_csv_export_writes_one_header_per_table(monkeypatch):
+    monkeypatch.setattr(export_results, "EXPORT_CHUNK_ROWS", 1)
+    file = io.BytesIO()
+
+    # every chunk is split into single rows
+    chunks = list(export_results._bounded_chunks(chunked_tables()["LCOE"]()))
+    assert [len(chunk) for chunk in chunks] == [1] * len(TABLE)
+
+    assert export_tables({"LCOE": chunked_tables()["LCOE"]}, "csv", file) == "csv"
+    file.seek(0)
+    pd.testing.assert_frame_equal(pd.read_csv(file), TABLE)
+
+
+def test_multiple_tables_are_zipped():
+    file = export_to_temporary_file(chunked_tables(), "parquet")
+
+    with zipfile.ZipFile(file) as archive:
+        assert archive.namelist() == ["lcoe.parquet", "other_table.parquet"]
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(archive.open("lcoe.parquet")), TABLE
+        )
+    assert export_file_name(chunked_tables(), "parquet") == (
+        "lng2p_results_parquet.zip"
+    )
+
+
+def test_excel_export_splits_long_tables_over_sheets(monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(export_results, "EXCEL_MAX_ROWS", 3)
+    tables = dict(chunked_tables())
+    tables["A table name longer than a sheet name: LCOE"] = tables.pop("Other table")
+    file = io.BytesIO()
+
+    assert export_tables(tables, "excel", file) == "xlsx"
+
+    workbook = openpyxl.load_workbook(file, read_only=True)
+    # a header and two rows per sheet; names are cut to fit their suffix
+    assert workbook.sheetnames == [
+        "LCOE",
+        "LCOE (2)",
+        "LCOE (3)",
+        "A table name longer than a shee",
+    ]
+    rows = [
+        row
+        for name in workbook.sheetnames[:3]
+        for row in workbook[name].iter_rows(values_only=True)
+    ]
+    assert rows[0] == tuple(TABLE.columns)
+    assert [row for row in rows if row != tuple(TABLE.columns)] == list(
+        TABLE.itertuples(index=False, name=None)
+    )
+    assert list(workbook[workbook.sheetnames[3]].iter_rows(values_only=True)) == [
+        tuple(TABLE.columns),
+        ("A", 0),
+    ]
+    assert export_results._sheet_name("x" * 40, 12) == "x" * 26 + " (12)"
@@ -0,0 +1,75 @@
+import plotly.graph_objects as go
+import pytest
+
+from src.components import plotly_charts
+from src.models.results_visualization import (
+    compute_discount_cash_flows,
+    compute_scenario_lcoe,
+)
+
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """Figures passed to st.plotly_chart, from an empty skeleton cache."""
+    monkeypatch.setattr(plotly_charts, "_figure_skeletons", {})
+    figures = []
+    monkeypatch.setattr(
+        plotly_charts.st, "plotly_chart", lambda fig, **kwargs: figures.append(fig)
+    )
+    return figures
+
+
+def test_skeletons_are_built_once_per_shape(drawn):
+    built = []
+
+    def build():
+        built.append(1)
+        return go.Figure(go.Bar())
+
+    first = plotly_charts.get_figure_skeleton(("chart", 5), build)
+    second = plotly_charts.get_figure_skeleton(("chart", 5), build)
+    plotly_charts.get_figure_skeleton(("chart", 4), build)
+    assert len(built) == 2
+    # every chart fills its own copy
+    first.data[0].y = [1.0]
+    assert first is not second and second.data[0].y is None
+
+
+def test_donut_charts_do_not_share_their_figures(drawn, plants, scenarios):
+    for scenario in ("Peaking", "Baseload"):
+        plotly_charts.create_donut_pie_chart(
+            compute_discount_cash_flows(plants, scenarios, scenario), scenario
+        )
+
+    first, second = drawn
+    assert first is not second
+    assert first.layout.title.text == "Peaking"
+    expected = compute_discount_cash_flows(plants, scenarios, "Baseload")
+    assert second.layout.title.text == "Baseload"
+    for trace, (plant, costs) in zip(second.data, expected.items()):
+        total = sum(costs.values())
+        assert trace.name == plant
+        assert list(trace.values) == pytest.approx(
+            [value / total * 100 for value in costs.values()]
+        )
+    # the cached skeleton keeps its placeholder traces
+    (skeleton,) = plotly_charts._figure_skeletons.values()
+    assert all(trace.values is None for trace in skeleton.data)
+
+
+def test_bar_chart_skeleton_follows_the_number_of_plants(drawn, plants, scenarios):
+    three = dict(list(plants.items())[:3])
+    for subset in (plants, three):
+        plotly_charts.create_bar_chart(
+            compute_discount_cash_flows(subset, scenarios, "Peaking"),
+            compute_scenario_lcoe(subset, scenarios),
+        )
+
+    full, small = drawn
+    assert full is not small
+    assert [trace.name for trace in small.data] == list(three)
+    lcoe = compute_scenario_lcoe(three, scenarios)
+    for trace, plant in zip(small.data, three):
+        expected = lcoe[lcoe["Power Plant"] == plant]
+        assert list(trace.x) == expected["Scenario"].to_list()
+        assert list(trace.y) == expected["LCOE"].to_list()
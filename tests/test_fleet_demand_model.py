@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.models.fleet_demand_model import (
+    fleet_demand_matrix,
+    fleet_demand_timeseries,
+    fleet_operation_windows,
+)
+from src.models.results_visualization import (
+    compute_demand_scenario_projections,
+    compute_fleet_demand_timeseries,
+)
+
+
+def test_plants_operate_after_construction_for_their_lifetime():
+    operation_start, operation_end = fleet_operation_windows([3, 1, 5], [2, 30, 1])
+
+    assert operation_start.tolist() == [4, 2, 6]
+    assert operation_end.tolist() == [5, 31, 6]
+
+
+@pytest.mark.parametrize("first_year, last_year", [(1, 40), (5, 12), (20, 25)])
+def test_timeseries_sums_the_demand_matrix(first_year, last_year):
+    rng = np.random.default_rng(first_year)
+    operation_start, operation_end = fleet_operation_windows(
+        rng.integers(1, 8, size=50), rng.integers(1, 30, size=50)
+    )
+    demands = rng.uniform(1.0, 2.0, size=(3, 50))
+
+    timeseries = fleet_demand_timeseries(
+        operation_start, operation_end, demands, first_year, last_year
+    )
+
+    years = np.arange(first_year, last_year + 1)
+    for scenario_demands, scenario_timeseries in zip(demands, timeseries):
+        expected = fleet_demand_matrix(
+            operation_start, operation_end, scenario_demands, years
+        ).sum(axis=0)
+        assert np.allclose(scenario_timeseries, expected, rtol=1e-12)
+
+
+def test_windows_outside_the_horizon_add_nothing():
+    timeseries = fleet_demand_timeseries([1, 4, 20], [2, 6, 30], [1.0, 2.0, 4.0], 3, 10)
+
+    assert timeseries.tolist() == [0.0, 2.0, 2.0, 2.0, 0.0, 0.0, 0.0, 0.0]
+
+
+def test_fleet_timeseries_adds_up_the_plant_demands(plants, scenarios):
+    fleet = compute_fleet_demand_timeseries(plants, scenarios)
+    steady = compute_demand_scenario_projections(plants, scenarios)
+
+    lifetimes = steady["Power Plant"].map(
+        {plant: p["operational_lifetime_years"] for plant, p in plants.items()}
+    )
+    for column in ("PJ", "MTPA"):
+        totals = fleet.groupby("Scenario")[column].sum()
+        expected = (steady[column] * lifetimes).groupby(steady["Scenario"]).sum()
+        assert np.allclose(totals[list(scenarios)], expected[list(scenarios)])
+    # the horizon runs from the present year to the last operating year
+    last_year = fleet[fleet["Year"] == fleet["Year"].max()]
+    assert (last_year["PJ"] > 0).all()
+    assert fleet["Year"].min() == 1
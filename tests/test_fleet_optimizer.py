@@ -0,0 +1,96 @@
+import copy
+import itertools
+
+import pytest
+
+from src.models.fleet_optimizer import optimize_fleet_mix
+from src.models.results_visualization import compute_discount_cash_flows
+
+LOAD_FACTORS = (20.0, 60.0)
+
+
+def brute_force(plants, demand_pj, emission_cap_mtco2e, max_units):
+    # the costs of a unit are those at its load factor as a fraction
+    scenarios = {str(load_factor): load_factor / 100 for load_factor in LOAD_FACTORS}
+    unit_costs = {
+        load_factor: compute_discount_cash_flows(plants, scenarios, str(load_factor))
+        for load_factor in LOAD_FACTORS
+    }
+    choices = [
+        [(0, None)]
+        + [
+            (units, load_factor)
+            for units in range(1, max_units + 1)
+            for load_factor in LOAD_FACTORS
+        ]
+        for _ in plants
+    ]
+    best = None
+    for mix in itertools.product(*choices):
+        cost = pj = emissions = 0.0
+        for plant, (units, load_factor) in zip(plants, mix):
+            if units == 0:
+                continue
+            parameters = plants[plant]
+            cost += units * sum(unit_costs[load_factor][plant].values())
+            unit_pj = (
+                8760 * parameters["installed_capacity_mw"] * load_factor / 100 * 3.6e-6
+            )
+            pj += units * unit_pj
+            emissions += units * unit_pj * parameters["emission_factor_mtco2e_per_pj"]
+        if pj >= demand_pj and emissions <= emission_cap_mtco2e:
+            if best is None or cost < best[0]:
+                best = (cost, mix)
+
+    return best
+
+
+@pytest.mark.parametrize("demand_pj", [5.0, 10.0, 20.0])
+def test_optimizer_matches_brute_force(demand_pj, plants):
+    plants = {plant: plants[plant] for plant in ["Ankerlig", "Gourikwa", "IPP1000"]}
+
+    result = optimize_fleet_mix(
+        plants, demand_pj, 2.0, max_units=2, load_factors=LOAD_FACTORS
+    )
+    expected = brute_force(plants, demand_pj, 2.0, max_units=2)
+
+    assert result["mixes_evaluated"] == 5**3
+    assert result["best"]["Discounted cost"] == pytest.approx(expected[0], rel=1e-9)
+    assert result["best"]["units"] == {
+        plant: choice for plant, choice in zip(plants, expected[1]) if choice[0]
+    }
+    costs = [mix["Discounted cost"] for mix in result["pareto_front"]]
+    emissions = [mix["MtCO2e"] for mix in result["pareto_front"]]
+    assert costs == sorted(costs) and emissions == sorted(emissions, reverse=True)
+
+
+def test_infeasible_demand_has_no_mix(plants):
+
+    result = optimize_fleet_mix(plants, 1000.0, max_units=1, load_factors=LOAD_FACTORS)
+
+    assert result["best"] is None and result["pareto_front"] == []
+
+
+def test_cheaper_fuel_pays_off_at_high_load_factors(plants):
+    base = plants["Ankerlig"]
+    fuel_light = copy.deepcopy(base)
+    fuel_light["fuel_cost_per_tLNG"] = base["fuel_cost_per_tLNG"] / 2
+
+    # the fuel-light unit costs more to build, by its fuel savings at 50%
+    costs = compute_discount_cash_flows(
+        {"base": base, "fuel light": fuel_light}, {"half": 0.5}, "half"
+    )
+    fixed = sum(costs["base"][item] for item in ("CAPEX", "FO&M", "Decommissioning"))
+    savings = costs["base"]["Fuel"] - costs["fuel light"]["Fuel"]
+    fuel_light["overnight_capex_per_kw"] *= 1 + savings / fixed
+    plants = {"capex light": base, "fuel light": fuel_light}
+
+    unit_pj = 8760 * base["installed_capacity_mw"] * 3.6e-6
+    for load_factor, winner in [(10.0, "capex light"), (90.0, "fuel light")]:
+        result = optimize_fleet_mix(
+            plants,
+            unit_pj * load_factor / 100,
+            max_units=1,
+            load_factors=(load_factor,),
+        )
+        assert result["best"]["units"] == {winner: (1, load_factor)}
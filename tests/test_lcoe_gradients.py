@@ -0,0 +1,133 @@
+import copy
+
+import numpy as np
+import pytest
+
+from src.models.lcoe_gradients import (
+    GRADIENT_PARAMETERS,
+    Dual,
+    lcoe_closed_form,
+    lcoe_elasticities,
+    lcoe_gradients,
+)
+from src.models.results_visualization import compute_lcoe_elasticities
+from src.utils.differential_testing import random_escalations, reference_lcoe
+
+# durations and the lifetime are integers in the cash flow model, and are only
+# continuous in the closed form.
+DURATION_PARAMETERS = [
+    "construction_duration_years",
+    "operational_lifetime_years",
+    "decommissioning_duration_years",
+]
+CONTINUOUS_PARAMETERS = [p for p in GRADIENT_PARAMETERS if p not in DURATION_PARAMETERS]
+
+RELATIVE_STEP = 1e-5
+# errors are compared as elasticities, so that parameters LCOE does not
+# depend on (e.g. the installed capacity) have a meaningful scale; zero
+# parameter values are scaled by one.
+ELASTICITY_TOLERANCE = 1e-7
+
+
+def step_scale(values):
+    """Scale of the finite difference steps, one at zero values."""
+    return np.where(values == 0, 1.0, np.abs(values))
+
+
+def perturbed(plants, scenarios, parameter, sign):
+    if parameter == "capacity_factor":
+        return plants, {
+            scenario: value + sign * RELATIVE_STEP * step_scale(value)
+            for scenario, value in scenarios.items()
+        }
+    plants = copy.deepcopy(plants)
+    for characteristics in plants.values():
+        value = characteristics[parameter]
+        characteristics[parameter] = value + sign * RELATIVE_STEP * step_scale(value)
+    return plants, scenarios
+
+
+def closed_form_lcoe(plants, scenarios, escalations, parameter=None, factor=1.0):
+    """lcoe_closed_form on values only, with one parameter scaled."""
+    p = {
+        name: np.asarray([[float(plants[plant][name]) for plant in plants]])
+        for name in GRADIENT_PARAMETERS
+        if name != "capacity_factor"
+    }
+    p["capacity_factor"] = np.asarray(list(scenarios.values()), dtype=float)[:, None]
+    if parameter is not None:
+        p[parameter] = p[parameter] * factor
+    duals = {name: Dual(value, np.zeros_like(value)) for name, value in p.items()}
+    return lcoe_closed_form(duals, escalations).value
+
+
+def assert_elasticities_close(gradient, finite_difference, value, lcoe):
+    scale = step_scale(value)
+    np.testing.assert_allclose(
+        gradient * scale / lcoe,
+        finite_difference * scale / lcoe,
+        rtol=0,
+        atol=ELASTICITY_TOLERANCE,
+    )
+
+
+@pytest.mark.parametrize("escalated", [False, True])
+@pytest.mark.parametrize("parameter", CONTINUOUS_PARAMETERS)
+def test_gradients_match_finite_differences_of_the_lcoe(
+    parameter, escalated, plants, scenarios
+):
+    escalations = random_escalations(np.random.default_rng(0)) if escalated else None
+
+    lcoe, gradients, values = lcoe_gradients(plants, scenarios, escalations)
+
+    # central differences of the unrounded LCOE of calculate_lcoe
+    upper = reference_lcoe(*perturbed(plants, scenarios, parameter, 1), escalations)
+    lower = reference_lcoe(*perturbed(plants, scenarios, parameter, -1), escalations)
+    step = 2 * RELATIVE_STEP * step_scale(values[parameter])
+    np.testing.assert_allclose(
+        lcoe, reference_lcoe(plants, scenarios, escalations), rtol=1e-12
+    )
+    assert_elasticities_close(
+        gradients[parameter], (upper - lower) / step, values[parameter], lcoe
+    )
+
+
+@pytest.mark.parametrize("escalated", [False, True])
+@pytest.mark.parametrize("parameter", DURATION_PARAMETERS)
+def test_duration_gradients_match_finite_differences_of_the_closed_form(
+    parameter, escalated, plants, scenarios
+):
+    escalations = random_escalations(np.random.default_rng(1)) if escalated else None
+
+    lcoe, gradients, values = lcoe_gradients(plants, scenarios, escalations)
+
+    upper = closed_form_lcoe(
+        plants, scenarios, escalations, parameter, 1 + RELATIVE_STEP
+    )
+    lower = closed_form_lcoe(
+        plants, scenarios, escalations, parameter, 1 - RELATIVE_STEP
+    )
+    step = 2 * RELATIVE_STEP * values[parameter]
+    assert_elasticities_close(
+        gradients[parameter], (upper - lower) / step, values[parameter], lcoe
+    )
+
+
+def test_elasticities_scale_the_gradients(plants, scenarios):
+    lcoe, gradients, values = lcoe_gradients(plants, scenarios)
+
+    elasticities = lcoe_elasticities(lcoe, gradients, values)
+    table = compute_lcoe_elasticities(plants, scenarios)
+
+    assert list(elasticities) == GRADIENT_PARAMETERS
+    for parameter in GRADIENT_PARAMETERS:
+        np.testing.assert_allclose(
+            elasticities[parameter],
+            gradients[parameter] * values[parameter] / lcoe,
+            rtol=1e-15,
+        )
+    np.testing.assert_allclose(
+        table["Elasticity"], table["Derivative"] * table["Value"] / table["LCOE"]
+    )
+    # every cost and the revenue scale with the installed capacity
+    np.testing.assert_allclose(elasticities["installed_capacity_mw"], 0, atol=1e-12)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from src.models.escalation import (
+    ConstantEscalation,
+    StepEscalation,
+    VectorEscalation,
+)
+from src.models.results_visualization import compute_lcoe_load_factor_curves
+from src.utils.differential_testing import reference_lcoe
+
+ESCALATIONS = {
+    "CAPEX": VectorEscalation([1.0, 1.2]),
+    "Fuel": ConstantEscalation(0.03),
+    "Carbon": StepEscalation({5: 1.5, 12: 2.5}),
+    "Decommissioning": ConstantEscalation(0.02),
+}
+
+
+@pytest.mark.parametrize("escalations", [None, ESCALATIONS])
+def test_curves_match_the_reference(escalations, plants):
+    curves = compute_lcoe_load_factor_curves(plants, escalations, num_points=12)
+
+    load_factors = np.linspace(1.0, 100.0, 12)
+    assert (
+        curves["Load factor"].to_list() == np.tile(load_factors, len(plants)).tolist()
+    )
+    assert curves["Power Plant"].to_list() == np.repeat(list(plants), 12).tolist()
+    expected = reference_lcoe(
+        plants, dict(zip(map(str, load_factors), load_factors)), escalations
+    )
+    assert np.allclose(curves["LCOE"], expected.T.ravel(), rtol=1e-12)
+
+
+def test_escalations_raise_the_curves(plants):
+    curves = compute_lcoe_load_factor_curves(plants, num_points=10)
+    escalated = compute_lcoe_load_factor_curves(plants, ESCALATIONS, num_points=10)
+
+    assert (escalated["LCOE"] > curves["LCOE"]).all()
@@ -0,0 +1,76 @@
+import copy
+
+import pandas as pd
+import pytest
+
+from src.models.escalation import StepEscalation
+from src.models.load_factor_table import (
+    INTERPOLATION_ERROR_BOUND,
+    build_load_factor_table,
+    get_load_factor_table,
+)
+from src.models.results_visualization import (
+    compute_demand_scenario_projections,
+    compute_discount_cash_flows,
+    compute_scenario_lcoe,
+)
+
+# off the grid of the table, as slider values between its points
+SCENARIOS = {"Peaking": 7.5, "Mid-merit": 33.25, "Baseload": 88.8}
+
+
+def test_lookups_match_the_reference(plants):
+    table = build_load_factor_table(plants)
+
+    pd.testing.assert_frame_equal(
+        compute_scenario_lcoe(plants, SCENARIOS, table=table),
+        compute_scenario_lcoe(plants, SCENARIOS),
+    )
+    pd.testing.assert_frame_equal(
+        compute_demand_scenario_projections(plants, SCENARIOS, table=table),
+        compute_demand_scenario_projections(plants, SCENARIOS),
+        rtol=1e-12,
+    )
+    for scenario in SCENARIOS:
+        expected = compute_discount_cash_flows(plants, SCENARIOS, scenario)
+        looked_up = compute_discount_cash_flows(
+            plants, SCENARIOS, scenario, table=table
+        )
+        for plant, items in expected.items():
+            for item, value in items.items():
+                assert looked_up[plant][item] == pytest.approx(value, rel=1e-9)
+
+
+def test_interpolation_error_is_within_the_bound(plants):
+    table = build_load_factor_table(plants)
+    assert table.max_relative_error <= INTERPOLATION_ERROR_BOUND
+
+
+def test_lookup_outside_the_table_raises(plants):
+    table = build_load_factor_table(plants)
+    with pytest.raises(ValueError):
+        table.lookup(0.5)
+    with pytest.raises(ValueError):
+        build_load_factor_table(plants, load_factors=[50.0, 10.0])
+
+
+def test_tables_are_reused_until_the_plants_change(plants):
+    table = get_load_factor_table(plants)
+    assert get_load_factor_table(copy.deepcopy(plants)) is table
+
+    plant = next(iter(plants))
+    plants[plant]["fuel_cost_per_tLNG"] *= 2
+    changed = get_load_factor_table(plants)
+    assert changed is not table
+    assert changed.lcoe(50.0)[0] > table.lcoe(50.0)[0]
+
+
+def test_tables_are_reused_for_equal_escalations(plants):
+    escalations = {"Fuel": StepEscalation({5: 1.5})}
+    table = get_load_factor_table(plants, escalations)
+
+    assert get_load_factor_table(plants, copy.deepcopy(escalations)) is table
+    assert get_load_factor_table(plants) is not table
+    changed = get_load_factor_table(plants, {"Fuel": StepEscalation({5: 2.0})})
+    assert changed is not table
+    assert changed.lcoe(50.0)[0] > table.lcoe(50.0)[0]
@@ -0,0 +1,112 @@
+import json
+import threading
+
+import pytest
+
+from src.utils import memory_profiling
+from src.utils.memory_profiling import (
+    RERUN_SNAPSHOT_KEY,
+    disable_memory_profiling,
+    dump_memory_profile,
+    enable_memory_profiling,
+    get_memory_profile,
+    profile_memory,
+    record_rerun,
+)
+
+MIB = 2**20
+TIMEOUT = 10
+
+
+@pytest.fixture
+def profiling():
+    enable_memory_profiling()
+    yield
+    disable_memory_profiling()
+
+
+def call_site(label):
+    return get_memory_profile()["call_sites"][label]
+
+
+def test_peak_and_retained_bytes_of_nested_blocks(profiling):
+    with profile_memory("outer"):
+        with profile_memory("inner"):
+            buffer = bytearray(8 * MIB)
+            del buffer
+        kept = bytearray(2 * MIB)
+
+    inner, outer = call_site("inner"), call_site("outer")
+    assert 8 * MIB <= inner["last_peak_bytes"] < 9 * MIB
+    assert abs(inner["last_retained_bytes"]) < MIB
+    # the peak of the inner block is the peak of the block enclosing it
+    assert outer["last_peak_bytes"] >= inner["last_peak_bytes"]
+    assert 2 * MIB <= outer["last_retained_bytes"] < 3 * MIB
+    assert outer["calls"] == inner["calls"] == 1
+    del kept
+
+
+def test_blocks_in_other_threads_keep_their_peak(profiling):
+    allocated, started = threading.Event(), threading.Event()
+
+    def allocate():
+        with profile_memory("allocating thread"):
+            buffer = bytearray(8 * MIB)
+            del buffer
+            allocated.set()
+            assert started.wait(TIMEOUT)
+
+    thread = threading.Thread(target=allocate)
+    thread.start()
+    assert allocated.wait(TIMEOUT)
+    # a block starting here resets the tracemalloc peak
+    with profile_memory("other thread"):
+        started.set()
+        thread.join(TIMEOUT)
+
+    assert call_site("allocating thread")["last_peak_bytes"] >= 8 * MIB
+
+
+def test_reruns_rank_the_allocations_of_the_session(profiling):
+    session_state = {}
+    record_rerun("Page", session_state)
+    assert RERUN_SNAPSHOT_KEY in session_state
+
+    kept = [bytearray(MIB) for _ in range(4)]
+    record_rerun("Page", session_state)
+
+    first, second = get_memory_profile()["reruns"]
+    assert first["rerun"] == second["rerun"] == "Page"
+    assert second["traced_bytes"] >= 4 * MIB
+    # the buffers are the largest allocation since the previous rerun
+    top = second["top_retained"][0]
+    assert __file__ in top["line"] and top["bytes"] >= 4 * MIB
+    del kept
+
+
+def test_dump_writes_the_profile(profiling, tmp_path):
+    with profile_memory("block"):
+        pass
+    record_rerun("Page")
+
+    file_path = tmp_path / "output" / "memory_profile.json"
+    dump_memory_profile(str(file_path))
+
+    profile = json.loads(file_path.read_text())
+    assert profile["enabled"]
+    assert profile["call_sites"]["block"]["calls"] == 1
+    assert profile["reruns"][0]["rerun"] == "Page"
+
+
+def test_disabled_profiling_records_nothing():
+    disable_memory_profiling()
+    session_state = {}
+
+    with profile_memory("block"):
+        buffer = bytearray(MIB)
+        del buffer
+    record_rerun("Page", session_state)
+
+    assert get_memory_profile() == {"enabled": False, "call_sites": {}, "reruns": []}
+    assert session_state == {}
+    assert memory_profiling._active_blocks == []
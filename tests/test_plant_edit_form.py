@@ -0,0 +1,67 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+PLANT = "Ankerlig"
+
+
+@pytest.fixture
+def app():
+    app = AppTest.from_file("../01_📊_LNG2P_Dashboard.py", default_timeout=60)
+    app.run()
+    plant_select = next(
+        select
+        for select in app.sidebar.selectbox
+        if select.placeholder and "power plant" in select.placeholder
+    )
+    plant_select.select(PLANT).run()
+    return app
+
+
+def number_input(app, label):
+    return next(widget for widget in app.sidebar.number_input if label in widget.label)
+
+
+def apply(app):
+    next(button for button in app.sidebar.button if button.label == "Apply").click()
+    app.run()
+
+
+def test_edits_are_applied_together(app):
+    plants = app.session_state.plants
+    construction = plants[PLANT]["construction_duration_years"]
+    fuel_cost = plants[PLANT]["fuel_cost_per_tLNG"]
+
+    number_input(app, "Construction duration").set_value(construction + 1)
+    number_input(app, "Fuel cost").set_value(fuel_cost * 2)
+    # the plants only change once the form is applied
+    assert app.session_state.plants[PLANT]["construction_duration_years"] == (
+        construction
+    )
+    apply(app)
+
+    assert not app.exception
+    assert app.session_state.plants[PLANT]["construction_duration_years"] == (
+        construction + 1
+    )
+    assert app.session_state.plants[PLANT]["fuel_cost_per_tLNG"] == fuel_cost * 2
+    widget_keys = app.session_state.plant_widget_keys
+    assert widget_keys[number_input(app, "Fuel cost").key] == (
+        PLANT,
+        "fuel_cost_per_tLNG",
+    )
+
+
+def test_invalid_edits_are_reported_and_not_applied(app):
+    construction = app.session_state.plants[PLANT]["construction_duration_years"]
+    fuel_cost = app.session_state.plants[PLANT]["fuel_cost_per_tLNG"]
+
+    number_input(app, "Construction duration").set_value(0)
+    number_input(app, "Fuel cost").set_value(fuel_cost * 2)
+    apply(app)
+
+    assert not app.exception
+    assert "construction_duration_years" in app.sidebar.error[0].value
+    assert app.session_state.plants[PLANT]["construction_duration_years"] == (
+        construction
+    )
+    assert app.session_state.plants[PLANT]["fuel_cost_per_tLNG"] == fuel_cost
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.batch_lcoe_model import batch_parameters
+from src.models.compiled_lcoe_model import compile_plants
+from src.models.plant_parameters import PLANT_PARAMETERS, PlantBatch, PlantRecord
+from src.utils.load_data import load_plant_data
+
+
+def load_frame():
+    return pd.read_csv("data/plant_parameters.csv")
+
+
+def test_loaded_plants_are_typed():
+    plants = load_plant_data(load_frame())
+
+    for parameters in plants.values():
+        assert list(parameters) == list(PLANT_PARAMETERS)
+        for parameter, value in parameters.items():
+            assert type(value) is PLANT_PARAMETERS[parameter][0]
+
+
+def test_invalid_values_name_every_plant_and_parameter():
+    data = load_frame().astype({"construction_duration_years": float})
+    data.loc[0, "construction_duration_years"] = 0
+    data.loc[1, "efficiency_rate"] = 0
+    data.loc[2, "construction_duration_years"] = 2.5
+
+    with pytest.raises(ValueError) as error:
+        load_plant_data(data)
+
+    message = str(error.value)
+    for row, parameter in [
+        (0, "construction_duration_years"),
+        (1, "efficiency_rate"),
+        (2, "construction_duration_years"),
+    ]:
+        assert f"{data.iloc[row, 0]}: {parameter}" in message
+
+
+def test_records_and_batches_agree(plants):
+    batch = PlantBatch.from_plants(plants)
+
+    assert batch.to_plants() == plants
+    for record in batch.records():
+        assert (
+            record.as_dict()
+            == PlantRecord.from_dict(record.name, plants[record.name]).as_dict()
+        )
+    with pytest.raises(AttributeError):
+        record.unknown_parameter = 1.0
+
+
+def test_models_take_batches(plants, scenarios):
+    batch = PlantBatch.from_plants(plants)
+
+    for parameter, values in batch_parameters(batch, scenarios).items():
+        assert np.array_equal(values, batch_parameters(plants, scenarios)[parameter])
+    assert np.array_equal(
+        compile_plants(batch).lcoe_curves([10.0, 50.0]),
+        compile_plants(plants).lcoe_curves([10.0, 50.0]),
+    )
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.models.project_finance import DebtTranche, project_finance_waterfall
+
+
+def test_unlevered_untaxed_irr_at_the_lcoe_tariff_is_the_discount_rate(plants):
+
+    waterfall = project_finance_waterfall(plants, 21.0, tranches=(), tax_rate=0)
+
+    discount_rates = [plants[plant]["discount_rate"] for plant in plants]
+    assert waterfall["Equity IRR"] == pytest.approx(discount_rates, abs=1e-9)
+    assert waterfall["Project IRR"] == pytest.approx(discount_rates, abs=1e-9)
+
+
+@pytest.mark.parametrize("repayment", ["annuity", "straight_line", "bullet"])
+def test_debt_is_repaid_and_plants_are_independent(repayment, plants):
+    tranches = (DebtTranche(0.6, 0.09, 12, repayment, grace_years=1),)
+
+    waterfall = project_finance_waterfall(plants, 61.0, tranches=tranches)
+    lines = waterfall["lines"]
+
+    assert np.allclose(lines["Debt balance"][:, -1], 0)
+    # repayments cover the drawdowns and the capitalised interest
+    assert (lines["Principal"].sum(axis=1) >= lines["Debt drawdown"].sum(axis=1)).all()
+    for index, plant in enumerate(plants):
+        single = project_finance_waterfall(
+            {plant: plants[plant]}, 61.0, tranches=tranches
+        )
+        years = len(single["years"])
+        assert np.allclose(
+            single["lines"]["Equity cash flow"][0],
+            lines["Equity cash flow"][index, :years],
+        )
+        assert single["Equity IRR"][0] == pytest.approx(waterfall["Equity IRR"][index])
@@ -0,0 +1,48 @@
+import os
+
+from src.utils.load_data import load_scenario_data, read_data_file
+
+
+def write_scenarios(path, values, mtime):
+    path.write_text("Peaking,Mid-merit,Baseload\n" + ",".join(map(str, values)))
+    os.utime(path, (mtime, mtime))
+
+
+def counting(load_function, calls):
+    def load(data):
+        calls.append(1)
+        return load_function(data)
+
+    # the cache is keyed by the name of the load function
+    load.__name__ = f"counting_{load_function.__name__}"
+    return load
+
+
+def test_files_are_parsed_once_until_they_change(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    write_scenarios(path, [1.0, 21.0, 61.0], 1_000_000)
+    calls = []
+    load = counting(load_scenario_data, calls)
+
+    assert read_data_file(str(path), load)["Baseload"] == 61.0
+    assert read_data_file(str(path), load)["Baseload"] == 61.0
+    assert len(calls) == 1
+
+    write_scenarios(path, [1.0, 21.0, 75.0], 1_000_100)
+    assert read_data_file(str(path), load)["Baseload"] == 75.0
+    assert len(calls) == 2
+
+
+def test_callers_get_isolated_copies(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    write_scenarios(path, [1.0, 21.0, 61.0], 1_000_000)
+
+    edited = read_data_file(str(path), load_scenario_data)
+    edited["Baseload"] = 99.0
+    edited["Extra"] = 1.0
+
+    assert read_data_file(str(path), load_scenario_data) == {
+        "Peaking": 1.0,
+        "Mid-merit": 21.0,
+        "Baseload": 61.0,
+    }
@@ -0,0 +1,98 @@
+import copy
+
+import numpy as np
+import pytest
+
+from src.models.results_visualization import (
+    compute_discount_cash_flows,
+    compute_scenario_lcoe,
+)
+from src.models.scenario_store import BASE_VERSION_NAME, ScenarioStore
+
+
+def test_versions_store_deltas_and_round_trip(plants, scenarios):
+    store = ScenarioStore(plants, scenarios)
+    first, second, *_ = plants
+
+    edited = copy.deepcopy(plants)
+    edited[first]["fuel_cost_per_tLNG"] *= 2
+    del edited[second]
+    edited["New plant"] = dict(plants[first])
+    edited_scenarios = {"Peaking": 5.0, "Baseload": 61.0}
+    version = store.save("Edits", edited, edited_scenarios)
+
+    assert version.label == "Edits v1"
+    assert version.plant_deltas[first] == {
+        "fuel_cost_per_tLNG": edited[first]["fuel_cost_per_tLNG"]
+    }
+    assert version.removed_plants == {second}
+    assert version.removed_scenarios == {"Mid-merit"}
+    assert version.num_deltas() == 1 + len(plants[first]) + 1 + 1 + 1
+    assert store.materialize("Edits") == (edited, edited_scenarios)
+    assert store.materialize(BASE_VERSION_NAME) == (plants, scenarios)
+
+    store.save("Edits", plants, scenarios)
+    assert store.get("Edits").version == 2
+    assert store.materialize("Edits", 1) == (edited, edited_scenarios)
+    with pytest.raises(ValueError):
+        store.save(BASE_VERSION_NAME, plants, scenarios)
+    with pytest.raises(ValueError):
+        store.get("Edits", 3)
+
+
+def test_compare_reports_changed_plants_and_scenarios(plants, scenarios):
+    store = ScenarioStore(plants, scenarios)
+    plant = next(iter(plants))
+    edited = copy.deepcopy(plants)
+    edited[plant]["carbon_cost_per_tCO2e"] *= 3
+    edited_scenarios = dict(scenarios, Baseload=70.0)
+    store.save("Carbon", edited, edited_scenarios)
+
+    comparison = store.compare(BASE_VERSION_NAME, "Carbon")
+
+    # the edited plant in every scenario, every plant in the changed scenario
+    rows = comparison[["Scenario", "Power Plant"]].drop_duplicates()
+    expected_rows = {(scenario, plant) for scenario in scenarios} | {
+        ("Baseload", other) for other in plants
+    }
+    assert set(map(tuple, rows.to_numpy())) == expected_rows
+
+    indexed = comparison.set_index(["Scenario", "Power Plant", "Metric"]).sort_index()
+    lcoe = compute_scenario_lcoe(edited, edited_scenarios).set_index(
+        ["Scenario", "Power Plant"]
+    )["LCOE"]
+    for scenario, other in expected_rows:
+        assert indexed.loc[(scenario, other, "LCOE"), "Carbon v1"] == (
+            lcoe[scenario, other]
+        )
+    carbon = indexed.loc[("Peaking", plant, "Carbon")]
+    expected_carbon = compute_discount_cash_flows(edited, edited_scenarios, "Peaking")
+    assert carbon["Carbon v1"] == pytest.approx(
+        expected_carbon[plant]["Carbon"], rel=1e-12
+    )
+    assert carbon["Delta"] == pytest.approx(carbon["Carbon v1"] - carbon["Base v0"])
+    # only the metrics whose inputs changed are reported
+    assert "CAPEX" not in indexed.loc[("Peaking", plant)].index
+    assert "Emissions" in indexed.loc[("Baseload", plant)].index
+
+
+def test_plants_in_one_version_only_have_nan_values(plants, scenarios):
+    store = ScenarioStore(plants, scenarios)
+    removed = next(iter(plants))
+    edited = {plant: p for plant, p in plants.items() if plant != removed}
+    store.save("Smaller", edited, scenarios)
+
+    comparison = store.compare(BASE_VERSION_NAME, "Smaller")
+
+    assert set(comparison["Power Plant"]) == {removed}
+    assert comparison["Smaller v1"].isna().all()
+    assert comparison["Delta"].isna().all()
+    assert not np.isnan(comparison["Base v0"]).any()
+
+
+def test_unchanged_versions_compare_empty(plants, scenarios):
+    store = ScenarioStore(plants, scenarios)
+    store.save("Copy", copy.deepcopy(plants), dict(scenarios))
+
+    assert store.compare(BASE_VERSION_NAME, "Copy").empty
+    assert store.get("Copy").num_deltas() == 0
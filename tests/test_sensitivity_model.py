@@ -0,0 +1,94 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.sensitivity_model import (
+    ALL_SCENARIOS,
+    MULTIPLIER,
+    SENSITIVITY_PARAMETERS,
+    SensitivityParameter,
+    evaluate_lcoe_sensitivities,
+)
+from src.utils.differential_testing import reference_lcoe
+from src.utils.load_data import load_sensitivity_data
+
+
+def perturbed_reference(plants, scenarios, parameter, value, multiplier):
+    plants = copy.deepcopy(plants)
+    for characteristics in plants.values():
+        characteristics[parameter] = (
+            characteristics[parameter] * value if multiplier else value
+        )
+    return reference_lcoe(plants, scenarios)
+
+
+@pytest.mark.parametrize(
+    "column, parameter, values, multiplier",
+    [
+        ("discount_rate", "discount_rate", [0.05, 0.2], False),
+        ("efficiency_rate", "efficiency_rate", [0.3, 0.6], False),
+        ("fuel_cost", "fuel_cost_per_tLNG", [0.5, 1.5], True),
+        ("carbon_cost", "carbon_cost_per_tCO2e", [0.7, 1.3], True),
+    ],
+)
+def test_sweeps_match_the_perturbed_reference(
+    column, parameter, values, multiplier, plants, scenarios
+):
+    results = evaluate_lcoe_sensitivities(
+        plants, scenarios, {column: values}, decimals=None
+    )
+
+    # rows: plants x scenarios x values
+    lcoe = results["LCOE"].reshape(len(plants), len(scenarios), len(values))
+    for v, value in enumerate(values):
+        expected = perturbed_reference(plants, scenarios, parameter, value, multiplier)
+        assert np.allclose(lcoe[:, :, v], expected.T, rtol=1e-12)
+    assert set(results["Parameter"]) == {SENSITIVITY_PARAMETERS[column].label}
+
+
+def test_load_factor_sweep_replaces_the_scenarios(plants, scenarios):
+    values = [10.0, 50.0, 90.0]
+    results = evaluate_lcoe_sensitivities(
+        plants, scenarios, {"discount_rate": [0.1], "capacity_factor": values}
+    )
+
+    # per plant, the load factor sweep comes first
+    first_rows = slice(0, len(values))
+    assert list(results["Scenario"][first_rows]) == [ALL_SCENARIOS] * len(values)
+    assert list(results["Value"][first_rows]) == values
+    expected = reference_lcoe(plants, dict(zip(map(str, values), values)))
+    assert np.allclose(
+        results["LCOE"][first_rows], np.round(expected[:, 0], 2), atol=1e-12
+    )
+    assert len(results["LCOE"]) == len(plants) * (len(values) + len(scenarios))
+
+
+def test_a_registered_column_needs_no_other_code(monkeypatch, plants, scenarios):
+    monkeypatch.setitem(
+        SENSITIVITY_PARAMETERS,
+        "voam_cost",
+        SensitivityParameter("voam_cost_per_mwh", MULTIPLIER, "VO&M costs"),
+    )
+    results = evaluate_lcoe_sensitivities(
+        plants, scenarios, {"voam_cost": [2.0]}, decimals=None
+    )
+
+    expected = perturbed_reference(plants, scenarios, "voam_cost_per_mwh", 2.0, True)
+    assert np.allclose(results["LCOE"], expected.T.ravel(), rtol=1e-12)
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError):
+        load_sensitivity_data(pd.DataFrame({"unknown": [1.0]}))
+    with pytest.raises(ValueError):
+        SensitivityParameter("capacity_factor", "percent", "Load factor")
+
+
+def test_sensitivity_data_loads_every_column():
+    data = pd.read_csv("data/sensitivity_parameters.csv")
+    sensitivities = load_sensitivity_data(data)
+
+    assert list(sensitivities) == list(data.columns)
+    assert sensitivities["fuel_cost"] == data["fuel_cost"].to_list()
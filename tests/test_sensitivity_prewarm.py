@@ -0,0 +1,42 @@
+from streamlit.testing.v1 import AppTest
+
+from src.utils.background_jobs import COMPLETED, get_job_manager
+
+TIMEOUT = 60
+
+
+def run_dashboard():
+    app = AppTest.from_file("../01_📊_LNG2P_Dashboard.py", default_timeout=TIMEOUT)
+    app.run()
+    return app
+
+
+def prewarmed_job(app):
+    job = get_job_manager().get(app.session_state.sensitivity_job_id)
+    assert job is not None
+    return job
+
+
+def test_sensitivity_page_reuses_the_prewarmed_job():
+    app = run_dashboard()
+    assert not app.exception
+    job = prewarmed_job(app)
+    # the sensitivity sweep of the selected scenarios, Peaking by default
+    assert app.session_state.key_Peaking
+
+    app.switch_page("pages/02_📈_LNG2P_Sensitivities.py")
+    app.run()
+
+    assert not app.exception
+    assert app.session_state.sensitivity_job_id == job.id
+    assert get_job_manager().find(job.key) is job
+    assert job.wait(TIMEOUT) and job.status == COMPLETED
+
+
+def test_completed_job_is_reused_by_another_session():
+    job = prewarmed_job(run_dashboard())
+    assert job.wait(TIMEOUT) and job.status == COMPLETED
+
+    other = run_dashboard()
+
+    assert other.session_state.sensitivity_job_id == job.id
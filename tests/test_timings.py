@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from src.utils import timings
+from src.utils.timings import get_timings, mark_cold_start, record_timing
+
+
+@pytest.fixture(autouse=True)
+def fresh_timings(monkeypatch):
+    monkeypatch.setattr(timings, "_timings", {})
+    monkeypatch.setattr(timings, "_cold_start_seconds", None)
+
+
+def test_nested_timings_are_recorded_per_label():
+    for _ in range(2):
+        with record_timing("rerun"):
+            with record_timing("model"):
+                time.sleep(0.01)
+            time.sleep(0.01)
+
+    recorded = get_timings()["timings"]
+    rerun, model = recorded["rerun"], recorded["model"]
+    assert rerun["calls"] == model["calls"] == 2
+    assert model["last_seconds"] >= 0.01
+    # the enclosing block includes the nested one
+    assert rerun["last_seconds"] >= model["last_seconds"] + 0.01
+    assert rerun["mean_seconds"] >= model["mean_seconds"] + 0.01
+
+
+def test_timing_is_recorded_when_the_block_raises():
+    with pytest.raises(RuntimeError):
+        with record_timing("failing"):
+            raise RuntimeError
+
+    assert get_timings()["timings"]["failing"]["calls"] == 1
+
+
+def test_cold_start_is_marked_only_once():
+    assert get_timings() == {"cold_start_seconds": None, "timings": {}}
+
+    mark_cold_start()
+    cold_start_seconds = get_timings()["cold_start_seconds"]
+    time.sleep(0.01)
+    mark_cold_start()
+
+    assert cold_start_seconds > 0
+    assert get_timings()["cold_start_seconds"] == cold_start_seconds